@@ -0,0 +1,82 @@
+from typing import List
+
+from benchmarks.harness import Benchmark
+from src.game.board import DIRECTIONS, Board, create_board
+from src.game.row_tables import SUPPORTED_SIZES, get_row_table
+
+
+SIZES = (3, 4, 5)
+# Большие поля -- движок "array" (см. array_board.py)
+LARGE_SIZES = (8, 16)
+SEED = 2048
+
+
+def seeded_board(size: int, engine: str = "list", seed: int = SEED) -> Board:
+    """
+    Детерминированная позиция середины партии: угловая стратегия с
+    фиксированным сидом, пока на поле не останется примерно треть пустых клеток.
+    Таблица строк строится заранее: Board её не ждёт, а замеры должны
+    идти по табличному пути.
+    """
+    if size in SUPPORTED_SIZES:
+        get_row_table(size)
+    board = create_board(engine=engine, size=size, seed=seed)
+    board.reset()
+
+    order = ("down", "left", "right", "up")
+    while len(board.get_empty_cells()) > size * size // 3:
+        for direction in order:
+            moved, _, _, lost = board.move(direction)
+            if moved:
+                break
+        if lost:
+            break
+    return board
+
+
+def _restorer(board: Board):
+    """setup-функция: возвращает поле и генератор в исходное состояние."""
+    grid = [row[:] for row in board.grid]
+    score = board.score
+
+    def restore():
+        board.grid = [row[:] for row in grid]
+        board.score = score
+        board.seed(SEED)
+
+    return restore
+
+
+def board_benchmarks() -> List[Benchmark]:
+    benchmarks = []
+
+    engines = [(size, "list") for size in SIZES] + [(4, "bitboard")]
+    engines += [(size, engine) for size in LARGE_SIZES for engine in ("list", "array")]
+    for size, engine in engines:
+        board = seeded_board(size, engine)
+        restore = _restorer(board)
+        prefix = f"board.{engine}.{size}x{size}"
+
+        for direction in DIRECTIONS:
+            benchmarks.append(Benchmark(
+                f"{prefix}.move_{direction}",
+                lambda b=board, d=direction: b.move(d),
+                setup=restore,
+            ))
+
+        # Ход с записью перемещений плиток (анимация сдвига в GameEngine)
+        tracked = seeded_board(size, engine)
+        tracked.track_slides = True
+        benchmarks.append(Benchmark(
+            f"{prefix}.move_left_slides",
+            lambda b=tracked: b.move("left"),
+            setup=_restorer(tracked),
+        ))
+
+        benchmarks.append(Benchmark(f"{prefix}.get_empty_cells", board.get_empty_cells, setup=restore))
+        benchmarks.append(Benchmark(f"{prefix}.can_move", board.can_move, setup=restore))
+        benchmarks.append(Benchmark(f"{prefix}.add_random_tile", board.add_random_tile, setup=restore))
+        benchmarks.append(Benchmark(f"{prefix}.legal_moves", board.legal_moves, setup=restore))
+        benchmarks.append(Benchmark(f"{prefix}.preview_moves", board.preview_moves, setup=restore))
+
+    return benchmarks
@@ -0,0 +1,102 @@
+import os
+from typing import List
+
+# Без дисплея: SDL рисует в память
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from benchmarks.bench_board import LARGE_SIZES, SIZES, _restorer, seeded_board
+from benchmarks.harness import Benchmark
+from src.engine.renderer import Renderer
+
+
+WINDOW_SIZE = (600, 700)
+# Большие экраны: раскладка масштабируется под окно (см. layout.py)
+UHD_SIZE = (3840, 2160)
+
+
+def _animation_frame(renderer: Renderer, slides: bool):
+    """
+    setup для кадра анимации хода: поле восстановлено и нарисовано
+    в покое (как кадр перед ходом в игре), ход влево сделан, анимация
+    в середине -- сдвиг плиток (slides) или "поп" всего поля.
+    Замеряется следующий draw_dirty().
+    """
+    board = renderer.board
+    board.track_slides = slides
+    restore = _restorer(board)
+    restore()
+    renderer.draw_dirty()
+
+    def setup():
+        restore()
+        renderer.stop_animation()
+        renderer.draw_dirty()
+        board.move("left")
+        if slides:
+            renderer.start_move_animation(board.last_slides, board.last_spawn[0])
+            renderer.animation_time = renderer.slide_duration / 2
+        else:
+            renderer.start_move_animation()
+            renderer.animation_time = renderer.animation_duration / 2
+
+    return setup
+
+
+def render_benchmarks() -> List[Benchmark]:
+    """
+    Renderer.draw / draw_background / draw_tiles и HUD.draw для каждого
+    размера поля и темы, кадры анимации хода (сдвиг плиток против "попа"
+    всего поля), плюс создание Renderer (apply_settings). Запускать из
+    временного каталога: HUD создаёт highscore.json в текущей директории.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+
+    benchmarks = []
+    for size in SIZES + LARGE_SIZES:
+        board = seeded_board(size, "array")
+        for theme in ("light", "dark"):
+            renderer = Renderer(screen, board, theme=theme)
+            # Рекорд заведомо выше счёта -- HUD.draw не пишет файл в замере
+            renderer.hud.best_score = 10 ** 9
+            prefix = f"render.{theme}.{size}x{size}"
+
+            benchmarks.append(Benchmark(f"{prefix}.draw", renderer.draw, number=200))
+            benchmarks.append(Benchmark(f"{prefix}.draw_background", renderer.draw_background, number=200))
+            benchmarks.append(Benchmark(f"{prefix}.draw_tiles", renderer.draw_tiles, number=200))
+            benchmarks.append(Benchmark(f"{prefix}.hud_draw", renderer.hud.draw, number=200))
+
+        # Кадры анимации: у каждого свои поле и Renderer (setup двигает поле)
+        for slides, name in ((True, "slide_frame"), (False, "pop_frame")):
+            renderer = Renderer(screen, seeded_board(size, "array"))
+            renderer.hud.best_score = 10 ** 9
+            benchmarks.append(Benchmark(
+                f"render.{size}x{size}.{name}", renderer.draw_dirty,
+                setup=_animation_frame(renderer, slides), number=200,
+            ))
+
+    # 4K: внеэкранная поверхность в формате дисплея вместо окна
+    uhd = pygame.Surface(UHD_SIZE).convert()
+    for size in (4, 16):
+        renderer = Renderer(uhd, seeded_board(size, "array"))
+        renderer.hud.best_score = 10 ** 9
+        prefix = f"render.uhd.{size}x{size}"
+        benchmarks.append(Benchmark(f"{prefix}.draw", renderer.draw, number=20))
+        benchmarks.append(Benchmark(f"{prefix}.draw_tiles", renderer.draw_tiles, number=20))
+        for slides, name in ((True, "slide_frame"), (False, "pop_frame")):
+            renderer = Renderer(uhd, seeded_board(size, "array"))
+            renderer.hud.best_score = 10 ** 9
+            benchmarks.append(Benchmark(
+                f"{prefix}.{name}", renderer.draw_dirty,
+                setup=_animation_frame(renderer, slides), number=20,
+            ))
+
+    # Пересоздание Renderer + HUD -- основная часть GameEngine.apply_settings()
+    board = seeded_board(4)
+    benchmarks.append(Benchmark("render.renderer_init", lambda: Renderer(screen, board), number=100))
+
+    return benchmarks
@@ -0,0 +1,113 @@
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class Benchmark:
+    """
+    Один замер: fn вызывается number раз в каждом из repeat повторов.
+    setup (если задан) вызывается перед каждым вызовом fn и в замер не входит --
+    так мутирующие операции (Board.move) всегда стартуют с одного состояния.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        setup: Optional[Callable[[], object]] = None,
+        number: int = 1000,
+        repeat: int = 5,
+    ):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+
+    def run(self, scale: float = 1.0) -> dict:
+        fn = self.fn
+        setup = self.setup
+        number = max(1, int(self.number * scale))
+        clock = time.perf_counter
+
+        samples: List[float] = []
+        for _ in range(self.repeat):
+            total = 0.0
+            if setup is None:
+                start = clock()
+                for _ in range(number):
+                    fn()
+                total = clock() - start
+            else:
+                for _ in range(number):
+                    setup()
+                    start = clock()
+                    fn()
+                    total += clock() - start
+            samples.append(total / number * 1e6)
+
+        return {
+            "min_us": round(min(samples), 3),
+            "median_us": round(statistics.median(samples), 3),
+            "number": number,
+            "repeat": self.repeat,
+        }
+
+
+def environment() -> dict:
+    info = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+    try:
+        import pygame
+        info["pygame"] = pygame.version.ver
+    except ImportError:
+        pass
+    return info
+
+
+def run_all(benchmarks: List[Benchmark], scale: float = 1.0, name_filter: str = "") -> Dict[str, dict]:
+    results = {}
+    for bench in benchmarks:
+        if name_filter and name_filter not in bench.name:
+            continue
+        results[bench.name] = bench.run(scale)
+        print(f"{bench.name:<40} {results[bench.name]['median_us']:>12.2f} us", file=sys.stderr)
+    return results
+
+
+def save(path: str, results: Dict[str, dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=4)
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """
+    Сравнивает медианы с базовой линией.
+    Возвращает строки отчёта; regression=True, если стало медленнее,
+    чем baseline * (1 + threshold).
+    """
+    rows = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["median_us"] / base["median_us"] if base["median_us"] else 1.0
+        rows.append({
+            "name": name,
+            "baseline_us": base["median_us"],
+            "current_us": result["median_us"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1.0 + threshold,
+        })
+    return rows
@@ -0,0 +1,71 @@
+"""
+Микробенчмарки горячих путей Board и Renderer (без окна, SDL dummy).
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json --threshold 0.1
+
+В режиме --compare печатается таблица относительно базовой линии,
+а при регрессиях процесс завершается с кодом 1.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks import harness
+from benchmarks.bench_board import board_benchmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Board/Renderer micro-benchmarks")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before flagging (0.10 = 10%%)")
+    parser.add_argument("--filter", default="", help="run only benchmarks whose name contains this")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for iteration counts")
+    parser.add_argument("--no-render", action="store_true", help="skip pygame benchmarks")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = harness.load(args.compare) if args.compare else None
+
+    benchmarks = board_benchmarks()
+
+    # HUD пишет highscore.json в текущий каталог -- уходим во временный
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            if not args.no_render:
+                from benchmarks.bench_render import render_benchmarks
+                benchmarks += render_benchmarks()
+            results = harness.run_all(benchmarks, scale=args.scale, name_filter=args.filter)
+        finally:
+            os.chdir(cwd)
+
+    if output:
+        harness.save(output, results)
+    elif baseline is None:
+        json.dump({"environment": harness.environment(), "results": results}, sys.stdout, indent=4)
+        print()
+
+    if baseline is None:
+        return 0
+
+    rows = harness.compare(results, baseline, args.threshold)
+    regressions = [row for row in rows if row["regression"]]
+
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<40} {row['baseline_us']:>10.2f} -> {row['current_us']:>10.2f} us "
+              f"x{row['ratio']:<6} {flag}")
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%} threshold")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+# src/test_pygame.py -- ручная проверка окна pygame (бесконечный цикл),
+# а не тест: pytest его не собирает
+collect_ignore = ["src/test_pygame.py"]
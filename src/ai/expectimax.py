@@ -0,0 +1,294 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.game.board import DIRECTIONS, Board
+from src.game.packed import (
+    check_move_size, columns, empty_indices, move_packed, place, rows,
+)
+from src.game.row_tables import EXPONENTS
+
+# Оценка проигранной позиции. Эвристика _evaluate бывает отрицательной
+# (штрафы за монотонность и крупные плитки -- до десятков миллионов на 5x5),
+# поэтому проигрыш должен быть заведомо хуже любой живой позиции, а не 0
+LOSS_VALUE = -1e9
+
+
+class _SearchTimeout(Exception):
+    """Внутренний сигнал: бюджет времени на ход исчерпан."""
+
+
+class TranspositionTable:
+    """
+    Ограниченная таблица уже оценённых позиций.
+    Ключ -- упакованное поле (Board.pack), значение -- (глубина, оценка).
+    При переполнении вытесняется давно не использованная запись (LRU).
+    """
+
+    def __init__(self, capacity: int = 1 << 18):
+        self.capacity = capacity
+        self._entries: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, code: int, depth: int) -> Optional[float]:
+        """Оценка позиции, если она считалась на глубине не меньше depth."""
+        self.lookups += 1
+        entry = self._entries.get(code)
+        if entry is None or entry[0] < depth:
+            return None
+        self._entries.move_to_end(code)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, code: int, depth: int, value: float) -> None:
+        entries = self._entries
+        if code in entries:
+            entries.move_to_end(code)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[code] = (depth, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class ExpectimaxSolver:
+    """
+    ИИ-игрок на основе expectimax поверх упакованного поля Board.
+
+    - MAX-узлы: выбор направления хода;
+    - CHANCE-узлы: появление новой плитки в каждой пустой клетке со значениями
+      и вероятностями из new_tile_values / new_tile_probabilities;
+    - исходы, вероятность пути до которых меньше min_probability, не
+      раскрываются, а оцениваются эвристикой;
+    - iterative deepening: глубина растёт, пока укладываемся в time_limit.
+
+    Счётчики nodes, nodes_per_sec и table.hit_rate помогают с настройкой.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        new_tile_values=None,
+        new_tile_probabilities=None,
+        max_depth: int = 3,
+        time_limit: Optional[float] = None,
+        min_probability: float = 1e-4,
+        table_capacity: int = 1 << 18,
+    ):
+        check_move_size(size, "Expectimax")
+        self.size = size
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.min_probability = min_probability
+
+        values = new_tile_values or [2, 4]
+        probabilities = new_tile_probabilities or [0.9, 0.1]
+        total = float(sum(probabilities))
+        self.spawns: List[Tuple[int, float]] = [
+            (EXPONENTS[value], p / total) for value, p in zip(values, probabilities)
+        ]
+
+        self.table = TranspositionTable(table_capacity)
+        self._row_scores: Dict[int, float] = {}
+
+        # Статистика
+        self.nodes = 0
+        self.search_seconds = 0.0
+        self.last_depth = 0
+
+        self._deadline: Optional[float] = None
+
+    @classmethod
+    def from_board(cls, board: Board, **kwargs) -> "ExpectimaxSolver":
+        return cls(
+            size=board.size,
+            new_tile_values=board.new_tile_values,
+            new_tile_probabilities=board.new_tile_probabilities,
+            **kwargs,
+        )
+
+    # =====================
+    # Статистика
+    # =====================
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.search_seconds if self.search_seconds else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "nodes": self.nodes,
+            "nodes_per_sec": round(self.nodes_per_sec, 1),
+            "table_size": len(self.table),
+            "table_hit_rate": round(self.table.hit_rate, 4),
+            "table_evictions": self.table.evictions,
+            "last_depth": self.last_depth,
+        }
+
+    # =====================
+    # Выбор хода
+    # =====================
+
+    def best_move(self, board: Board) -> Optional[str]:
+        """Лучшее направление для позиции board или None, если ходов нет."""
+        return self.best_move_packed(board.pack())
+
+    def best_move_packed(self, code: int) -> Optional[str]:
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit if self.time_limit else None
+
+        children = []
+        for direction in DIRECTIONS:
+            try:
+                new_code, _ = move_packed(code, self.size, direction)
+            except OverflowError:
+                continue
+            if new_code != code:
+                children.append((direction, new_code))
+
+        best = children[0][0] if children else None
+
+        try:
+            # Iterative deepening: каждая завершённая глубина уточняет ход
+            for depth in range(1, self.max_depth + 1):
+                best_value = float("-inf")
+                best_at_depth = best
+                for direction, child in children:
+                    value = self._chance(child, depth, 1.0)
+                    if value > best_value:
+                        best_value, best_at_depth = value, direction
+                best = best_at_depth
+                self.last_depth = depth
+        except _SearchTimeout:
+            pass
+        finally:
+            self.search_seconds += time.perf_counter() - start
+
+        return best
+
+    # =====================
+    # Поиск
+    # =====================
+
+    def _check_deadline(self) -> None:
+        if self._deadline is not None and (self.nodes & 0xFF) == 0:
+            if time.perf_counter() > self._deadline:
+                raise _SearchTimeout
+
+    def _max(self, code: int, depth: int, probability: float) -> float:
+        self.nodes += 1
+        self._check_deadline()
+
+        best = None
+        for direction in DIRECTIONS:
+            try:
+                new_code, _ = move_packed(code, self.size, direction)
+            except OverflowError:
+                continue
+            if new_code != code:
+                value = self._chance(new_code, depth, probability)
+                if best is None or value > best:
+                    best = value
+
+        # Нет ходов -- проигрыш
+        return best if best is not None else LOSS_VALUE
+
+    def _chance(self, code: int, depth: int, probability: float) -> float:
+        self.nodes += 1
+        self._check_deadline()
+
+        if depth <= 0 or probability < self.min_probability:
+            return self._evaluate(code)
+
+        cached = self.table.get(code, depth)
+        if cached is not None:
+            return cached
+
+        cells = empty_indices(code, self.size)
+        if not cells:
+            return self._evaluate(code)
+
+        cell_probability = probability / len(cells)
+        total = 0.0
+        weight = 0.0
+
+        for exponent, p in self.spawns:
+            branch = cell_probability * p
+            # Отсечение маловероятных исходов (например, четвёрок глубоко в дереве)
+            if branch < self.min_probability and weight > 0.0:
+                continue
+            for index in cells:
+                total += p * self._max(place(code, index, exponent), depth - 1, branch)
+            weight += p * len(cells)
+
+        value = total / weight
+        self.table.put(code, depth, value)
+        return value
+
+    # =====================
+    # Эвристика
+    # =====================
+
+    def _evaluate(self, code: int) -> float:
+        scores = self._row_scores
+        total = 0.0
+        for line in rows(code, self.size) + columns(code, self.size):
+            score = scores.get(line)
+            if score is None:
+                score = self._score_line(line)
+                scores[line] = score
+            total += score
+        return total
+
+    def _score_line(self, line: int) -> float:
+        """
+        Оценка одной строки/столбца: пустые клетки, возможные слияния,
+        монотонность и штраф за крупные плитки не у края.
+        """
+        exps = [(line >> (4 * i)) & 0xF for i in range(self.size)]
+
+        empty = exps.count(0)
+        merges = 0
+        previous = 0
+        counter = 0
+        for e in exps:
+            if e == 0:
+                continue
+            if e == previous:
+                counter += 1
+            elif counter > 0:
+                merges += 1 + counter
+                counter = 0
+            previous = e
+        if counter > 0:
+            merges += 1 + counter
+
+        mono_left = 0.0
+        mono_right = 0.0
+        for a, b in zip(exps, exps[1:]):
+            if a > b:
+                mono_left += a ** 4 - b ** 4
+            else:
+                mono_right += b ** 4 - a ** 4
+
+        sum_power = sum(e ** 3.5 for e in exps)
+
+        return (
+            200000.0 / (2 * self.size)
+            + 270.0 * empty
+            + 700.0 * merges
+            - 47.0 * min(mono_left, mono_right)
+            - 11.0 * sum_power
+        )
@@ -0,0 +1,255 @@
+import multiprocessing
+import random
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from src.game.board import DIRECTIONS, Board
+from src.game.packed import check_move_size, empty_indices, move_packed, place
+from src.game.row_tables import EXPONENTS
+
+
+# Задача для воркера: (код поля, размер, показатели новых плиток,
+# кумулятивные вероятности, число партий, сид, лимит ходов, срок).
+# Срок -- по time.time(): эти часы общие для всех процессов; None -- без срока
+RolloutTask = Tuple[
+    int, int, Tuple[int, ...], Tuple[float, ...], int, int, int, Optional[float]
+]
+
+
+def _spawn(code: int, size: int, rng: random.Random, exponents, cumulative) -> int:
+    """Новая плитка в случайной пустой клетке (как Board.add_random_tile)."""
+    cells = empty_indices(code, size)
+    if not cells:
+        return code
+    pick = min(bisect_right(cumulative, rng.random()), len(exponents) - 1)
+    return place(code, rng.choice(cells), exponents[pick])
+
+
+def run_rollouts(task: RolloutTask) -> Tuple[float, int]:
+    """
+    Играет до count случайных партий от позиции code (упакованное поле сразу
+    после сдвига, ещё без новой плитки) и возвращает (сумма очков, число
+    сыгранных партий). Каждая партия начинается с новой плитки -- как после
+    настоящего Board.move(). Новая партия не начинается после срока
+    deadline, поэтому партий может быть меньше count (и даже ноль).
+    Выполняется в воркере.
+    """
+    code, size, exponents, cumulative, count, seed, max_moves, deadline = task
+    rng = random.Random(seed)
+    order = list(DIRECTIONS)
+    total = 0.0
+    played = 0
+
+    for _ in range(count):
+        if deadline is not None and time.time() >= deadline:
+            break
+        current = _spawn(code, size, rng, exponents, cumulative)
+        score = 0
+
+        for _ in range(max_moves):
+            rng.shuffle(order)
+            for direction in order:
+                try:
+                    new_code, gained = move_packed(current, size, direction)
+                except OverflowError:
+                    continue
+                if new_code != current:
+                    break
+            else:
+                break  # ходов нет -- партия окончена
+
+            score += gained
+            current = _spawn(new_code, size, rng, exponents, cumulative)
+
+        total += score
+        played += 1
+
+    return total, played
+
+
+class MonteCarloAdvisor:
+    """
+    Советник хода на случайных доигрываниях (rollouts).
+
+    Для каждого допустимого направления поле сдвигается, а затем от
+    получившейся позиции разыгрываются случайные партии; выбирается
+    направление с лучшим средним результатом (очки за ход + очки доигрывания).
+
+    Доигрывания идут в постоянном пуле процессов, который создаётся один раз
+    и переиспользуется между ходами (close() или with-блок освобождают его).
+    Между процессами передаются только упакованные коды полей (Board.pack).
+    Число доигрываний подбирается под бюджет времени на ход: первый раунд --
+    по одному доигрыванию на направление, дальше размер раунда считается
+    по измеренной скорости, а срок хода передаётся в сами доигрывания.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        new_tile_values=None,
+        new_tile_probabilities=None,
+        workers: int = 0,
+        time_limit: float = 0.1,
+        max_rollouts: int = 10_000,
+        rollout_moves: int = 1_000,
+        seed: Optional[int] = None,
+    ):
+        check_move_size(size, "Monte Carlo")
+        self.size = size
+        self.workers = workers
+        self.time_limit = time_limit
+        self.max_rollouts = max_rollouts
+        self.rollout_moves = rollout_moves
+
+        values = new_tile_values or [2, 4]
+        probabilities = new_tile_probabilities or [0.9, 0.1]
+        total = float(sum(probabilities))
+        self._exponents = tuple(EXPONENTS[v] for v in values)
+        self._cumulative = tuple(p / total for p in accumulate(probabilities))
+
+        self._rng = random.Random(seed)
+        self._pool = None
+
+        # Статистика последнего хода
+        self.last_rollouts = 0
+        self.last_seconds = 0.0
+        self.last_means: Dict[str, float] = {}
+
+    @classmethod
+    def from_board(cls, board: Board, **kwargs) -> "MonteCarloAdvisor":
+        return cls(
+            size=board.size,
+            new_tile_values=board.new_tile_values,
+            new_tile_probabilities=board.new_tile_probabilities,
+            **kwargs,
+        )
+
+    # =====================
+    # Пул процессов
+    # =====================
+
+    def _get_pool(self):
+        if self._pool is None and self.workers > 0:
+            self._pool = multiprocessing.Pool(processes=self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "MonteCarloAdvisor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # =====================
+    # Выбор хода
+    # =====================
+
+    def best_move(self, board: Board) -> Optional[str]:
+        """Лучшее направление для позиции board или None, если ходов нет."""
+        return self.best_move_packed(board.pack())
+
+    def best_move_packed(self, code: int) -> Optional[str]:
+        start = time.perf_counter()
+        # Срок для доигрываний -- по общим для процессов часам
+        deadline = time.time() + self.time_limit
+
+        children: List[Tuple[str, int, int]] = []
+        for direction in DIRECTIONS:
+            try:
+                new_code, gained = move_packed(code, self.size, direction)
+            except OverflowError:
+                continue
+            if new_code != code:
+                children.append((direction, new_code, gained))
+
+        if len(children) <= 1:
+            self.last_rollouts = 0
+            self.last_seconds = time.perf_counter() - start
+            self.last_means = {}
+            return children[0][0] if children else None
+
+        totals = {direction: 0.0 for direction, _, _ in children}
+        counts = {direction: 0 for direction, _, _ in children}
+        batch = 1
+        rollouts = 0
+        first = True
+
+        # Раунды: в каждом по batch доигрываний на направление. Первый раунд --
+        # по одному (без срока: у каждого направления есть хотя бы одна
+        # оценка), после раунда batch пересчитывается по измеренной скорости
+        # так, чтобы следующий раунд уложился в оставшийся бюджет. Доигрывания
+        # сами не начинаются после срока, поэтому раунд не перебирает бюджет
+        # больше чем на одну партию.
+        while rollouts < self.max_rollouts:
+            round_start = time.time()
+            results = self._run_round(children, batch, None if first else deadline)
+            first = False
+
+            played = 0
+            for direction, (total, count) in results:
+                totals[direction] += total
+                counts[direction] += count
+                played += count
+            rollouts += played
+
+            now = time.time()
+            remaining = deadline - now
+            per_rollout = (now - round_start) / max(1, played)
+            if remaining <= per_rollout:
+                break
+
+            batch = int(remaining / per_rollout / len(children))
+            batch = max(1, min(batch, (self.max_rollouts - rollouts) // len(children)))
+
+        means = {
+            direction: gained + totals[direction] / counts[direction]
+            for direction, _, gained in children
+            if counts[direction]
+        }
+
+        self.last_rollouts = rollouts
+        self.last_seconds = time.perf_counter() - start
+        self.last_means = means
+        return max(means, key=means.get)
+
+    def _run_round(self, children, batch: int, deadline: Optional[float]):
+        """
+        Один раунд доигрываний: список (направление, (сумма, число)).
+        deadline -- срок по time.time() (None -- доиграть все партии раунда).
+        """
+        pool = self._get_pool()
+        parts = max(1, self.workers)
+
+        tasks = []
+        owners = []
+        for direction, child, _ in children:
+            # Делим batch на части, чтобы загрузить все воркеры
+            for part in range(parts):
+                count = batch // parts + (1 if part < batch % parts else 0)
+                if count == 0:
+                    continue
+                tasks.append((
+                    child,
+                    self.size,
+                    self._exponents,
+                    self._cumulative,
+                    count,
+                    self._rng.getrandbits(32),
+                    self.rollout_moves,
+                    deadline,
+                ))
+                owners.append(direction)
+
+        if pool is None:
+            results = [run_rollouts(task) for task in tasks]
+        else:
+            results = pool.map(run_rollouts, tasks)
+
+        return list(zip(owners, results))
@@ -0,0 +1,848 @@
+import hashlib
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from itertools import combinations, product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.game.board import DIRECTIONS, Board
+from src.game.row_tables import EXPONENTS, get_row_table
+
+
+# =====================
+# Точная таблица позиций (tablebase) для малых полей
+# =====================
+#
+# Для поля 3x3 все достижимые позиции можно перебрать целиком и посчитать
+# для каждой точную вероятность собрать плитку target_value при лучшей игре
+# (expectimax без глубины и эвристик) и лучший ход.
+#
+# Построение (build_tablebase):
+#   1. Прямой проход. Позиции хранятся упакованными (Board.pack) в uint64.
+#      Сумма плиток после хода не меняется, а новая плитка добавляет к ней
+#      своё значение, поэтому позиции раскладываются по слоям с одной суммой:
+#      слой s получается из слоёв s - v (v -- значения новых плиток).
+#   2. Обратный проход от больших сумм к малым: значение позиции -- максимум
+#      по ходам, значение хода -- 1, если он собрал target_value, иначе среднее
+#      по пустым клеткам и значениям новой плитки из слоёв s + v.
+#   3. Итоговый индекс -- отсортированные коды позиций в одном файле,
+#      читается через mmap без загрузки в память. Код делится на префикс
+#      (старшие биты) и младшие 32 бита: таблица смещений по префиксам
+#      сужает поиск до "корзины" префикса, а храним только младшие биты.
+#      Вероятности и ходы лежат отдельными столбцами, 9 байт на позицию.
+#
+#      Поиск поэтому не O(1), а O(log2 корзины): двоичный поиск внутри
+#      корзины. Хэш-таблица давала O(1), но с ячейкой "ключ, вероятность,
+#      ход" и запасом под открытую адресацию стоила 19.5 байта на позицию
+#      (119 МБ для 3x3 до 256 против 55 МБ здесь). Длина самой большой
+#      корзины пишется в заголовок (max_bucket): для 3x3 до 256 это
+#      2.5 млн позиций, то есть не больше 22 сравнений, и bisect делает их
+#      в C по отображению -- заметно дешевле canonical() на каждом поиске.
+#
+# Позиции, переходящие друг в друга поворотом или отражением поля, имеют
+# одинаковое значение, поэтому хранится только каноническая (минимальный код
+# из восьми), а лучший ход переводится обратно при поиске. Это сокращает
+# таблицу почти в восемь раз.
+#
+# Слои и фронт прямого прохода (потомки ещё не собранных слоёв) пишутся
+# в рабочий каталог по мере готовности (атомарно), поэтому прерванное
+# построение продолжается с места остановки без повторного разворота
+# готовых слоёв. Слои режутся на куски,
+# которые считаются в пуле процессов; между процессами передаются только
+# номера слоёв и границы кусков, сами слои воркеры читают через mmap.
+#
+# NumPy нужен только для построения; чтение индекса (Tablebase) обходится
+# без него.
+
+MAGIC = b"2048TBL\x00"
+VERSION = 2
+_HEADER = struct.Struct("<8sHI")
+
+# Столбцы индекса (little-endian): смещения префиксов, младшие биты кодов,
+# вероятности
+_VALUE = struct.Struct("<f")
+_KEY_BITS = 32
+_KEY_MASK = (1 << _KEY_BITS) - 1
+
+# Ход не найден (ходов нет)
+NO_MOVE = 255
+
+DEFAULT_PATH = os.path.join(".cache", "tablebase-3x3.tb")
+DEFAULT_TARGET = 256
+DEFAULT_WORK_DIR = os.path.join(".cache", "tablebase")
+
+_DIRECTION_VECTORS = {
+    "up": (-1, 0),
+    "down": (1, 0),
+    "left": (0, -1),
+    "right": (0, 1),
+}
+
+
+# =====================
+# Симметрии поля
+# =====================
+
+def symmetries(size: int) -> List[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """
+    Восемь поворотов/отражений поля size x size.
+    Для каждого: (cells, directions), где cells[i] -- куда переходит клетка i,
+    directions[d] -- во что переходит направление DIRECTIONS[d].
+    Первая симметрия -- тождественная.
+    """
+    result = []
+    for transpose, flip_rows, flip_cols in product((False, True), repeat=3):
+        cells = []
+        for r in range(size):
+            for c in range(size):
+                nr, nc = (c, r) if transpose else (r, c)
+                if flip_rows:
+                    nr = size - 1 - nr
+                if flip_cols:
+                    nc = size - 1 - nc
+                cells.append(nr * size + nc)
+
+        directions = []
+        for name in DIRECTIONS:
+            dr, dc = _DIRECTION_VECTORS[name]
+            if transpose:
+                dr, dc = dc, dr
+            vector = (-dr if flip_rows else dr, -dc if flip_cols else dc)
+            directions.append(
+                next(i for i, d in enumerate(DIRECTIONS) if _DIRECTION_VECTORS[d] == vector)
+            )
+        result.append((tuple(cells), tuple(directions)))
+    return result
+
+
+def canonical(code: int, size: int) -> Tuple[int, int]:
+    """Канонический код позиции и номер симметрии, которая к нему приводит."""
+    nibbles = [(code >> (4 * i)) & 0xF for i in range(size * size)]
+    best, best_index = None, 0
+    for index, (cells, _) in enumerate(_symmetries_for(size)):
+        transformed = 0
+        for i, e in enumerate(nibbles):
+            if e:
+                transformed |= e << (4 * cells[i])
+        if best is None or transformed < best:
+            best, best_index = transformed, index
+    return best, best_index
+
+
+_SYMMETRY_CACHE: Dict[int, list] = {}
+
+
+def _symmetries_for(size: int) -> list:
+    cached = _SYMMETRY_CACHE.get(size)
+    if cached is None:
+        cached = _SYMMETRY_CACHE[size] = symmetries(size)
+    return cached
+
+
+# =====================
+# Чтение индекса
+# =====================
+
+class Tablebase:
+    """
+    Готовая таблица позиций (файл от build_tablebase), открытая через mmap.
+
+    - lookup(board) -> (вероятность собрать target_value, лучший ход) или None,
+      если позиции в таблице нет (другой размер поля или недостижимая позиция);
+    - best_move(board) / win_probability(board) -- то же по отдельности.
+
+    Поиск -- двоичный поиск по младшим битам кодов внутри своего префикса:
+    не больше log2(meta["max_bucket"]) + 1 чтений из mmap.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, meta_length = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tablebase")
+        if version != VERSION:
+            raise ValueError(
+                f"Unsupported tablebase version: {version} (rebuild: python -m src.ai.tablebase)"
+            )
+
+        self.meta = json.loads(self._mm[_HEADER.size:_HEADER.size + meta_length])
+        self.size = self.meta["size"]
+        self.target_value = self.meta["target_value"]
+        self.new_tile_values = self.meta["new_tile_values"]
+        self.new_tile_probabilities = self.meta["new_tile_probabilities"]
+        self.states = self.meta["states"]
+
+        self._prefixes = self.meta["prefixes"]
+        offsets_at = self.meta["data_offset"]
+        keys_at = offsets_at + 8 * (self._prefixes + 1)
+        self._values_at = keys_at + 4 * self.states
+        self._moves_at = self._values_at + 4 * self.states
+
+        view = memoryview(self._mm)
+        if sys.byteorder == "little":
+            # Столбцы читаются прямо из отображения, bisect идёт по ним без копий
+            self._offsets = view[offsets_at:keys_at].cast("Q")
+            self._keys = view[keys_at:self._values_at].cast("I")
+        else:
+            self._offsets = array("Q", view[offsets_at:keys_at])
+            self._keys = array("I", view[keys_at:self._values_at])
+            self._offsets.byteswap()
+            self._keys.byteswap()
+        view.release()
+
+        self._target_exponent = EXPONENTS[self.target_value]
+        self._symmetries = _symmetries_for(self.size)
+
+    def matches(self, board: Board) -> bool:
+        """Подходит ли таблица к полю (размер и правила новых плиток)."""
+        return (
+            board.size == self.size
+            and list(board.new_tile_values) == self.new_tile_values
+            and [float(p) for p in board.new_tile_probabilities]
+            == [float(p) for p in self.new_tile_probabilities]
+        )
+
+    def lookup(self, board: Board) -> Optional[Tuple[float, Optional[str]]]:
+        if board.size != self.size:
+            return None
+        try:
+            code = board.pack()
+        except ValueError:
+            return None
+        return self.lookup_packed(code)
+
+    def lookup_packed(self, code: int) -> Optional[Tuple[float, Optional[str]]]:
+        """(вероятность, лучший ход) для упакованного поля или None."""
+        if any(((code >> (4 * i)) & 0xF) >= self._target_exponent
+               for i in range(self.size * self.size)):
+            # Плитка уже собрана
+            return 1.0, None
+
+        key, symmetry = canonical(code, self.size)
+        if key == 0:
+            return None
+
+        prefix = key >> _KEY_BITS
+        if prefix >= self._prefixes:
+            return None
+        low = key & _KEY_MASK
+        keys = self._keys
+        stop = self._offsets[prefix + 1]
+        index = bisect_left(keys, low, self._offsets[prefix], stop)
+        if index == stop or keys[index] != low:
+            return None
+
+        value, = _VALUE.unpack_from(self._mm, self._values_at + 4 * index)
+        move = self._mm[self._moves_at + index]
+        if move == NO_MOVE:
+            return float(value), None
+        # Ход записан для канонической позиции: переводим его обратно
+        directions = self._symmetries[symmetry][1]
+        return float(value), DIRECTIONS[directions.index(move)]
+
+    def best_move(self, board: Board) -> Optional[str]:
+        result = self.lookup(board)
+        return result[1] if result is not None else None
+
+    def win_probability(self, board: Board) -> Optional[float]:
+        result = self.lookup(board)
+        return result[0] if result is not None else None
+
+    def close(self) -> None:
+        # Представления столбцов держат отображение: сначала отпускаем их
+        for column in (self._offsets, self._keys):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mm.close()
+
+    def __enter__(self) -> "Tablebase":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# =====================
+# Построение: векторные операции над слоями (NumPy)
+# =====================
+
+class _Geometry:
+    """Ходы, симметрии и проверки для массивов упакованных полей uint64."""
+
+    def __init__(self, size: int):
+        import numpy as np
+
+        if size * size * 4 > 64:
+            raise ValueError("Tablebase boards must fit 64 bits (up to 4x4)")
+
+        self.size = size
+        self.cells = size * size
+        self.row_bits = 4 * size
+        self.row_mask = np.uint64((1 << self.row_bits) - 1)
+
+        table = get_row_table(size)
+        self.left = np.array(table.left, dtype=np.int64).astype(np.uint64)
+        self.right = np.array(table.right, dtype=np.int64).astype(np.uint64)
+
+        # Для каждой симметрии и строки r: код строки -> вклад её клеток
+        # в преобразованное поле. Преобразование поля -- size поисков в таблицах.
+        rows = np.arange(1 << self.row_bits, dtype=np.uint64)
+        self.transforms = []
+        for cells, _ in _symmetries_for(size):
+            per_row = []
+            for r in range(size):
+                contribution = np.zeros(len(rows), dtype=np.uint64)
+                for c in range(size):
+                    nibble = (rows >> np.uint64(4 * c)) & np.uint64(0xF)
+                    contribution |= nibble << np.uint64(4 * cells[r * size + c])
+                per_row.append(contribution)
+            self.transforms.append(per_row)
+
+        # Транспонирование -- симметрия без отражений
+        self._transpose = next(
+            i for i, (cells, _) in enumerate(_symmetries_for(size))
+            if cells[1] == size
+        )
+
+    def _rows(self, codes):
+        import numpy as np
+
+        return [(codes >> np.uint64(self.row_bits * r)) & self.row_mask
+                for r in range(self.size)]
+
+    def _transform(self, rows, index):
+        per_row = self.transforms[index]
+        result = per_row[0][rows[0]]
+        for r in range(1, self.size):
+            result |= per_row[r][rows[r]]
+        return result
+
+    def canonical(self, codes):
+        import numpy as np
+
+        rows = self._rows(codes)
+        best = codes.copy()
+        for index in range(1, len(self.transforms)):
+            np.minimum(best, self._transform(rows, index), out=best)
+        return best
+
+    def _move_rows(self, codes, table):
+        import numpy as np
+
+        rows = self._rows(codes)
+        result = table[rows[0]]
+        for r in range(1, self.size):
+            result |= table[rows[r]] << np.uint64(self.row_bits * r)
+        return result
+
+    def move(self, codes, direction: int):
+        """Ход DIRECTIONS[direction] без новой плитки."""
+        name = DIRECTIONS[direction]
+        table = self.left if name in ("left", "up") else self.right
+        if name in ("left", "right"):
+            return self._move_rows(codes, table)
+        transposed = self._transform(self._rows(codes), self._transpose)
+        moved = self._move_rows(transposed, table)
+        return self._transform(self._rows(moved), self._transpose)
+
+    def max_exponent(self, codes):
+        import numpy as np
+
+        result = np.zeros(len(codes), dtype=np.uint64)
+        for i in range(self.cells):
+            np.maximum(result, (codes >> np.uint64(4 * i)) & np.uint64(0xF), out=result)
+        return result
+
+    def is_empty(self, codes, cell: int):
+        import numpy as np
+
+        return ((codes >> np.uint64(4 * cell)) & np.uint64(0xF)) == 0
+
+
+# Параметры построения, общие для всех задач воркеров:
+# (размер, показатель цели, ((показатель, значение, вероятность), ...))
+_Params = Tuple[int, int, Tuple[Tuple[int, int, float], ...]]
+
+_geometries: Dict[int, _Geometry] = {}
+
+
+def _geometry(size: int) -> _Geometry:
+    geometry = _geometries.get(size)
+    if geometry is None:
+        geometry = _geometries[size] = _Geometry(size)
+    return geometry
+
+
+def _layer_path(work_dir: str, total: int) -> str:
+    return os.path.join(work_dir, f"layer-{total:06d}.npy")
+
+
+def _value_path(work_dir: str, total: int) -> str:
+    return os.path.join(work_dir, f"value-{total:06d}.npy")
+
+
+def _frontier_path(work_dir: str, done: int, total: int) -> str:
+    """Потомки слоя total, накопленные к концу разворота слоя done."""
+    return os.path.join(work_dir, f"frontier-{done:06d}-{total:06d}.npy")
+
+
+def _save_array(path: str, array) -> None:
+    """Атомарная запись .npy: временный файл рядом + os.replace."""
+    import numpy as np
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _save_json(path: str, data) -> None:
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def _load_json(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_array(path: str):
+    import numpy as np
+
+    if not os.path.exists(path):
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+def _value_dtype():
+    import numpy as np
+
+    return np.dtype([("value", "<f8"), ("move", "u1")])
+
+
+def _after_moves(geometry: _Geometry, codes, target_exponent: int):
+    """Позиции после допустимых ходов, не собравших цель (без повторов)."""
+    import numpy as np
+
+    parts = []
+    for direction in range(len(DIRECTIONS)):
+        moved = geometry.move(codes, direction)
+        keep = (moved != codes) & (geometry.max_exponent(moved) < np.uint64(target_exponent))
+        parts.append(moved[keep])
+    return np.unique(np.concatenate(parts))
+
+
+def _expand_chunk(task) -> Dict[int, object]:
+    """
+    Воркер прямого прохода: позиции слоя total[start:stop] ->
+    {значение новой плитки: канонические потомки без повторов}.
+    """
+    import numpy as np
+
+    work_dir, params, total, start, stop = task
+    size, target_exponent, spawns = params
+    geometry = _geometry(size)
+
+    codes = np.array(_load_array(_layer_path(work_dir, total))[start:stop])
+    after = _after_moves(geometry, codes, target_exponent)
+
+    children = {}
+    for exponent, value, _ in spawns:
+        parts = []
+        for cell in range(geometry.cells):
+            free = after[geometry.is_empty(after, cell)]
+            parts.append(free | np.uint64(exponent << (4 * cell)))
+        children[value] = np.unique(geometry.canonical(np.concatenate(parts)))
+    return children
+
+
+def _solve_chunk(task):
+    """
+    Воркер обратного прохода: значения и лучшие ходы позиций слоя
+    total[start:stop] по уже посчитанным слоям total + v.
+    """
+    import numpy as np
+
+    work_dir, params, total, start, stop = task
+    size, target_exponent, spawns = params
+    geometry = _geometry(size)
+
+    codes = np.array(_load_array(_layer_path(work_dir, total))[start:stop])
+    count = len(codes)
+
+    following = []
+    for exponent, value, probability in spawns:
+        layer = _load_array(_layer_path(work_dir, total + value))
+        values = _load_array(_value_path(work_dir, total + value))
+        following.append((exponent, probability, layer, values))
+
+    best = np.full(count, -1.0)
+    best_move = np.full(count, NO_MOVE, dtype=np.uint8)
+
+    for direction in range(len(DIRECTIONS)):
+        moved = geometry.move(codes, direction)
+        legal = moved != codes
+        won = legal & (geometry.max_exponent(moved) >= np.uint64(target_exponent))
+
+        quality = np.where(won, 1.0, 0.0)
+        open_index = np.nonzero(legal & ~won)[0]
+        after = moved[open_index]
+        expected = np.zeros(len(after))
+        empty = np.zeros(len(after))
+
+        for cell in range(geometry.cells):
+            free = np.nonzero(geometry.is_empty(after, cell))[0]
+            if not len(free):
+                continue
+            empty[free] += 1
+            base = after[free]
+            for exponent, probability, layer, values in following:
+                children = geometry.canonical(base | np.uint64(exponent << (4 * cell)))
+                position = np.searchsorted(layer, children)
+                expected[free] += probability * values["value"][position]
+
+        # После хода, изменившего поле, хотя бы одна клетка свободна
+        quality[open_index] = expected / empty
+
+        better = legal & (quality > best)
+        best[better] = quality[better]
+        best_move[better] = direction
+
+    result = np.empty(count, dtype=_value_dtype())
+    result["value"] = np.maximum(best, 0.0)
+    result["move"] = best_move
+    return result
+
+
+# =====================
+# Построение: слои, пул процессов, индекс
+# =====================
+
+def _initial_positions(size: int, spawns, initial_tiles: int) -> Dict[int, set]:
+    """Стартовые позиции (initial_tiles плиток), разложенные по суммам."""
+    layers: Dict[int, set] = {}
+    symmetries_ = _symmetries_for(size)
+    for cells in combinations(range(size * size), initial_tiles):
+        for tiles in product(spawns, repeat=initial_tiles):
+            code = 0
+            for cell, (exponent, _, _) in zip(cells, tiles):
+                code |= exponent << (4 * cell)
+            total = sum(value for _, value, _ in tiles)
+            key = min(
+                sum(((code >> (4 * i)) & 0xF) << (4 * sym[i]) for i in range(size * size))
+                for sym, _ in symmetries_
+            )
+            layers.setdefault(total, set()).add(key)
+    return layers
+
+
+def _chunks(count: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def _run(pool, function, tasks):
+    if pool is None:
+        return [function(task) for task in tasks]
+    return pool.map(function, tasks)
+
+
+def _work_dir_for(root: str, meta: dict) -> str:
+    """Свой каталог на каждый набор правил: продолжать можно только то же построение."""
+    digest = hashlib.sha1(json.dumps(meta, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    size = meta["size"]
+    return os.path.join(root, f"{size}x{size}-{meta['target_value']}-{digest}")
+
+
+def build_tablebase(
+    path: str = DEFAULT_PATH,
+    size: int = 3,
+    target_value: int = DEFAULT_TARGET,
+    new_tile_values: Optional[Sequence[int]] = None,
+    new_tile_probabilities: Optional[Sequence[float]] = None,
+    initial_tiles: int = 2,
+    workers: Optional[int] = None,
+    work_dir: str = DEFAULT_WORK_DIR,
+    chunk_size: int = 1 << 17,
+    log=None,
+) -> dict:
+    """
+    Строит таблицу и пишет индекс в path. Возвращает статистику построения.
+    Повторный вызов с теми же правилами продолжает прерванное построение
+    (готовые слои берутся из work_dir).
+    """
+    values = list(new_tile_values or [2, 4])
+    probabilities = list(new_tile_probabilities or [0.9, 0.1])
+    if len(values) != len(probabilities):
+        raise ValueError("new_tile_values and new_tile_probabilities must match")
+    if target_value not in EXPONENTS or target_value <= max(values):
+        raise ValueError(f"Unsupported target value: {target_value}")
+    for value in values:
+        if value not in EXPONENTS or value == 0:
+            raise ValueError(f"Spawn value {value} is not a power of two")
+
+    total_probability = float(sum(probabilities))
+    spawns = tuple(
+        (EXPONENTS[value], value, p / total_probability)
+        for value, p in zip(values, probabilities)
+    )
+    params: _Params = (size, EXPONENTS[target_value], spawns)
+    _geometry(size)  # проверка размера до запуска пула
+
+    meta = {
+        "size": size,
+        "target_value": target_value,
+        "new_tile_values": values,
+        "new_tile_probabilities": probabilities,
+        "initial_tiles": initial_tiles,
+    }
+    work_dir = _work_dir_for(work_dir, meta)
+    os.makedirs(work_dir, exist_ok=True)
+    log = log or (lambda message: None)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    start_time = time.perf_counter()
+
+    try:
+        totals = _forward(work_dir, params, initial_tiles, pool, chunk_size, log)
+        _backward(work_dir, params, totals, pool, chunk_size, log)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    states, max_bucket = _write_index(path, work_dir, totals, meta)
+    stats = {
+        "states": states,
+        "max_bucket": max_bucket,
+        "layers": len(totals),
+        "seconds": round(time.perf_counter() - start_time, 1),
+        "bytes": os.path.getsize(path),
+        "work_dir": work_dir,
+    }
+    log(f"index: {states} states (bucket <= {max_bucket}), {stats['bytes']} bytes -> {path}")
+    return stats
+
+
+def _forward(work_dir, params, initial_tiles, pool, chunk_size, log) -> List[int]:
+    """Прямой проход: слои достижимых позиций по возрастанию суммы."""
+    import numpy as np
+
+    manifest = os.path.join(work_dir, "layers.json")
+    finished = _load_json(manifest)
+    if finished is not None:
+        return finished["totals"]
+
+    size, _, spawns = params
+    initial = _initial_positions(size, spawns, initial_tiles)
+    step = math.gcd(*[value for _, value, _ in spawns])
+    largest = max(value for _, value, _ in spawns)
+
+    checkpoint = os.path.join(work_dir, "frontier.json")
+    saved = _load_json(checkpoint)
+    if saved is not None:
+        # Слои до done развёрнуты, их потомки -- во фронте на диске
+        totals: List[int] = saved["totals"]
+        pending: Dict[int, list] = {
+            t: [np.load(_frontier_path(work_dir, saved["done"], t))] for t in saved["pending"]
+        }
+        total = saved["done"] + step
+        last = saved["last"]
+        log(f"forward: resume after sum {saved['done']}")
+    else:
+        totals = []
+        # Потомки ещё не собранных слоёв: сумма -> список массивов
+        pending = {}
+        total = min(initial)
+        last = total
+
+    while total <= last + largest:
+        path = _layer_path(work_dir, total)
+        layer = _load_array(path)
+        if layer is None:
+            parts = pending.pop(total, [])
+            if total in initial:
+                parts.append(np.array(sorted(initial[total]), dtype=np.uint64))
+            if parts:
+                layer = np.unique(np.concatenate(parts))
+                _save_array(path, layer)
+        pending.pop(total, None)
+
+        if layer is not None and len(layer):
+            totals.append(total)
+            last = total
+            tasks = [(work_dir, params, total, a, b) for a, b in _chunks(len(layer), chunk_size)]
+            for children in _run(pool, _expand_chunk, tasks):
+                for value, codes in children.items():
+                    if len(codes):
+                        pending.setdefault(total + value, []).append(codes)
+            log(f"forward: sum {total}, {len(layer)} states")
+            _save_frontier(work_dir, checkpoint, total, totals, last, pending)
+        total += step
+
+    _save_json(manifest, {"totals": totals})
+    saved = _load_json(checkpoint)
+    if saved is not None:
+        _drop_frontier(work_dir, saved)
+        os.remove(checkpoint)
+    return totals
+
+
+def _save_frontier(work_dir, checkpoint, done, totals, last, pending) -> None:
+    """
+    Сохраняет фронт после разворота слоя done. Фронт склеивается в один массив
+    на сумму (в памяти тоже), файлы прошлого фронта удаляются после записи
+    нового checkpoint.
+    """
+    import numpy as np
+
+    for total, parts in pending.items():
+        merged = np.unique(np.concatenate(parts))
+        pending[total] = [merged]
+        _save_array(_frontier_path(work_dir, done, total), merged)
+
+    previous = _load_json(checkpoint)
+    _save_json(checkpoint, {"done": done, "last": last, "totals": totals, "pending": sorted(pending)})
+    if previous is not None:
+        _drop_frontier(work_dir, previous)
+
+
+def _drop_frontier(work_dir, saved) -> None:
+    for total in saved["pending"]:
+        try:
+            os.remove(_frontier_path(work_dir, saved["done"], total))
+        except FileNotFoundError:
+            pass
+
+
+def _backward(work_dir, params, totals, pool, chunk_size, log) -> None:
+    """Обратный проход: значения слоёв от больших сумм к малым."""
+    import numpy as np
+
+    for total in reversed(totals):
+        path = _value_path(work_dir, total)
+        if os.path.exists(path):
+            continue
+
+        count = len(_load_array(_layer_path(work_dir, total)))
+        tasks = [(work_dir, params, total, a, b) for a, b in _chunks(count, chunk_size)]
+        result = np.concatenate(_run(pool, _solve_chunk, tasks))
+        _save_array(path, result)
+        log(f"backward: sum {total}, {count} states")
+
+
+def _write_index(path, work_dir, totals, meta) -> Tuple[int, int]:
+    """
+    Собирает слои в отсортированный индекс (формат -- в начале модуля).
+    Коды разных слоёв не повторяются: сумма плиток определяется кодом.
+    Возвращает (число позиций, длина самой большой корзины).
+    """
+    import numpy as np
+
+    codes = np.concatenate([np.asarray(_load_array(_layer_path(work_dir, t))) for t in totals])
+    solved = np.concatenate([np.asarray(_load_array(_value_path(work_dir, t))) for t in totals])
+    count = len(codes)
+
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    solved = solved[order]
+
+    high = codes >> np.uint64(_KEY_BITS)
+    prefixes = int(high[-1]) + 1 if count else 1
+    offsets = np.searchsorted(high, np.arange(prefixes + 1, dtype=np.uint64)).astype("<u8")
+
+    max_bucket = int(np.diff(offsets).max()) if count else 0
+    meta = dict(meta, states=count, prefixes=prefixes, max_bucket=max_bucket)
+    # Длина заголовка зависит от data_offset: подбираем до сходимости
+    offset = 0
+    while True:
+        meta["data_offset"] = offset
+        encoded = json.dumps(meta).encode("utf-8")
+        needed = -(-(_HEADER.size + len(encoded)) // 16) * 16
+        if needed == offset:
+            break
+        offset = needed
+
+    tmp_path = path + ".tmp"
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        header = _HEADER.pack(MAGIC, VERSION, len(encoded)) + encoded
+        f.write(header.ljust(offset, b"\x00"))
+        f.write(offsets.tobytes())
+        f.write((codes & np.uint64(_KEY_MASK)).astype("<u4").tobytes())
+        f.write(solved["value"].astype("<f4").tobytes())
+        f.write(solved["move"].astype("u1").tobytes())
+    os.replace(tmp_path, path)
+    return count, max_bucket
+
+
+def start_probability(tablebase: Tablebase, initial_tiles: int = 2) -> float:
+    """Вероятность собрать цель из случайной стартовой позиции."""
+    size = tablebase.size
+    total = float(sum(tablebase.new_tile_probabilities))
+    spawns = [(EXPONENTS[v], p / total)
+              for v, p in zip(tablebase.new_tile_values, tablebase.new_tile_probabilities)]
+
+    def place(code: int, left: int) -> float:
+        if left == 0:
+            result = tablebase.lookup_packed(code)
+            return result[0] if result is not None else 0.0
+        cells = [i for i in range(size * size) if not (code >> (4 * i)) & 0xF]
+        return sum(
+            p * place(code | (exponent << (4 * cell)), left - 1)
+            for cell in cells
+            for exponent, p in spawns
+        ) / len(cells)
+
+    return place(0, initial_tiles)
+
+
+if __name__ == "__main__":
+    # python -m src.ai.tablebase [--target 256] [--workers N] [--output PATH]
+    import argparse
+
+    from src.config.config_manager import ConfigManager
+
+    parser = argparse.ArgumentParser(description="Build the exact 3x3 tablebase")
+    parser.add_argument("--config", default="src/config/game_config.json")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--target", type=int, default=None,
+                        help="tile to reach (default: tablebase.target_value from the config)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR)
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    output = args.output or config.tablebase_path
+    stats = build_tablebase(
+        output,
+        size=args.size,
+        target_value=args.target or config.tablebase_target,
+        new_tile_values=config.new_tile_values,
+        new_tile_probabilities=config.new_tile_probabilities,
+        initial_tiles=config.initial_tiles,
+        workers=args.workers,
+        work_dir=args.work_dir,
+        log=lambda message: print(message, file=sys.stderr, flush=True),
+    )
+    print(json.dumps(stats, indent=2))
+
+    with Tablebase(output) as tablebase:
+        print(f"win probability from the start: "
+              f"{start_probability(tablebase, config.initial_tiles):.6f}")
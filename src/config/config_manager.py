@@ -48,6 +48,46 @@ class ConfigManager:
     def new_tile_probabilities(self) -> list:
         return list(self._config_data["game"]["new_tile_probabilities"])
 
+    @property
+    def undo_budget_bytes(self) -> int:
+        return int(self._config_data["game"].get("undo_budget_bytes", 64 * 1024))
+
+    @property
+    def board_engine(self) -> str:
+        return self._config_data["game"].get("engine", "list")
+
     @property
     def highscore_file(self) -> str:
-        return self._config_data["score"]["highscore_file"]
\ No newline at end of file
+        return self._config_data["score"]["highscore_file"]
+
+    @property
+    def recording_enabled(self) -> bool:
+        return bool(self._config_data.get("recording", {}).get("enabled", False))
+
+    @property
+    def recording_directory(self) -> str:
+        return self._config_data.get("recording", {}).get("directory", "recordings")
+
+    @property
+    def keyframe_interval(self) -> int:
+        return int(self._config_data.get("recording", {}).get("keyframe_interval", 256))
+
+    @property
+    def tablebase_path(self) -> str:
+        return self._config_data.get("tablebase", {}).get("path", ".cache/tablebase-3x3.tb")
+
+    @property
+    def tablebase_target(self) -> int:
+        return int(self._config_data.get("tablebase", {}).get("target_value", 256))
+
+    @property
+    def metrics_enabled(self) -> bool:
+        return bool(self._config_data.get("metrics", {}).get("enabled", False))
+
+    @property
+    def metrics_path(self) -> str:
+        return self._config_data.get("metrics", {}).get("path", "metrics.json")
+
+    @property
+    def metrics_flush_interval(self) -> float:
+        return float(self._config_data.get("metrics", {}).get("flush_interval", 10))
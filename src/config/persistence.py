@@ -0,0 +1,194 @@
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class PersistenceError(Exception):
+    """
+    Фоновые записи, которые не удались (flush() / close()).
+    errors -- список (путь, исключение) в порядке сбоев.
+    """
+
+    def __init__(self, errors: List[Tuple[str, BaseException]]):
+        self.errors = errors
+        details = "; ".join(f"{path}: {error!r}" for path, error in errors)
+        super().__init__(f"{len(errors)} write(s) failed: {details}")
+
+
+def write_json_atomic(path: str, data) -> None:
+    """
+    Атомарная запись JSON: пишем во временный файл рядом и переименовываем.
+    При сбое посреди записи старый файл остаётся целым.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class PersistenceService:
+    """
+    Отложенная запись JSON-файлов (рекорд, настройки) в фоновом потоке.
+
+    - save_json() только запоминает последнее значение и сразу возвращается,
+      поэтому его можно звать из цикла отрисовки;
+    - запросы к одному файлу склеиваются: пишется только последнее значение,
+      не раньше чем через debounce секунд после последнего запроса
+      и не позже чем через max_delay после первого;
+    - запись атомарная (write_json_atomic);
+    - flush() / close() дописывают всё немедленно (GameEngine при выходе);
+    - ошибка записи (диск, несериализуемое значение) не останавливает
+      фоновый поток: она пишется в лог, копится и поднимается из
+      ближайшего flush() / close() как PersistenceError.
+
+    Счётчики: writes, writes_avoided (склеенные запросы), write_seconds.
+    """
+
+    def __init__(self, debounce: float = 0.5, max_delay: float = 2.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        # path -> (данные, время первого запроса, время последнего запроса)
+        self._pending = {}
+        self._cond = threading.Condition()
+        # Запись идёт под этим замком, чтобы старое значение не легло поверх нового
+        self._io_lock = threading.Lock()
+        self._closed = False
+
+        # Статистика
+        self.requests = 0
+        self.writes = 0
+        self.writes_avoided = 0
+        self.write_errors = 0
+        self._errors: List[Tuple[str, BaseException]] = []
+        self.write_seconds = 0.0
+        self.max_write_seconds = 0.0
+
+        self._thread = threading.Thread(
+            target=self._worker, name="persistence", daemon=True
+        )
+        self._thread.start()
+
+    # =====================
+    # Публичный API
+    # =====================
+
+    def save_json(self, path: str, data) -> None:
+        """Поставить запись в очередь (данные копируются)."""
+        snapshot = copy.deepcopy(data)
+        now = time.monotonic()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PersistenceService is closed")
+
+            self.requests += 1
+            pending = self._pending.get(path)
+            if pending is not None:
+                # Предыдущее значение так и не будет записано
+                self.writes_avoided += 1
+                self._pending[path] = (snapshot, pending[1], now)
+            else:
+                self._pending[path] = (snapshot, now, now)
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """
+        Синхронно записывает всё, что ждёт в очереди. Бросает PersistenceError,
+        если с прошлого flush() какая-то запись (здесь или в фоне) не удалась.
+        """
+        with self._io_lock:
+            with self._cond:
+                items = list(self._pending.items())
+                self._pending.clear()
+            for path, (data, _, _) in items:
+                self._write(path, data)
+            errors, self._errors = self._errors, []
+        if errors:
+            raise PersistenceError(errors)
+
+    def close(self) -> None:
+        """Дописывает очередь и останавливает фоновый поток (см. flush())."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "writes_avoided": self.writes_avoided,
+            "write_errors": self.write_errors,
+            "avg_write_ms": round(self.write_seconds / self.writes * 1000, 3) if self.writes else 0.0,
+            "max_write_ms": round(self.max_write_seconds * 1000, 3),
+        }
+
+    # =====================
+    # Фоновый поток
+    # =====================
+
+    def _due_time(self, first: float, last: float) -> float:
+        return min(last + self.debounce, first + self.max_delay)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        now = time.monotonic()
+                        due = min(self._due_time(f, l) for _, f, l in self._pending.values())
+                        if due <= now:
+                            break
+                        self._cond.wait(due - now)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+
+            with self._io_lock:
+                now = time.monotonic()
+                with self._cond:
+                    ready = [
+                        (path, data)
+                        for path, (data, first, last) in self._pending.items()
+                        if self._due_time(first, last) <= now
+                    ]
+                    for path, _ in ready:
+                        del self._pending[path]
+                for path, data in ready:
+                    self._write(path, data)
+
+    def _write(self, path: str, data) -> None:
+        start = time.perf_counter()
+        try:
+            write_json_atomic(path, data)
+        except Exception as error:
+            # Не только OSError: несериализуемое значение даёт TypeError/ValueError,
+            # и фоновый поток не должен из-за него умереть
+            self.write_errors += 1
+            self._errors.append((path, error))
+            logger.error("Failed to write %s: %r", path, error)
+            return
+
+        elapsed = time.perf_counter() - start
+        self.writes += 1
+        self.write_seconds += elapsed
+        self.max_write_seconds = max(self.max_write_seconds, elapsed)
@@ -1,18 +1,23 @@
 import json
 import os
 
+from src.config.persistence import write_json_atomic
+
 
 class SettingsManager:
     """
     Управляет пользовательскими настройками:
-    - размер поля (3x3, 4x4, 5x5)
+    - размер поля (3x3 .. 16x16, см. BOARD_SIZES в settings_screen.py)
     - тема оформления (light / dark)
     """
 
-    def __init__(self, path="src/config/settings.json"):
+    def __init__(self, path="src/config/settings.json", persistence=None):
         self.path = path
         self.settings = {}
 
+        # PersistenceService: если задан, запись уходит в фоновый поток
+        self.persistence = persistence
+
         self.load()
 
     def load(self):
@@ -30,8 +35,10 @@ class SettingsManager:
 
     def save(self):
         """Сохранить текущие настройки."""
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.settings, f, indent=4)
+        if self.persistence is not None:
+            self.persistence.save_json(self.path, self.settings)
+        else:
+            write_json_atomic(self.path, self.settings)
 
     # =============== GETTERS ==================
     @property
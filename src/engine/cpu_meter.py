@@ -0,0 +1,43 @@
+import time
+
+
+class CpuMeter:
+    """
+    Учёт процессорного времени главного цикла по режимам ("idle", "active").
+    Каждая итерация цикла приписывается режиму, в котором она началась;
+    report() даёт CPU-секунды на минуту реального времени для каждого режима.
+    """
+
+    def __init__(self):
+        self.cpu = {}
+        self.wall = {}
+        self._mode = None
+        self._cpu_start = 0.0
+        self._wall_start = 0.0
+
+    def switch(self, mode: str) -> None:
+        """Закрывает текущий отрезок и начинает отрезок в режиме mode."""
+        cpu_now = time.process_time()
+        wall_now = time.perf_counter()
+
+        if self._mode is not None:
+            self.cpu[self._mode] = self.cpu.get(self._mode, 0.0) + cpu_now - self._cpu_start
+            self.wall[self._mode] = self.wall.get(self._mode, 0.0) + wall_now - self._wall_start
+
+        self._mode = mode
+        self._cpu_start = cpu_now
+        self._wall_start = wall_now
+
+    def stop(self) -> None:
+        self.switch(None)
+
+    def report(self) -> dict:
+        result = {}
+        for mode, wall in self.wall.items():
+            cpu = self.cpu.get(mode, 0.0)
+            result[mode] = {
+                "wall_seconds": round(wall, 3),
+                "cpu_seconds": round(cpu, 3),
+                "cpu_seconds_per_minute": round(cpu / wall * 60.0, 3) if wall else 0.0,
+            }
+        return result
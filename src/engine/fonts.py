@@ -0,0 +1,188 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from src.config.persistence import write_json_atomic
+
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "fonts.json")
+
+_CACHE_VERSION = 1
+
+# Разрешённый шрифт: путь к файлу (None -- встроенный шрифт pygame)
+# и нужно ли дорисовывать жирность/курсив, если отдельного файла нет
+Resolution = Tuple[Optional[str], bool, bool]
+
+
+class FontRegistry:
+    """
+    Общий на процесс реестр шрифтов и готовых надписей.
+
+    - get(face, size, bold, italic) -- один объект Font на набор параметров.
+      Поиск системного шрифта (pygame.font.SysFont опрашивает fc-list или
+      реестр) выполняется один раз на (face, bold, italic): размер на поиск
+      не влияет, поэтому все размеры одного начертания открываются сразу
+      по найденному пути;
+    - найденные пути сохраняются в cache_path (JSON), и при следующем запуске
+      системный список шрифтов не строится вовсе, пока файл шрифта на месте;
+    - label(...) -- кэш отрисованных статичных надписей (кнопки, заголовки)
+      с вытеснением давно не использованных (LRU).
+
+    Сцены и Renderer пересоздаются в apply_settings(), а реестр переживает
+    это, так что повторное создание сцен шрифты не ищет и не открывает.
+    """
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH, label_capacity: int = 256):
+        self.cache_path = cache_path
+        self.label_capacity = label_capacity
+
+        self._resolved: Dict[str, Resolution] = {}
+        self._fonts: Dict[tuple, pygame.font.Font] = {}
+        self._labels: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._loaded = False
+
+        # Статистика
+        self.resolutions = 0
+        self.resolution_hits = 0
+        self.disk_entries = 0
+        self.fonts_created = 0
+        self.label_hits = 0
+        self.label_misses = 0
+
+    # ---------- Разрешение имени шрифта ---------- #
+
+    @staticmethod
+    def _key(face: str, bold: bool, italic: bool) -> str:
+        return f"{face}|{int(bold)}|{int(italic)}"
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != _CACHE_VERSION:
+            return
+
+        for key, (path, set_bold, set_italic) in data.get("fonts", {}).items():
+            # Шрифт удалили или переустановили -- найдём заново
+            if path is None or os.path.exists(path):
+                self._resolved[key] = (path, set_bold, set_italic)
+                self.disk_entries += 1
+
+    def _save(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            write_json_atomic(self.cache_path, {
+                "version": _CACHE_VERSION,
+                "fonts": {key: list(value) for key, value in self._resolved.items()},
+            })
+        except OSError:
+            pass
+
+    def resolve(self, face: str, bold: bool = False, italic: bool = False) -> Resolution:
+        """Путь к файлу шрифта и признаки дорисовки стиля (как у SysFont)."""
+        if not self._loaded:
+            self._load()
+
+        key = self._key(face, bold, italic)
+        resolution = self._resolved.get(key)
+        if resolution is not None:
+            self.resolution_hits += 1
+            return resolution
+
+        # SysFont сам выбирает файл и стиль; конструктор лишь запоминает выбор
+        found = []
+
+        def remember(path, size, set_bold, set_italic):
+            found.append((path, bool(set_bold), bool(set_italic)))
+            return None
+
+        pygame.font.SysFont(face, 1, bold=bold, italic=italic, constructor=remember)
+        resolution = found[0]
+        if resolution[0] is None:
+            # Встроенный шрифт pygame: Font(None) каждый раз ищет его в пакете
+            default = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+            if os.path.exists(default):
+                resolution = (default, resolution[1], resolution[2])
+
+        self._resolved[key] = resolution
+        self.resolutions += 1
+        self._save()
+        return resolution
+
+    # ---------- Шрифты ---------- #
+
+    def get(self, face: str, size: int, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+        key = (face, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is not None:
+            return font
+
+        path, set_bold, set_italic = self.resolve(face, bold, italic)
+        try:
+            font = pygame.font.Font(path, size)
+        except OSError:
+            font = pygame.font.Font(None, size)
+        if set_bold:
+            font.set_bold(True)
+        if set_italic:
+            font.set_italic(True)
+
+        self._fonts[key] = font
+        self.fonts_created += 1
+        return font
+
+    # ---------- Надписи ---------- #
+
+    def label(self, text: str, face: str, size: int, color, bold: bool = False,
+              italic: bool = False, antialias: bool = True) -> pygame.Surface:
+        """
+        Отрисованная надпись. Поверхность общая -- её можно блитить,
+        но нельзя менять.
+        """
+        key = (text, face, size, bold, italic, tuple(color), antialias)
+        labels = self._labels
+        surface = labels.get(key)
+        if surface is not None:
+            labels.move_to_end(key)
+            self.label_hits += 1
+            return surface
+
+        self.label_misses += 1
+        surface = self.get(face, size, bold, italic).render(text, antialias, color)
+        labels[key] = surface
+        if len(labels) > self.label_capacity:
+            labels.popitem(last=False)
+        return surface
+
+    # ---------- Служебное ---------- #
+
+    def clear(self) -> None:
+        """Сбрасывает шрифты и надписи (после pygame.font.quit())."""
+        self._fonts.clear()
+        self._labels.clear()
+
+    def stats(self) -> dict:
+        return {
+            "resolutions": self.resolutions,
+            "resolution_hits": self.resolution_hits,
+            "disk_entries": self.disk_entries,
+            "fonts": len(self._fonts),
+            "fonts_created": self.fonts_created,
+            "labels": len(self._labels),
+            "label_hits": self.label_hits,
+            "label_misses": self.label_misses,
+        }
+
+
+# Общий реестр на процесс (как LAYERS в layers.py)
+FONTS = FontRegistry()
@@ -1,11 +1,23 @@
+import itertools
+import os
+import time
+
 import pygame
 
 from src.config.config_manager import ConfigManager
 from src.config.settings_manager import SettingsManager
+from src.config.persistence import PersistenceError, PersistenceService
+
+from src.game.board import create_board
+from src.game.history import MoveHistory
+from src.game.recording import GameRecorder
 
-from src.game.board import Board
+from src.ai.tablebase import Tablebase
 
 from src.engine.renderer import Renderer
+from src.engine.cpu_meter import CpuMeter
+from src.engine.profiler import FrameProfiler
+from src.engine.metrics import MetricsCollector
 
 from src.ui.menu import Menu
 from src.ui.settings_screen import SettingsScreen
@@ -22,66 +34,169 @@ class GameEngine:
     - GAME_OVER (проигрыш)
     """
 
-    def __init__(self, config_path="src/config/game_config.json"):
+    def __init__(self, config_path="src/config/game_config.json",
+                 event_driven=True, idle_timeout_ms=1000, report_cpu=False,
+                 profile=False, profile_path=None, profile_overlay=False,
+                 fullscreen=False):
+        self._started = time.perf_counter()
         pygame.init()
 
+        # Режим цикла: без анимаций ждём события, а не крутим 60 FPS
+        self.event_driven = event_driven
+        self.idle_timeout_ms = idle_timeout_ms
+        self.fps = 60
+
+        # Учёт CPU по режимам idle / active (печатается при выходе)
+        self.report_cpu = report_cpu
+        self.cpu_meter = CpuMeter()
+
+        # Пофазный профиль кадров: None -- выключен (F3 -- оверлей)
+        self.profiler = None
+        self.profile_path = profile_path
+        if profile or profile_path or profile_overlay:
+            self.profiler = FrameProfiler(fps=self.fps, overlay=profile_overlay)
+
+        # Запись рекорда и настроек на диск -- в фоне, вне цикла отрисовки
+        self.persistence = PersistenceService()
+
         # Конфиги
         self.config = ConfigManager(config_path)
-        self.settings_manager = SettingsManager()
+        self.settings_manager = SettingsManager(persistence=self.persistence)
 
-        # Окно
+        # Окно: размер можно менять мышью, F11 -- полный экран
         self.window_size = (600, 700)
-        self.screen = pygame.display.set_mode(self.window_size)
+        self.windowed_size = self.window_size
+        self.fullscreen = fullscreen
+        self.screen = self._set_mode()
         pygame.display.set_caption("2048")
 
         # Сцены
-        self.menu = Menu(self.screen)
-        self.settings_screen = SettingsScreen(self.screen, self.settings_manager)
-        self.game_over_screen = GameOverScreen(self.screen)
+        self._build_scenes()
 
         # Логика Board + Renderer будут заменяться при apply_settings()
         self.board = None
         self.renderer = None
+        self.recorder = None
+        # Счётчики партий для метрик (подписчик поля, пишет файл в фоне)
+        self.metrics = None
+        if self.config.metrics_enabled:
+            self.metrics = MetricsCollector(
+                self.config.metrics_path,
+                flush_interval=self.config.metrics_flush_interval,
+                persistence=self.persistence,
+            )
+        self.history = MoveHistory(budget_bytes=self.config.undo_budget_bytes)
+        # Точная таблица 3x3 для подсказок (открывается при первом H)
+        self.tablebase = None
         self.apply_settings()
 
         # Состояние
         self.state = "MENU"
         self.running = True
 
+        # Какая сцена сейчас на экране (для частичной перерисовки)
+        self._drawn_state = None
+        self._scene_dirty = True
+
+    # ======================================================
+    # Окно
+    # ======================================================
+
+    def _set_mode(self):
+        if self.fullscreen:
+            # (0, 0) -- разрешение рабочего стола
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            screen = pygame.display.set_mode(self.windowed_size, pygame.RESIZABLE)
+        self.window_size = screen.get_size()
+        return screen
+
+    def _build_scenes(self):
+        # Сцены считают раскладку от размера экрана (см. layout.py),
+        # их статичные слои в LAYERS ключуются размером окна
+        self.menu = Menu(self.screen)
+        self.settings_screen = SettingsScreen(self.screen, self.settings_manager)
+        self.game_over_screen = GameOverScreen(self.screen)
+
+    def resize(self, size=None):
+        """
+        Новый размер окна (VIDEORESIZE) или переключение полного экрана:
+        раскладка сцен и доски пересчитывается, слои, плитки и надписи
+        растеризуются в новом размере один раз и дальше берутся из кэшей.
+        """
+        if size is not None and not self.fullscreen:
+            # Меньше половины базового окна плитки 16x16 не помещаются
+            self.windowed_size = (max(size[0], 300), max(size[1], 350))
+        self.screen = self._set_mode()
+
+        self._build_scenes()
+        self.renderer.resize(self.screen)
+        if self.profiler is not None:
+            self.profiler.invalidate_overlay()
+        self._scene_dirty = True
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        self.resize()
+
     # ======================================================
     # Применение настроек (board size, theme)
     # ======================================================
 
     def apply_settings(self):
         """Пересоздаёт Board и Renderer при изменении настроек."""
+        start = time.perf_counter()
         size = self.settings_manager.board_size
         theme = self.settings_manager.theme  # пока не используем, позже добавим цветовые темы
 
-        # Создаём новую логику игры
-        self.board = Board(
+        # Создаём новую логику игры (движок "list" или "bitboard" из конфига)
+        self.board = create_board(
+            engine=self.config.board_engine,
             size=size,
             target_value=self.config.target_value,
             new_tile_values=self.config.new_tile_values,
             new_tile_probabilities=self.config.new_tile_probabilities,
         )
+        self.history.clear()
+        # Ходы записывают перемещения плиток -- по ним Renderer анимирует сдвиг
+        self.board.track_slides = True
+        if self.metrics is not None:
+            self.metrics.attach(self.board)
 
         # Создаём новый Renderer
         self.renderer = Renderer(
             self.screen,
             self.board,
-            theme=self.settings_manager.theme
+            theme=self.settings_manager.theme,
+            persistence=self.persistence,
         )
 
+        if self.profiler is not None:
+            self.profiler.record_settings(time.perf_counter() - start)
+
     # ======================================================
     # Обработка событий
     # ======================================================
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+
+        for event in events:
 
             if event.type == pygame.QUIT:
                 self.running = False
 
+            # Окно перекрыли/восстановили -- нужен полный кадр
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._scene_dirty = True
+
+            if event.type == pygame.VIDEORESIZE and event.size != self.window_size:
+                self.resize(event.size)
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                self.toggle_fullscreen()
+
             # ------------------- MENU -------------------
             if self.state == "MENU":
                 if event.type == pygame.MOUSEBUTTONDOWN:
@@ -107,6 +222,8 @@ class GameEngine:
 
                     elif action in ("refresh_game", "refresh_theme"):
                         self.apply_settings()
+                        # Подсветка выбранной кнопки изменилась
+                        self._scene_dirty = True
 
             # ------------------- GAME -------------------
             elif self.state == "GAME":
@@ -115,6 +232,10 @@ class GameEngine:
                     if event.key == pygame.K_ESCAPE:
                         self.state = "MENU"
 
+                    if event.key == pygame.K_F3 and self.profiler is not None:
+                        self.profiler.toggle_overlay()
+                        self._scene_dirty = True
+
                     moves = {
                         pygame.K_LEFT: "left",
                         pygame.K_RIGHT: "right",
@@ -122,12 +243,28 @@ class GameEngine:
                         pygame.K_DOWN: "down",
                     }
 
+                    if event.key in (pygame.K_z, pygame.K_BACKSPACE):
+                        self.undo()
+                    elif event.key == pygame.K_y:
+                        self.redo()
+                    elif event.key == pygame.K_h:
+                        self.show_hint()
+
                     if event.key in moves:
+                        snapshot = self.history.snapshot(self.board)
+                        if self.profiler is not None:
+                            move_start = time.perf_counter()
                         moved, gained, won, lost = self.board.move(moves[event.key])
+                        if self.profiler is not None:
+                            self.profiler.record_move(time.perf_counter() - move_start)
 
                         if moved:
-                            # Запускаем анимацию "поп" плиток
-                            self.renderer.start_move_animation()
+                            self.history.push(snapshot)
+                            self.renderer.hud.hint = ""
+                            # Сдвиг плиток по записи хода, затем "поп" слияний
+                            self.renderer.start_move_animation(
+                                self.board.last_slides, self.board.last_spawn[0]
+                            )
 
                         if lost:
                             self.state = "GAME_OVER"
@@ -149,38 +286,202 @@ class GameEngine:
 
     def start_game(self):
         """Начать новую игру."""
+        self._attach_recorder()
         self.board.reset(initial_tiles=self.config.initial_tiles)
+        self.history.clear()
+        self.renderer.stop_animation()
+        self.renderer.hud.hint = ""
         self.state = "GAME"
 
+    def undo(self):
+        """Отменить последний ход (Z / Backspace)."""
+        if self.history.undo(self.board):
+            self._history_jumped()
+
+    def redo(self):
+        """Повторить отменённый ход (Y)."""
+        if self.history.redo(self.board):
+            self._history_jumped()
+
+    def show_hint(self):
+        """Подсказка лучшего хода из точной таблицы (H, поле 3x3)."""
+        tablebase = self._get_tablebase()
+        if tablebase is not None and tablebase.size != self.board.size:
+            hint = f"Hint: only on {tablebase.size}x{tablebase.size}"
+        elif tablebase is None or not tablebase.matches(self.board):
+            hint = "Hint: no tablebase"
+        else:
+            result = tablebase.lookup(self.board)
+            if result is None:
+                hint = "Hint: unknown position"
+            else:
+                probability, direction = result
+                hint = f"Hint: {direction or '-'} ({probability:.1%} to {tablebase.target_value})"
+        self.renderer.hud.hint = hint
+
+    def _get_tablebase(self):
+        # Таблица строится отдельно: python -m src.ai.tablebase
+        if self.tablebase is None and os.path.exists(self.config.tablebase_path):
+            try:
+                self.tablebase = Tablebase(self.config.tablebase_path)
+            except ValueError as error:
+                # Файл старого формата или чужой -- подсказок просто нет
+                print(error)
+        return self.tablebase
+
+    def _attach_recorder(self):
+        """
+        Запись партий: файл открывается к первой партии и продолжается, пока
+        не сменится размер поля (новое поле того же размера -- attach()).
+        Смена темы и выход без игры пустых файлов не оставляют.
+        """
+        if not self.config.recording_enabled:
+            return
+        recorder = self.recorder
+        if recorder is not None and recorder.board.size == self.board.size:
+            if recorder.board is not self.board:
+                recorder.attach(self.board)
+            return
+
+        if recorder is not None:
+            recorder.close()
+        self.recorder = GameRecorder(
+            self._new_recording_path(),
+            self.board,
+            keyframe_interval=self.config.keyframe_interval,
+        )
+
+    def _new_recording_path(self):
+        """Свободное имя файла записи; создаётся сразу (O_EXCL), чтобы не затереть чужой."""
+        directory = self.config.recording_directory
+        os.makedirs(directory, exist_ok=True)
+        size = self.board.size
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        for n in itertools.count():
+            suffix = f"-{n}" if n else ""
+            path = os.path.join(directory, f"{stamp}{suffix}-{size}x{size}.rec")
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            return path
+
+    def _history_jumped(self):
+        self.renderer.stop_animation()
+        self.renderer.hud.hint = ""
+        # Позиция сменилась без хода -- отмечаем это в записи партии
+        if self.recorder is not None:
+            self.recorder.record_position(self.board, self.history.turn)
+
     # ======================================================
     # Главный цикл
     # ======================================================
 
+    def draw_scene(self):
+        """
+        Рисует текущую сцену и возвращает изменившиеся прямоугольники.
+        Меню, настройки и экран поражения статичны: они рисуются целиком
+        только при входе в сцену (или после клика в настройках).
+        Игровое поле отдаёт Renderer.draw_dirty().
+        """
+        full = self._scene_dirty or self.state != self._drawn_state
+        self._drawn_state = self.state
+        self._scene_dirty = False
+
+        if self.state == "GAME":
+            if full:
+                self.renderer.invalidate()
+            return self.renderer.draw_dirty()
+
+        if not full:
+            return []
+
+        if self.state == "MENU":
+            self.menu.draw()
+
+        elif self.state == "SETTINGS":
+            self.settings_screen.draw()
+
+        elif self.state == "GAME_OVER":
+            self.renderer.draw()
+            self.game_over_screen.draw()
+
+        return [self.screen.get_rect()]
+
+    def wait_events(self):
+        """
+        Блокируется до первого события (или до idle_timeout_ms)
+        и возвращает его вместе со всеми накопившимися.
+        """
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
     def run(self):
         clock = pygame.time.Clock()
+        profiler = self.profiler
 
-        while self.running:
-            dt = clock.tick(60) / 1000.0  # дельта времени (секунды)
+        # Первый кадр рисуем сразу, не дожидаясь событий
+        pygame.display.update(self.draw_scene())
+        if profiler is not None:
+            profiler.record_startup(time.perf_counter() - self._started)
 
-            self.handle_events()
-
-            # Анимации
-            self.renderer.update(dt)
-
-            # Рендер экранов
-            if self.state == "MENU":
-                self.menu.draw()
-
-            elif self.state == "SETTINGS":
-                self.settings_screen.draw()
+        while self.running:
+            # Пока идёт анимация -- фиксированный тик, иначе спим до события
+            active = self.renderer.animating or not self.event_driven
+            self.cpu_meter.switch("active" if active else "idle")
 
-            elif self.state == "GAME":
-                self.renderer.draw()
+            if active:
+                dt = clock.tick(self.fps) / 1000.0  # дельта времени (секунды)
+                events = pygame.event.get()
+            else:
+                events = self.wait_events()
+                clock.tick()  # после сна отсчёт dt начинается заново
+                dt = 0.0
 
-            elif self.state == "GAME_OVER":
-                self.renderer.draw()
-                self.game_over_screen.draw()
+            if profiler is not None:
+                profiler.begin_frame()
 
-            pygame.display.flip()
+            self.handle_events(events)
+            if profiler is not None:
+                profiler.mark("events")
 
-        pygame.quit()
\ No newline at end of file
+            # Анимации
+            self.renderer.update(dt)
+            if profiler is not None:
+                profiler.mark("update")
+
+            # Рендер экранов: на дисплей уходят только изменившиеся области
+            dirty = self.draw_scene()
+            if profiler is not None:
+                profiler.mark("draw")
+                dirty = dirty + profiler.draw_overlay(self.screen, dirty)
+                profiler.mark("overlay")
+
+            if dirty:
+                pygame.display.update(dirty)
+            if profiler is not None:
+                profiler.end_frame()
+
+        self.cpu_meter.stop()
+        if self.report_cpu:
+            print("CPU usage:", self.cpu_meter.report())
+        if profiler is not None:
+            if self.profile_path:
+                profiler.dump(self.profile_path)
+            else:
+                print("Frame profile:", profiler.report())
+
+        # Дописываем отложенные рекорд, настройки и запись партий до выхода
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.tablebase is not None:
+            self.tablebase.close()
+        if self.metrics is not None:
+            self.metrics.close()
+        try:
+            self.persistence.close()
+        except PersistenceError as error:
+            print("Save failed:", error)
+        pygame.quit()
@@ -0,0 +1,80 @@
+from array import array
+
+
+# Корзины гистограммы: 8 на каждую степень двойки микросекунд,
+# от 1 мкс до ~67 с. Всё длиннее попадает в последнюю корзину.
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS
+_MAX_MICROS = 1 << 26
+BUCKETS = _SUB_BUCKETS * (26 - _SUB_BITS + 1)
+
+
+def _bucket(micros: int) -> int:
+    if micros < _SUB_BUCKETS:
+        return micros
+    if micros >= _MAX_MICROS:
+        return BUCKETS - 1
+    e = micros.bit_length() - _SUB_BITS
+    return _SUB_BUCKETS * e + ((micros >> (e - 1)) & (_SUB_BUCKETS - 1))
+
+
+def _bucket_upper(index: int) -> int:
+    """Верхняя граница корзины (мкс, не включая)."""
+    if index < _SUB_BUCKETS:
+        return index + 1
+    e, sub = divmod(index, _SUB_BUCKETS)
+    return (_SUB_BUCKETS + sub + 1) << (e - 1)
+
+
+class Histogram:
+    """
+    Гистограмма длительностей фиксированного размера (BUCKETS счётчиков).
+    Запись -- O(1) и без выделения памяти; перцентили оцениваются по
+    границам корзин (погрешность до 1/8 значения).
+    """
+
+    def __init__(self):
+        self.counts = array("L", [0]) * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[_bucket(int(seconds * 1e6))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Оценка перцентиля (секунды): верхняя граница нужной корзины."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(_bucket_upper(index) / 1e6, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean * 1000, 3),
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+    def clear(self) -> None:
+        for i in range(BUCKETS):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
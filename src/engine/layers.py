@@ -0,0 +1,55 @@
+import pygame
+
+
+class LayerCache:
+    """
+    Кэш статических слоёв сцен (фон доски, меню, настройки, затемнение).
+
+    Слой рисуется один раз в отдельную поверхность и дальше только блитится.
+    У каждого слоя есть ключ -- всё, от чего зависит картинка (тема, размер
+    поля, размер окна...). Пока ключ не изменился, слой не перерисовывается.
+    """
+
+    def __init__(self):
+        self._layers = {}
+
+        # Статистика
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, name, key, build):
+        """
+        Возвращает слой name для ключа key.
+        build() -- функция, которая рисует слой заново и возвращает Surface.
+        """
+        entry = self._layers.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+
+        surface = build()
+        self._layers[name] = (key, surface)
+        self.builds += 1
+        return surface
+
+    def invalidate(self, name=None):
+        """Сбрасывает один слой или все слои."""
+        if name is None:
+            self._layers.clear()
+        else:
+            self._layers.pop(name, None)
+
+
+def new_layer(size, alpha=False):
+    """Поверхность под слой в формате экрана (блит без конвертации)."""
+    if alpha:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        return surface.convert_alpha() if pygame.display.get_surface() else surface
+
+    surface = pygame.Surface(size)
+    return surface.convert() if pygame.display.get_surface() else surface
+
+
+# Общий кэш на процесс: Renderer пересоздаётся в apply_settings(),
+# а слои переживают это, если тема/размеры не изменились
+LAYERS = LayerCache()
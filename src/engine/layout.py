@@ -0,0 +1,45 @@
+from typing import Tuple
+
+import pygame
+
+
+# Размер окна, под который нарисованы все сцены (координаты в коде сцен)
+BASE_SIZE = (600, 700)
+
+
+class Layout:
+    """
+    Перевод координат сцен из базового окна 600x700 в текущее окно.
+
+    Сцена масштабируется равномерно (scale = меньшее из отношений сторон)
+    и центрируется; лишние поля по краям заливает фон сцены. При окне
+    600x700 все методы возвращают исходные координаты.
+
+    Layout не рисует и не масштабирует картинки: сцены по нему заново
+    строят прямоугольники и размеры шрифтов, а слои и плитки растеризуются
+    в новом размере один раз (кэши ключуются размером окна / клетки).
+    """
+
+    def __init__(self, size: Tuple[int, int], base: Tuple[int, int] = BASE_SIZE):
+        self.size = (int(size[0]), int(size[1]))
+        self.base = base
+        self.scale = min(self.size[0] / base[0], self.size[1] / base[1])
+        self.left = (self.size[0] - round(base[0] * self.scale)) // 2
+        self.top = (self.size[1] - round(base[1] * self.scale)) // 2
+
+    def px(self, value: float) -> int:
+        """Длина в пикселях окна (не меньше 1 для ненулевых значений)."""
+        if not value:
+            return 0
+        return max(1, round(value * self.scale))
+
+    def font(self, size: int) -> int:
+        """Размер шрифта; мельче 6pt текст не читается."""
+        return max(6, round(size * self.scale))
+
+    def point(self, x: float, y: float) -> Tuple[int, int]:
+        return self.left + round(x * self.scale), self.top + round(y * self.scale)
+
+    def rect(self, x: float, y: float, w: float, h: float) -> pygame.Rect:
+        left, top = self.point(x, y)
+        return pygame.Rect(left, top, round(w * self.scale), round(h * self.scale))
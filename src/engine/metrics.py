@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import Counter
+
+from src.config.persistence import PersistenceService
+from src.engine.histogram import Histogram
+from src.game.events import BoardObserver
+
+
+class MetricsCollector(BoardObserver):
+    """
+    Встроенный подписчик событий поля (см. events.py): копит счётчики
+    и раз в flush_interval секунд сбрасывает сводку в JSON-файл.
+
+    - обработчики событий только увеличивают счётчики в памяти
+      (под замком: сводку собирает и поток таймера);
+    - сводку раз в flush_interval собирает свой поток-таймер, даже если
+      ходов нет, и последнюю -- close();
+    - файл пишет PersistenceService в фоновом потоке; без persistence
+      сборщик заводит свой и закрывает его в close();
+    - в файле: ходы в секунду (за всё время и за последний интервал),
+      слияния на ход, распределение плиток из слияний и новых плиток,
+      максимальные плитки завершённых партий и время Board.move().
+
+    Один сборщик можно подписать на несколько полей подряд
+    (GameEngine пересоздаёт поле в apply_settings()).
+    """
+
+    def __init__(self, path: str, flush_interval: float = 10.0, persistence=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._owns_persistence = persistence is None
+        self.persistence = PersistenceService() if persistence is None else persistence
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        except OSError:
+            pass  # ошибка всплывёт из PersistenceService при записи
+
+        self.started = time.monotonic()
+        self._next_flush = self.started + flush_interval
+        self._last_flush = self.started
+        self._last_flush_moves = 0
+
+        self.games = 0
+        self.games_over = 0
+        self.moves = 0
+        self.idle_moves = 0  # ходы, не изменившие поле
+        self.directions = Counter()
+        self.merges = 0
+        self.merged_tiles = Counter()
+        self.spawns = Counter()
+        self.max_tiles = Counter()
+        self.best_score = 0
+        self.move_time = Histogram()
+        self.flushes = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._closed = False
+        self._timer = threading.Thread(target=self._run_timer, name="metrics", daemon=True)
+        self._timer.start()
+
+    # ---------- Подписка ---------- #
+
+    def attach(self, board) -> None:
+        board.subscribe(self)
+
+    def detach(self, board) -> None:
+        board.unsubscribe(self)
+
+    # ---------- События ---------- #
+
+    def on_reset(self, board) -> None:
+        with self._lock:
+            self.games += 1
+
+    def on_spawn(self, board, index: int, value: int) -> None:
+        with self._lock:
+            self.spawns[value] += 1
+
+    def on_merge(self, board, direction: str, values) -> None:
+        with self._lock:
+            self.merges += len(values)
+            merged = self.merged_tiles
+            for value in values:
+                merged[value] += 1
+
+    def on_move(self, board, direction: str, moved: bool, gained: int, seconds: float) -> None:
+        with self._lock:
+            self.move_time.add(seconds)
+            if moved:
+                self.moves += 1
+                self.directions[direction] += 1
+            else:
+                self.idle_moves += 1
+
+    def on_game_over(self, board, score: int, max_tile: int) -> None:
+        with self._lock:
+            self.games_over += 1
+            self.max_tiles[max_tile] += 1
+            if score > self.best_score:
+                self.best_score = score
+
+    # ---------- Сводка ---------- #
+
+    @staticmethod
+    def _by_value(counter: Counter) -> dict:
+        # Ключи JSON -- строки; порядок по значению плитки
+        return {str(value): counter[value] for value in sorted(counter)}
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        elapsed = now - self.started
+        interval = now - self._last_flush
+        recent_moves = self.moves - self._last_flush_moves
+        return {
+            "uptime_seconds": round(elapsed, 3),
+            "games": self.games,
+            "games_over": self.games_over,
+            "moves": self.moves,
+            "idle_moves": self.idle_moves,
+            "moves_per_sec": round(self.moves / elapsed, 3) if elapsed else 0.0,
+            "recent_moves_per_sec": round(recent_moves / interval, 3) if interval else 0.0,
+            "directions": dict(self.directions),
+            "merges": self.merges,
+            "merges_per_move": round(self.merges / self.moves, 4) if self.moves else 0.0,
+            "merged_tiles": self._by_value(self.merged_tiles),
+            "spawns": self._by_value(self.spawns),
+            "max_tiles": self._by_value(self.max_tiles),
+            "best_score": self.best_score,
+            "move_time": self.move_time.summary(),
+        }
+
+    def flush(self, wait: bool = False) -> None:
+        """
+        Отдаёт сводку на запись и сдвигает окно "последнего интервала".
+        wait=True -- дождаться записи файла (безголовый прогон: пул может
+        завершить воркер сразу после партии).
+        """
+        with self._lock:
+            data = self.snapshot()
+            now = time.monotonic()
+            self._last_flush = now
+            self._last_flush_moves = self.moves
+            self._next_flush = now + self.flush_interval
+            self.flushes += 1
+
+        self.persistence.save_json(self.path, data)
+        if wait:
+            self.persistence.flush()
+
+    def close(self) -> None:
+        """
+        Останавливает таймер и отдаёт последнюю сводку. Чужой PersistenceService
+        допишет её при своём close(), свой закрывается здесь же.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._timer.join()
+        self.flush()
+        if self._owns_persistence:
+            self.persistence.close()
+
+    def _run_timer(self) -> None:
+        # Не чаще раза в 10 мс, даже при flush_interval = 0
+        while not self._stop.wait(max(self._next_flush - time.monotonic(), 0.01)):
+            if time.monotonic() >= self._next_flush:
+                self.flush()
@@ -0,0 +1,193 @@
+import time
+from typing import Dict, List, Optional
+
+import pygame
+
+from src.config.persistence import write_json_atomic
+from src.engine.fonts import FONTS
+from src.engine.histogram import Histogram
+
+
+# Фазы кадра в порядке выполнения внутри GameEngine.run()
+PHASES = ("events", "update", "draw", "overlay", "display")
+
+
+class FrameProfiler:
+    """
+    Пофазный профиль кадров главного цикла (включается явно).
+
+    GameEngine.run() отмечает границы фаз: begin_frame() после ожидания
+    событий, mark(фаза) после каждой фазы, end_frame() после вывода
+    на дисплей. Board.move() замеряется отдельно (record_move).
+    Ожидание событий и сон clock.tick() в кадр не входят: профиль
+    показывает работу кадра, а не простой.
+
+    Все длительности идут в гистограммы фиксированного размера, плюс
+    счётчики медленных кадров (дольше бюджета 1/fps) и медленных ходов.
+    Итог -- report() / dump(path) в JSON или оверлей поверх экрана.
+
+    Выключенный профиль -- это self.profiler = None в GameEngine:
+    на кадр остаётся несколько проверок на None.
+    """
+
+    def __init__(self, fps: int = 60, slow_move_ms: float = 1.0,
+                 overlay: bool = False, overlay_interval: float = 0.5):
+        self.frame_budget = 1.0 / fps
+        self.slow_move_seconds = slow_move_ms / 1000.0
+
+        self.phases: Dict[str, Histogram] = {name: Histogram() for name in PHASES}
+        self.frame = Histogram()
+        self.move = Histogram()
+
+        # Запуск до первого кадра и пересоздание сцен (apply_settings)
+        self.startup_seconds: Optional[float] = None
+        self.settings = Histogram()
+
+        self.frames = 0
+        self.slow_frames = 0
+        self.slow_moves = 0
+        self.worst_frame_phase: Dict[str, int] = {name: 0 for name in PHASES}
+
+        self.overlay = overlay
+        self.overlay_interval = overlay_interval
+        self._font = None
+        self._overlay_lines: List[str] = []
+        self._overlay_rect: Optional[pygame.Rect] = None
+        self._overlay_updated = 0.0
+        self._overlay_dirty = True
+
+        self._frame_start = 0.0
+        self._mark = 0.0
+        self._frame_phases: Dict[str, float] = {}
+
+    # ---------- Замеры ---------- #
+
+    def begin_frame(self) -> None:
+        self._frame_start = self._mark = time.perf_counter()
+        self._frame_phases.clear()
+
+    def mark(self, phase: str) -> None:
+        """Закрывает фазу phase (время с прошлой отметки)."""
+        now = time.perf_counter()
+        elapsed = now - self._mark
+        self._mark = now
+        self.phases[phase].add(elapsed)
+        self._frame_phases[phase] = elapsed
+
+    def end_frame(self) -> None:
+        self.mark("display")
+        elapsed = self._mark - self._frame_start
+        self.frame.add(elapsed)
+        self.frames += 1
+
+        if elapsed > self.frame_budget:
+            self.slow_frames += 1
+            # Какая фаза съела больше всего в медленном кадре
+            worst = max(self._frame_phases, key=self._frame_phases.get)
+            self.worst_frame_phase[worst] += 1
+
+    def record_move(self, seconds: float) -> None:
+        self.move.add(seconds)
+        if seconds > self.slow_move_seconds:
+            self.slow_moves += 1
+
+    def record_startup(self, seconds: float) -> None:
+        self.startup_seconds = seconds
+
+    def record_settings(self, seconds: float) -> None:
+        self.settings.add(seconds)
+
+    # ---------- Отчёт ---------- #
+
+    def report(self) -> dict:
+        return {
+            "frames": self.frames,
+            "frame_budget_ms": round(self.frame_budget * 1000, 3),
+            "slow_frames": self.slow_frames,
+            "slow_frame_causes": {k: v for k, v in self.worst_frame_phase.items() if v},
+            "slow_moves": self.slow_moves,
+            "frame": self.frame.summary(),
+            "phases": {name: h.summary() for name, h in self.phases.items()},
+            "move": self.move.summary(),
+            "startup_ms": round(self.startup_seconds * 1000, 3) if self.startup_seconds is not None else None,
+            "apply_settings": self.settings.summary(),
+            "fonts": FONTS.stats(),
+        }
+
+    def dump(self, path: str) -> None:
+        write_json_atomic(path, self.report())
+
+    def reset(self) -> None:
+        for histogram in list(self.phases.values()) + [self.frame, self.move, self.settings]:
+            histogram.clear()
+        self.frames = self.slow_frames = self.slow_moves = 0
+        for name in self.worst_frame_phase:
+            self.worst_frame_phase[name] = 0
+
+    # ---------- Оверлей ---------- #
+
+    def toggle_overlay(self) -> None:
+        self.overlay = not self.overlay
+        self._overlay_dirty = True
+
+    def invalidate_overlay(self) -> None:
+        """Экран сменил размер: старый прямоугольник оверлея больше не нужен."""
+        self._overlay_rect = None
+        self._overlay_dirty = True
+
+    def _overlay_text(self) -> List[str]:
+        lines = [
+            f"frame p50 {self.frame.percentile(0.5) * 1000:.2f}"
+            f"  p99 {self.frame.percentile(0.99) * 1000:.2f} ms",
+            f"slow frames {self.slow_frames}/{self.frames}  moves {self.slow_moves}",
+        ]
+        for name, histogram in self.phases.items():
+            lines.append(f"{name:<8} p95 {histogram.percentile(0.95) * 1000:.2f} ms")
+        lines.append(f"move     p95 {self.move.percentile(0.95) * 1000:.3f} ms")
+        return lines
+
+    def draw_overlay(self, screen, dirty) -> list:
+        """
+        Рисует оверлей в правом нижнем углу и возвращает его прямоугольник,
+        если он перерисован. Текст обновляется раз в overlay_interval секунд,
+        в остальных кадрах оверлей рисуется только если сцена его затёрла.
+        """
+        if not self.overlay:
+            # Место выключенного оверлея перерисовывает сцена (GameEngine)
+            self._overlay_rect = None
+            return []
+
+        now = time.perf_counter()
+        if now - self._overlay_updated >= self.overlay_interval:
+            lines = self._overlay_text()
+            self._overlay_updated = now
+            if lines != self._overlay_lines:
+                self._overlay_lines = lines
+                self._overlay_dirty = True
+
+        rect = self._overlay_rect
+        covered = rect is not None and rect.collidelist(dirty) != -1
+        if not (self._overlay_dirty or covered):
+            return []
+
+        if self._font is None:
+            self._font = FONTS.get("Consolas,Courier New,monospace", 14)
+
+        surfaces = [self._font.render(line, True, (255, 255, 255)) for line in self._overlay_lines]
+        width = max(s.get_width() for s in surfaces) + 12
+        height = sum(s.get_height() for s in surfaces) + 8
+        screen_w, screen_h = screen.get_size()
+        box = pygame.Rect(screen_w - width - 4, screen_h - height - 4, width, height)
+        if rect is not None:
+            box.union_ip(rect)
+            box.clamp_ip(screen.get_rect())
+
+        screen.fill((20, 20, 20), box)
+        y = box.bottom - height + 4
+        for surface in surfaces:
+            screen.blit(surface, (box.right - width + 6, y))
+            y += surface.get_height()
+
+        self._overlay_rect = box
+        self._overlay_dirty = False
+        return [box]
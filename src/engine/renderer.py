@@ -1,6 +1,10 @@
+import colorsys
 import math
 import pygame
 from src.ui.hud import HUD
+from src.engine.surface_cache import TileSurfaceCache
+from src.engine.layers import LAYERS, new_layer
+from src.engine.layout import Layout
 
 
 class Renderer:
@@ -51,92 +55,385 @@ class Renderer:
         }
     }
 
-    def __init__(self, screen, board, theme="light"):
+    def __init__(self, screen, board, theme="light", persistence=None):
         self.screen = screen
         self.board = board
 
         self.theme_name = theme
         self.theme = Renderer.LIGHT_THEME if theme == "light" else Renderer.DARK_THEME
+        self._tile_colors = dict(self.theme["tile_colors"])
 
-        self.width, self.height = screen.get_size()
-
-        self.board_area = pygame.Rect(50, 150, 500, 500)
-        self.tile_size = self.board_area.width // self.board.size
-
-        self.font = pygame.font.SysFont("Arial", 40, bold=True)
-        self.hud = HUD(self.screen, self.board)
+        self.hud = HUD(self.screen, self.board, persistence=persistence)
+        self._apply_layout()
 
         self.animating = False
         self.animation_time = 0.0
         self.animation_duration = 0.15
+        self.slide_duration = 0.1
+
+        # Сдвиг плиток текущего хода (Board.last_slides, см. board.slide_line).
+        # None -- старая анимация "поп" всего поля (ход без записи перемещений)
+        self._slides = None
+        self._slide_paths = []     # пути плиток (слот "откуда" + слот "куда") и слот новой плитки
+        self._slide_cells = set()  # клетки, которые накрывают пути
+        self._pop_cells = ()       # клетки слияний и новой плитки: "поп" после сдвига
+        self._spawn = None
+        self._settled = False
+        self._pop_step = 0
+        # Клетки, которые надо перерисовать по текущему полю
+        # (прерванная анимация), независимо от сравнения с _drawn_grid
+        self._stale_cells = set()
+
+        # Что было нарисовано в прошлом кадре (для draw_dirty)
+        self._full_redraw = True
+        self._drawn_grid = None
+        self._drawn_step = 0
+
+    # ---------- Layout ---------- #
+
+    def _apply_layout(self):
+        """Геометрия доски и кэш плиток под текущий размер окна."""
+        self.width, self.height = self.screen.get_size()
+        self.layout = layout = Layout((self.width, self.height))
+
+        self.board_area = layout.rect(50, 150, 500, 500)
+        self.tile_size = self.board_area.width // self.board.size
+        # Отступ вокруг плитки: 5 px на обычных полях, меньше на 9x9 и крупнее
+        self.gap = max(1, min(layout.px(5), self.tile_size // 12))
+        self.tile_base = self.tile_size - 2 * self.gap
+        self.radius = min(layout.px(8), self.tile_base // 4)
+
+        # Готовые поверхности плиток (фон + текст), см. surface_cache.py;
+        # размер шрифта подбирается под размер плитки. Новый размер окна --
+        # новый кэш: плитки растеризуются заново, а не масштабируются
+        self.tile_cache = TileSurfaceCache(
+            "Arial", max_font_size=layout.font(40), border_radius=layout.px(8)
+        )
+        self.tile_cache.configure(self.theme_name, self.tile_size)
+
+        self.hud.set_layout(self.screen, layout)
+
+    def resize(self, screen):
+        """Окно сменило размер (GameEngine, VIDEORESIZE): всё под новый экран."""
+        self.screen = screen
+        self._apply_layout()
+        if self._slides is not None:
+            self._slide_paths = self._build_paths()
+        self.invalidate()
 
     # ---------- Themes ---------- #
 
     def set_theme(self, theme):
         self.theme_name = theme
         self.theme = Renderer.LIGHT_THEME if theme == "light" else Renderer.DARK_THEME
+        self._tile_colors = dict(self.theme["tile_colors"])
+        self.tile_cache.configure(self.theme_name, self.tile_size)
+        self.invalidate()
+
+    def tile_color(self, value):
+        """
+        Цвет плитки: из темы, а для значений больше 2048 -- генерируется
+        по показателю степени (оттенок смещается на золотое сечение,
+        соседние плитки не сливаются) и запоминается.
+        """
+        color = self._tile_colors.get(value)
+        if color is None:
+            exponent = value.bit_length() - 1
+            hue = (exponent * 0.618034) % 1.0
+            brightness = 0.55 if self.theme_name == "light" else 0.75
+            r, g, b = colorsys.hsv_to_rgb(hue, 0.55, brightness)
+            color = (int(r * 255), int(g * 255), int(b * 255))
+            self._tile_colors[value] = color
+        return color
 
     # ---------- Animation ---------- #
 
-    def start_move_animation(self):
+    def start_move_animation(self, slides=None, spawn=None):
+        """
+        Анимация хода. slides -- перемещения плиток (board.last_slides),
+        spawn -- клетка новой плитки. Плитки из slides едут из "откуда"
+        в "куда" за slide_duration, затем слившиеся и новая плитка
+        делают "поп". Каждый кадр перерисовываются только пути этих
+        плиток, а не всё поле.
+
+        Без slides -- прежний "поп" всего поля.
+        """
+        # Прерванная анимация: её клетки дорисуются по текущему полю
+        self._stale_cells.update(self._slide_cells)
+        if self._drawn_step:
+            self.invalidate()  # прерван "поп" всего поля
+
         self.animating = True
         self.animation_time = 0.0
 
+        if slides is None:
+            self._clear_slides()
+            return
+
+        size = self.board.size
+        self._slides = slides
+        self._spawn = spawn
+        self._slide_paths = self._build_paths()
+
+        cells = set()
+        for src, dst, _, _ in slides:
+            step = 1 if src // size == dst // size else size
+            cells.update(range(min(src, dst), max(src, dst) + 1, step))
+        pops = {dst for _, dst, _, merged in slides if merged}
+        if spawn is not None:
+            cells.add(spawn)
+            pops.add(spawn)
+        self._slide_cells = cells
+        self._pop_cells = tuple(pops)
+        self._settled = False
+        self._pop_step = 0
+
+    def stop_animation(self):
+        """Поле сменилось не ходом (новая партия, undo/redo): анимацию бросаем."""
+        self._stale_cells.update(self._slide_cells)
+        self._clear_slides()
+        self.animating = False
+
+    def _clear_slides(self):
+        self._slides = None
+        self._slide_paths = []
+        self._slide_cells = set()
+        self._pop_cells = ()
+        self._spawn = None
+
+    def _build_paths(self):
+        paths = [self._slot(src).union(self._slot(dst)) for src, dst, _, _ in self._slides]
+        if self._spawn is not None:
+            # До конца сдвига клетка новой плитки показывается пустой
+            paths.append(self._slot(self._spawn))
+        return paths
+
     def update(self, dt):
         if self.animating:
             self.animation_time += dt
-            if self.animation_time >= self.animation_duration:
+            duration = self.animation_duration
+            if self._slides is not None:
+                duration += self.slide_duration
+            if self.animation_time >= duration:
                 self.animating = False
 
     def _scale(self):
-        if not self.animating:
+        # "Поп" всего поля -- только для хода без записи перемещений
+        if not self.animating or self._slides is not None:
             return 1.0
         t = self.animation_time / self.animation_duration
         return 1.0 + 0.08 * math.sin(math.pi * t)
 
+    def _pop_scale(self):
+        t = (self.animation_time - self.slide_duration) / self.animation_duration
+        if not self.animating or not 0.0 < t < 1.0:
+            return 1.0
+        return 1.0 + 0.08 * math.sin(math.pi * t)
+
     # ---------- Draw Background ---------- #
 
     def draw_background(self):
-        self.screen.fill(self.theme["bg"])
+        self.screen.blit(self._background_layer(), (0, 0))
 
-        pygame.draw.rect(self.screen, self.theme["board"],
-                         self.board_area, border_radius=10)
+    def _background_layer(self):
+        """Фон + доска + пустые клетки одним слоем (см. layers.py)."""
+        key = (self.theme_name, self.board.size, self.screen.get_size())
+        return LAYERS.get("board_background", key, self._build_background)
 
+    def _build_background(self):
+        layer = new_layer(self.screen.get_size())
+        layer.fill(self.theme["bg"])
+
+        pygame.draw.rect(layer, self.theme["board"],
+                         self.board_area, border_radius=self.layout.px(10))
+
+        gap = self.gap
         for r in range(self.board.size):
             for c in range(self.board.size):
-                x = self.board_area.left + c * self.tile_size + 5
-                y = self.board_area.top + r * self.tile_size + 5
-                rect = pygame.Rect(x, y, self.tile_size - 10, self.tile_size - 10)
-                pygame.draw.rect(self.screen, self.theme["cell"], rect, border_radius=8)
+                x = self.board_area.left + c * self.tile_size + gap
+                y = self.board_area.top + r * self.tile_size + gap
+                rect = pygame.Rect(x, y, self.tile_base, self.tile_base)
+                pygame.draw.rect(layer, self.theme["cell"], rect, border_radius=self.radius)
+
+        return layer
 
     # ---------- Draw Tiles ---------- #
 
     def draw_tiles(self):
-        s = self._scale()
+        # Масштаб анимации квантуется, чтобы плитки брались из кэша
+        step = self.tile_cache.scale_step(self._scale())
+        grid = self.board.grid
 
         for r in range(self.board.size):
+            row = grid[r]
             for c in range(self.board.size):
-                val = self.board.grid[r][c]
-                base = self.tile_size - 10
-                tsize = int(base * s)
-                dx = (base - tsize) // 2
-                dy = (base - tsize) // 2
-
-                x = self.board_area.left + c * self.tile_size + 5 + dx
-                y = self.board_area.top + r * self.tile_size + 5 + dy
+                self._draw_tile(r, c, row[c], step)
 
-                rect = pygame.Rect(x, y, tsize, tsize)
+    def _draw_tile(self, r, c, val, step):
+        self._blit_tile(val,
+                        self.board_area.left + c * self.tile_size,
+                        self.board_area.top + r * self.tile_size,
+                        step)
 
-                color = self.theme["tile_colors"].get(val, (100, 80, 50))
-                pygame.draw.rect(self.screen, color, rect, border_radius=8)
+    def _blit_tile(self, val, x, y, step):
+        """Плитка в слоте с левым верхним углом (x, y) (в т.ч. между клетками)."""
+        base = self.tile_base
 
-                if val != 0:
-                    text = self.font.render(str(val), True, (255, 255, 255))
-                    self.screen.blit(text, text.get_rect(center=rect.center))
+        tile = self.tile_cache.tile(val, self.tile_color(val), base, step, self.theme["board"])
+        offset = self.gap + (base - tile.get_width()) // 2
+        self.screen.blit(tile, (x + offset, y + offset))
 
     # ---------- Full Draw ---------- #
 
     def draw(self):
         self.draw_background()
         self.draw_tiles()
-        self.hud.draw()
\ No newline at end of file
+        self.hud.draw()
+
+    # ---------- Dirty Rects ---------- #
+
+    def invalidate(self):
+        """Следующий draw_dirty() перерисует весь экран."""
+        self._full_redraw = True
+
+    def draw_dirty(self):
+        """
+        Перерисовывает только то, что изменилось с прошлого кадра,
+        и возвращает список прямоугольников для pygame.display.update().
+
+        - клетка перерисовывается, если в ней сменилось значение;
+        - во время сдвига -- только пути движущихся плиток (_draw_slides);
+        - пока идёт "поп" всего поля, при смене шага масштаба -- вся доска;
+        - HUD -- только строки, у которых поменялся текст;
+        - после invalidate() (смена сцены или темы) -- весь экран.
+        Кадр без изменений возвращает пустой список.
+        """
+        grid = self.board.grid
+        step = self.tile_cache.scale_step(self._scale())
+
+        if self._full_redraw:
+            self.draw_background()
+            self.draw_tiles()
+            self.hud.draw_dirty(self.theme["bg"], force=True)
+            self._remember(grid, step)
+            self._full_redraw = False
+            self._stale_cells.clear()
+            if self._slides is not None:
+                # Поле нарисовано в итоговом виде, сверху -- текущий кадр сдвига
+                self._pop_step = 0
+                self._draw_slides(grid)
+            return [self.screen.get_rect()]
+
+        dirty = []
+        last = self._drawn_grid
+
+        if self._slides is not None:
+            dirty += self._draw_slides(grid)
+        elif step != self._drawn_step:
+            # Вся доска: один блит фона вместо клипа и блита на каждую клетку.
+            # Увеличенная плитка не дотягивается до соседних плиток
+            # (выступ 4% стороны меньше двух отступов), клип не нужен
+            self.screen.blit(self._background_layer(), self.board_area, area=self.board_area)
+            self.draw_tiles()
+            dirty.append(self.board_area)
+        else:
+            size = self.board.size
+            cells = self._stale_cells
+            for r in range(size):
+                if grid[r] == last[r]:
+                    continue
+                for c in range(size):
+                    if grid[r][c] != last[r][c]:
+                        cells.add(r * size + c)
+            for index in cells:
+                r, c = divmod(index, size)
+                dirty.append(self._redraw_cell(r, c, grid[r][c], step))
+            cells.clear()
+
+        dirty += self.hud.draw_dirty(self.theme["bg"])
+
+        # Пока плитки едут, _drawn_grid -- поле до хода (см. _draw_slides)
+        if dirty and self._slides is None:
+            self._remember(grid, step)
+        return dirty
+
+    def _draw_slides(self, grid):
+        """
+        Кадр анимации хода: пути плиток -- фоном, плитки -- в промежуточных
+        позициях. Пути разных линий не пересекаются, а на пути плитки стоят
+        только такие же движущиеся плитки (или слившиеся с ними), поэтому
+        остальные клетки не трогаются. После сдвига клетки путей один раз
+        рисуются по полю, затем "поп" -- только клетки слияний и новой плитки.
+        """
+        size = self.board.size
+        dirty = []
+
+        # Клетки прерванной анимации, до которых не дотянутся пути этого хода
+        for index in self._stale_cells - self._slide_cells:
+            r, c = divmod(index, size)
+            dirty.append(self._redraw_cell(r, c, grid[r][c], 0))
+        self._stale_cells.clear()
+
+        if self.animating and self.animation_time < self.slide_duration:
+            t = self.animation_time / self.slide_duration
+            t = 1.0 - (1.0 - t) ** 3  # быстрый старт, плавная остановка
+            background = self._background_layer()
+            for path in self._slide_paths:
+                self.screen.blit(background, path, area=path)
+
+            left, top = self.board_area.topleft
+            tile_size = self.tile_size
+            for src, dst, value, _ in self._slides:
+                r0, c0 = divmod(src, size)
+                r1, c1 = divmod(dst, size)
+                x = left + round((c0 + (c1 - c0) * t) * tile_size)
+                y = top + round((r0 + (r1 - r0) * t) * tile_size)
+                self._blit_tile(value, x, y, 0)
+
+            dirty += self._slide_paths
+            return dirty
+
+        if not self._settled:
+            for index in self._slide_cells:
+                r, c = divmod(index, size)
+                self._redraw_cell(r, c, grid[r][c], 0)
+            dirty += self._slide_paths
+            self._settled = True
+            self._pop_step = 0
+            self._remember(grid, 0)
+
+        step = self.tile_cache.scale_step(self._pop_scale())
+        if step != self._pop_step:
+            for index in self._pop_cells:
+                r, c = divmod(index, size)
+                dirty.append(self._redraw_cell(r, c, grid[r][c], step))
+            self._pop_step = step
+
+        if not self.animating:
+            self._clear_slides()
+        return dirty
+
+    def _remember(self, grid, step):
+        self._drawn_grid = [row[:] for row in grid]
+        self._drawn_step = step
+
+    def _redraw_cell(self, r, c, val, step):
+        """
+        Перерисовывает слот клетки целиком: кусок фонового слоя + плитка.
+        Клип по слоту не даёт увеличенной плитке залезть на соседей.
+        """
+        slot = self._slot(r * self.board.size + c)
+
+        self.screen.set_clip(slot)
+        self.screen.blit(self._background_layer(), slot, area=slot)
+        self._draw_tile(r, c, val, step)
+        self.screen.set_clip(None)
+
+        return slot
+
+    def _slot(self, index):
+        """Слот клетки index = r * size + c (плитка с отступами вокруг)."""
+        r, c = divmod(index, self.board.size)
+        return pygame.Rect(self.board_area.left + c * self.tile_size,
+                           self.board_area.top + r * self.tile_size,
+                           self.tile_size, self.tile_size)
@@ -0,0 +1,143 @@
+import pygame
+
+from src.engine.fonts import FONTS
+
+
+class TileSurfaceCache:
+    """
+    Кэш заранее отрисованных плиток.
+
+    Плитка (фон со скруглёнными углами + число) рисуется один раз на ключ
+    (тема, размер клетки, значение, шаг масштаба) и дальше только блитится.
+    Поверхности с текстом кэшируются отдельно по значению плитки, поэтому
+    font.render вызывается только для значений, которых ещё не было.
+
+    Размер шрифта подбирается под плитку: не больше max_font_size и доли
+    стороны плитки, а длинные числа уменьшаются, пока не влезут по ширине.
+    Так одни и те же настройки годятся и для 3x3, и для 16x16.
+
+    Кэш привязан к теме и размеру клетки: configure() с другими параметрами
+    выбрасывает все записи (смена темы или размера поля).
+    """
+
+    def __init__(self, font_face: str = "Arial", max_font_size: int = 40,
+                 scale_steps: int = 8, max_scale: float = 1.08,
+                 text_color=(255, 255, 255), border_radius: int = 8):
+        self.font_face = font_face
+        self.max_font_size = max_font_size
+        self.scale_steps = scale_steps
+        self.max_scale = max_scale
+        self.text_color = text_color
+        self.border_radius = border_radius
+
+        self.theme_name = None
+        self.tile_size = None
+
+        self._tiles = {}
+        self._texts = {}
+
+        # Статистика
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- Настройка / вытеснение ---------- #
+
+    def configure(self, theme_name: str, tile_size: int) -> None:
+        """Привязывает кэш к теме и размеру; при смене всё вытесняется."""
+        if (theme_name, tile_size) != (self.theme_name, self.tile_size):
+            self.clear()
+            self.theme_name = theme_name
+            self.tile_size = tile_size
+
+    def clear(self) -> None:
+        self._tiles.clear()
+        self._texts.clear()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    # ---------- Масштаб ---------- #
+
+    def scale_step(self, scale: float) -> int:
+        """Квантует масштаб анимации в целый шаг 0..scale_steps."""
+        if scale <= 1.0:
+            return 0
+        extra = (scale - 1.0) / (self.max_scale - 1.0)
+        return min(self.scale_steps, int(round(extra * self.scale_steps)))
+
+    def step_scale(self, step: int) -> float:
+        return 1.0 + (self.max_scale - 1.0) * step / self.scale_steps
+
+    # ---------- Поверхности ---------- #
+
+    def font_size(self, text: str, base_size: int) -> int:
+        """Размер шрифта, при котором text занимает не больше 85% ширины плитки."""
+        size = max(6, min(self.max_font_size, base_size // 2))
+        width = FONTS.get(self.font_face, size, bold=True).size(text)[0]
+        limit = base_size * 0.85
+        if width > limit:
+            size = max(6, int(size * limit / width))
+        return size
+
+    def text(self, value: int, base_size: int) -> pygame.Surface:
+        key = (value, base_size)
+        surface = self._texts.get(key)
+        if surface is None:
+            label = str(value)
+            font = FONTS.get(self.font_face, self.font_size(label, base_size), bold=True)
+            surface = font.render(label, True, self.text_color)
+            self._texts[key] = surface
+        return surface
+
+    def tile(self, value: int, color, base_size: int, step: int = 0,
+             backdrop=(0, 0, 0)) -> pygame.Surface:
+        """
+        Плитка со значением value размером base_size при шаге масштаба step.
+        Поверхность непрозрачная: углы за скруглением заливаются цветом
+        backdrop (цвет доски), так блит заметно дешевле, чем с альфа-каналом.
+        """
+        key = (self.theme_name, base_size, value, step)
+        surface = self._tiles.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        size = int(base_size * self.step_scale(step))
+        surface = pygame.Surface((size, size))
+        surface.fill(backdrop)
+        rect = surface.get_rect()
+        radius = min(self.border_radius, base_size // 4)
+        pygame.draw.rect(surface, color, rect, border_radius=radius)
+
+        if value != 0:
+            text = self.text(value, base_size)
+            surface.blit(text, text.get_rect(center=rect.center))
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        self._tiles[key] = surface
+        return surface
+
+
+class TextCache:
+    """
+    Кэш отрисованных строк для HUD: строка перерисовывается
+    только когда меняется её значение.
+    """
+
+    def __init__(self, font, color=(0, 0, 0)):
+        self.font = font
+        self.color = color
+        self._entries = {}
+
+    def render(self, slot: str, text: str) -> pygame.Surface:
+        entry = self._entries.get(slot)
+        if entry is None or entry[0] != text:
+            entry = (text, self.font.render(text, True, self.color))
+            self._entries[slot] = entry
+        return entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
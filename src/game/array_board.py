@@ -0,0 +1,224 @@
+from array import array
+from itertools import compress
+from operator import eq
+from typing import List, Tuple
+
+from src.game.board import Board
+
+
+# =====================
+# Плоское поле для больших досок
+# =====================
+#
+# Поле N x N хранится одним array('q') по строкам: клетка (r, c) -- элемент
+# N * r + c. Строка r -- срез [N * r, N * r + N), столбец c -- срез с шагом
+# cells[c::N]. Чтение и запись линии -- одна операция среза на уровне C,
+# без транспонирования поля и без сборки столбца поэлементно в Python.
+#
+# Значения хранятся как есть (не показатели), поэтому плитки больше 32768
+# не требуют отдельного пути; предел -- 2^62 (64-битное знаковое целое).
+
+ARRAY_MIN_SIZE = 6
+
+
+class ArrayBoard(Board):
+    """
+    Board для больших полей (6x6 .. 16x16 и больше).
+
+    - ход: каждая линия читается срезом, сжимается filter(None, ...)
+      и пишется обратно срезом; неизменившиеся линии не пишутся;
+    - число пустых клеток ведётся счётчиком (каждое слияние освобождает
+      клетку, каждая новая плитка занимает), новая плитка ищется подсчётом
+      нулей по строкам, а не списком всех пустых клеток;
+    - при track_slides линии идут через slide_line (перемещения плиток
+      для анимации), иначе -- через filter без записи позиций;
+    - can_move() на заполненном поле сравнивает поле со своим сдвигом
+      (map(eq, ...)) -- два прохода на уровне C вместо двойного цикла.
+
+    Публичный API и порядок вызовов генератора совпадают с Board:
+    при одинаковом seed партии одинаковы. grid -- матрица, распакованная
+    по требованию и закэшированная до следующего изменения поля.
+    """
+
+    def __init__(
+        self,
+        size: int = 8,
+        target_value: int = 2048,
+        new_tile_values=None,
+        new_tile_probabilities=None,
+        seed=None,
+    ):
+        self.cells = array("q", bytes(8 * size * size))
+        self._empty = size * size
+        # Номер изменения поля: по нему сбрасывается кэш grid
+        self._version = 0
+        self._grid_cache: Tuple[int, List[List[int]]] = (-1, [])
+        # Соседние по горизонтали пары (k, k + 1): 0 на стыке строк
+        self._row_pairs = bytes(
+            0 if (k + 1) % size == 0 else 1 for k in range(size * size - 1)
+        )
+        super().__init__(
+            size=size,
+            target_value=target_value,
+            new_tile_values=new_tile_values,
+            new_tile_probabilities=new_tile_probabilities,
+            seed=seed,
+        )
+
+    # ---------- grid как представление плоского массива ---------- #
+
+    @property
+    def grid(self) -> List[List[int]]:
+        version, grid = self._grid_cache
+        if version != self._version:
+            cells = self.cells
+            size = self.size
+            grid = [cells[r * size:(r + 1) * size].tolist() for r in range(size)]
+            self._grid_cache = (self._version, grid)
+        return grid
+
+    @grid.setter
+    def grid(self, value: List[List[int]]) -> None:
+        cells = array("q")
+        for row in value:
+            cells.extend(row)
+        self.cells = cells
+        self._empty = cells.count(0)
+        self._max_tile = max(cells) if cells else 0
+        self._version += 1
+
+    # ---------- Работа с плитками ---------- #
+
+    def get_empty_cells(self) -> List[Tuple[int, int]]:
+        size = self.size
+        return [divmod(i, size) for i, value in enumerate(self.cells) if not value]
+
+    def add_random_tile(self) -> bool:
+        count = self._empty
+        if not count:
+            return False
+
+        rng = self.rng
+        k = int(rng.random() * count)
+        value = self._sampler.pick(rng.random())
+
+        # k-я пустая клетка по строкам: сначала строка по числу нулей, потом клетка
+        cells = self.cells
+        size = self.size
+        start = 0
+        while True:
+            zeros = cells[start:start + size].count(0)
+            if k < zeros:
+                break
+            k -= zeros
+            start += size
+        index = cells.index(0, start)
+        for _ in range(k):
+            index = cells.index(0, index + 1)
+
+        self._set_cell(index, value)
+        self.last_spawn = (index, value)
+        return True
+
+    def _place_tile(self, r: int, c: int, value: int) -> None:
+        self._set_cell(r * self.size + c, value)
+
+    def _set_cell(self, index: int, value: int) -> None:
+        cells = self.cells
+        if cells[index] and not value:
+            self._empty += 1
+        elif value and not cells[index]:
+            self._empty -= 1
+        cells[index] = value
+        if value > self._max_tile:
+            self._max_tile = value
+        self._version += 1
+
+    # ---------- Проверка состояния ---------- #
+
+    def can_move(self) -> bool:
+        if self._empty:
+            return True
+
+        # Поле против себя же, сдвинутого на строку (вертикальные пары)
+        # и на клетку (горизонтальные, без пар через стык строк)
+        cells = self.cells
+        if any(map(eq, cells, cells[self.size:])):
+            return True
+        return any(compress(map(eq, cells, cells[1:]), self._row_pairs))
+
+    # ---------- Ход ---------- #
+
+    def _apply_move(self, direction: str) -> Tuple[bool, int]:
+        cells = self.cells
+        size = self.size
+        horizontal = direction in ("left", "right")
+        forward = direction in ("left", "up")
+        tracking = self.track_slides
+        if tracking:
+            self.last_slides = []
+
+        moved = False
+        gained_score = 0
+        merges = 0
+        top = self._max_tile
+
+        for i in range(size):
+            if horizontal:
+                line = cells[i * size:(i + 1) * size]
+            else:
+                line = cells[i::size]
+
+            if tracking:
+                # Линия и перемещения плиток -- одним проходом (Board._slide)
+                new_values, gained = self._slide(line, i, horizontal, forward)
+                new_line = array("q", new_values)
+                if new_line == line:
+                    continue
+                if gained:
+                    gained_score += gained
+                    top = max(top, max(new_line))
+                merges += new_line.count(0) - line.count(0)
+            else:
+                tiles = list(filter(None, line))
+                if not tiles:
+                    continue
+                if not forward:
+                    tiles.reverse()
+
+                merged = []
+                count = len(tiles)
+                k = 0
+                while k < count:
+                    value = tiles[k]
+                    if k + 1 < count and tiles[k + 1] == value:
+                        value += value
+                        gained_score += value
+                        if value > top:
+                            top = value
+                        k += 2
+                    else:
+                        k += 1
+                    merged.append(value)
+
+                padding = [0] * (size - len(merged))
+                if forward:
+                    new_line = array("q", merged + padding)
+                else:
+                    merged.reverse()
+                    new_line = array("q", padding + merged)
+                if new_line == line:
+                    continue
+                merges += count - len(merged)
+
+            moved = True
+            if horizontal:
+                cells[i * size:(i + 1) * size] = new_line
+            else:
+                cells[i::size] = new_line
+
+        if moved:
+            self._empty += merges
+            self._max_tile = top
+            self._version += 1
+        return moved, gained_score
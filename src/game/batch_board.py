@@ -0,0 +1,226 @@
+from typing import Tuple
+
+import numpy as np
+
+from src.game.board import DIRECTIONS, Board
+
+
+class BatchBoard:
+    """
+    Пакет из N независимых игр, которые ходят одновременно.
+
+    Все поля хранятся в одном массиве grids формы (N, size, size), счёт --
+    в массиве scores формы (N,). Один вызов move() применяет к каждой игре
+    своё направление и возвращает те же четыре величины, что и Board.move,
+    только массивами по играм. Новые плитки появляются векторно, с учётом
+    new_tile_values / new_tile_probabilities.
+
+    Как и Board, класс не знает ничего о графике -- только логика.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        size: int = 4,
+        target_value: int = 2048,
+        new_tile_values=None,
+        new_tile_probabilities=None,
+        seed=None,
+    ):
+        self.count = count
+        self.size = size
+        self.target_value = target_value
+
+        self.new_tile_values = new_tile_values or [2, 4]
+        self.new_tile_probabilities = new_tile_probabilities or [0.9, 0.1]
+
+        # Кумулятивные вероятности считаем один раз, а не на каждой плитке
+        probabilities = np.asarray(self.new_tile_probabilities, dtype=np.float64)
+        self._tile_values = np.asarray(self.new_tile_values, dtype=np.int32)
+        self._tile_cumulative = np.cumsum(probabilities / probabilities.sum())
+
+        self.rng = np.random.default_rng(seed)
+
+        self.grids = np.zeros((count, size, size), dtype=np.int32)
+        self.scores = np.zeros(count, dtype=np.int64)
+
+    # ==========================
+    # Инициализация и сброс игр
+    # ==========================
+
+    def reset(self, initial_tiles: int = 2) -> None:
+        """Очищает все поля и расставляет стартовые плитки."""
+        self.grids.fill(0)
+        self.scores.fill(0)
+
+        for _ in range(initial_tiles):
+            self.add_random_tiles()
+
+    def get_board(self, index: int) -> Board:
+        """Копия одной игры пакета в виде обычного Board."""
+        board = Board(
+            size=self.size,
+            target_value=self.target_value,
+            new_tile_values=self.new_tile_values,
+            new_tile_probabilities=self.new_tile_probabilities,
+        )
+        board.grid = self.grids[index].tolist()
+        board.score = int(self.scores[index])
+        return board
+
+    # =====================
+    # Работа с плитками
+    # =====================
+
+    def add_random_tiles(self, mask=None) -> np.ndarray:
+        """
+        Добавляет по одной плитке в случайную пустую клетку каждой игры
+        (или только игр, где mask == True).
+        Возвращает массив: была ли добавлена плитка.
+        """
+        flat = self.grids.reshape(self.count, -1)
+        empty = flat == 0
+
+        added = empty.any(axis=1)
+        if mask is not None:
+            added &= np.asarray(mask, dtype=bool)
+
+        # Случайная пустая клетка: максимум случайных ключей по пустым клеткам
+        keys = self.rng.random(flat.shape)
+        keys[~empty] = -1.0
+        cells = keys.argmax(axis=1)
+
+        # Значение плитки по кумулятивным вероятностям
+        picks = np.searchsorted(
+            self._tile_cumulative, self.rng.random(self.count), side="right"
+        )
+        picks = np.minimum(picks, len(self._tile_values) - 1)
+        values = self._tile_values[picks]
+
+        games = np.nonzero(added)[0]
+        flat[games, cells[games]] = values[games]
+        return added
+
+    # =====================
+    # Проверка состояния
+    # =====================
+
+    def has_won(self) -> np.ndarray:
+        return (self.grids >= self.target_value).any(axis=(1, 2))
+
+    def can_move(self) -> np.ndarray:
+        grids = self.grids
+        empty = (grids == 0).any(axis=(1, 2))
+        horizontal = (grids[:, :, :-1] == grids[:, :, 1:]).any(axis=(1, 2))
+        vertical = (grids[:, :-1, :] == grids[:, 1:, :]).any(axis=(1, 2))
+        return empty | horizontal | vertical
+
+    # =====================
+    # Основная логика хода
+    # =====================
+
+    def move(self, directions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Делает ход во всех играх сразу.
+
+        directions -- одно направление ("left", ...) для всех игр либо
+        массив длины N из строк или индексов в DIRECTIONS.
+
+        Возвращает массивы (moved, gained_score, won, lost), как Board.move.
+        """
+        codes = self._direction_codes(directions)
+
+        old = self.grids.copy()
+        gained = np.zeros(self.count, dtype=np.int64)
+
+        for code, direction in enumerate(DIRECTIONS):
+            games = np.nonzero(codes == code)[0]
+            if games.size == 0:
+                continue
+
+            oriented = self._orient(self.grids[games], direction)
+            rows = oriented.reshape(-1, self.size)
+
+            rows, row_gained = self._slide_rows_left(rows)
+
+            oriented = rows.reshape(-1, self.size, self.size)
+            self.grids[games] = self._orient(oriented, direction, inverse=True)
+            gained[games] = row_gained.reshape(-1, self.size).sum(axis=1)
+
+        moved = (self.grids != old).any(axis=(1, 2))
+
+        # Новые плитки и очки -- только там, где ход что-то изменил
+        self.add_random_tiles(mask=moved)
+        self.scores += np.where(moved, gained, 0)
+
+        won = self.has_won()
+        lost = ~self.can_move()
+
+        return moved, gained, won, lost
+
+    # =====================
+    # Вспомогательные методы для move
+    # =====================
+
+    def _direction_codes(self, directions) -> np.ndarray:
+        if isinstance(directions, str):
+            directions = [directions] * self.count
+
+        directions = np.asarray(directions)
+        if directions.shape != (self.count,):
+            raise ValueError("Expected one direction per game")
+
+        if directions.dtype.kind in ("U", "S", "O"):
+            lookup = {name: code for code, name in enumerate(DIRECTIONS)}
+            try:
+                return np.array([lookup[str(d)] for d in directions], dtype=np.int8)
+            except KeyError as error:
+                raise ValueError(f"Invalid direction: {error.args[0]}") from None
+
+        if directions.size and (directions.min() < 0 or directions.max() >= len(DIRECTIONS)):
+            raise ValueError("Direction index out of range")
+        return directions.astype(np.int8)
+
+    @staticmethod
+    def _orient(grids: np.ndarray, direction: str, inverse: bool = False) -> np.ndarray:
+        """
+        Поворачивает поля так, чтобы ход стал ходом "влево" (и обратно).
+        Возвращает непрерывную копию.
+        """
+        if direction == "left":
+            return np.ascontiguousarray(grids)
+        if direction == "right":
+            return np.ascontiguousarray(grids[:, :, ::-1])
+        if direction == "up":
+            return np.ascontiguousarray(grids.transpose(0, 2, 1))
+
+        # down: транспонирование + разворот строк, обратное -- в другом порядке
+        if inverse:
+            return np.ascontiguousarray(grids[:, :, ::-1].transpose(0, 2, 1))
+        return np.ascontiguousarray(grids.transpose(0, 2, 1)[:, :, ::-1])
+
+    @staticmethod
+    def _compress_rows_left(rows: np.ndarray) -> np.ndarray:
+        """Сдвигает ненулевые элементы каждой строки влево (стабильно)."""
+        order = np.argsort(rows == 0, axis=1, kind="stable")
+        return np.take_along_axis(rows, order, axis=1)
+
+    def _slide_rows_left(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Векторный аналог Board._compress_and_merge_row_left для массива строк.
+        Возвращает (новые строки, очки по каждой строке).
+        """
+        rows = self._compress_rows_left(rows)
+        gained = np.zeros(rows.shape[0], dtype=np.int64)
+
+        # Слияния идут слева направо: слитая пара обнуляет правую клетку,
+        # поэтому та уже не сольётся со следующей
+        for i in range(self.size - 1):
+            left = rows[:, i]
+            right = rows[:, i + 1]
+            merge = (left == right) & (left != 0)
+            left[merge] *= 2
+            right[merge] = 0
+            gained += np.where(merge, left, 0)
+
+        return self._compress_rows_left(rows), gained
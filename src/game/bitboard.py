@@ -0,0 +1,337 @@
+from typing import List, Optional, Tuple
+
+from src.game.board import DIRECTIONS, Board, MovePreview
+from src.game.row_tables import MAX_EXPONENT, get_row_table
+
+
+# =====================
+# Битовое представление поля 4x4
+# =====================
+#
+# Поле 4x4 упаковывается в одно 64-битное целое: каждая клетка занимает
+# 4 бита и хранит показатель степени плитки (0 -- пусто, 1 -- 2, 2 -- 4, ...,
+# 15 -- 32768). Клетка (r, c) лежит в битах 4 * (4 * r + c), т.е. строка r --
+# это 16 бит, начиная с 16 * r, а самая левая клетка строки -- младший ниббл.
+
+ROW_MASK = 0xFFFF
+
+# Маски "по одному биту на ниббл" для подсчёта пустых клеток и соседей
+_NIBBLE_LOW_BITS = 0x1111111111111111
+_HORIZONTAL_PAIRS = 0x0111011101110111  # клетки c = 0..2 (есть сосед справа)
+_VERTICAL_PAIRS = 0x0000111111111111    # клетки r = 0..2 (есть сосед снизу)
+
+
+# =====================
+# Операции над 64-битным полем
+# =====================
+
+def encode(grid: List[List[int]]) -> int:
+    """Упаковывает матрицу 4x4 в 64-битное целое."""
+    bits = 0
+    for r in range(4):
+        for c in range(4):
+            value = grid[r][c]
+            if value:
+                e = value.bit_length() - 1
+                if e > MAX_EXPONENT or value != 1 << e:
+                    raise ValueError(f"Value {value} does not fit a bitboard")
+                bits |= e << (4 * (4 * r + c))
+    return bits
+
+
+def decode(bits: int) -> List[List[int]]:
+    """Распаковывает 64-битное целое обратно в матрицу 4x4."""
+    grid = []
+    for r in range(4):
+        row = []
+        for c in range(4):
+            e = (bits >> (4 * (4 * r + c))) & 0xF
+            row.append(1 << e if e else 0)
+        grid.append(row)
+    return grid
+
+
+def transpose(bits: int) -> int:
+    """Транспонирует поле (клетка (r, c) переходит в (c, r))."""
+    a1 = bits & 0xF0F00F0FF0F00F0F
+    a2 = bits & 0x0000F0F00000F0F0
+    a3 = bits & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _move_rows(bits: int, results, scores) -> Tuple[int, int]:
+    """Применяет табличный ход к каждой из четырёх строк."""
+    result = 0
+    gained = 0
+    for shift in (0, 16, 32, 48):
+        row = (bits >> shift) & ROW_MASK
+        new_row = results[row]
+        if new_row < 0:
+            raise OverflowError("Tile value exceeds bitboard capacity")
+        result |= new_row << shift
+        gained += scores[row]
+    return result, gained
+
+
+def move_bits(bits: int, direction: str) -> Tuple[int, int]:
+    """
+    Выполняет ход над 64-битным полем без добавления новой плитки.
+    Строки 4x4 используют общие таблицы из row_tables.
+    Возвращает (новое поле, полученные очки).
+    """
+    table = get_row_table(4)
+
+    if direction == "left":
+        return _move_rows(bits, table.left, table.score)
+    if direction == "right":
+        return _move_rows(bits, table.right, table.score)
+
+    results = table.left if direction == "up" else table.right
+    moved, gained = _move_rows(transpose(bits), results, table.score)
+    return transpose(moved), gained
+
+
+def _zero_nibbles(bits: int) -> int:
+    """Маска с единицей в младшем бите каждого нулевого ниббла."""
+    x = bits | (bits >> 1)
+    x |= x >> 2
+    return ~x & _NIBBLE_LOW_BITS
+
+
+def count_empty(bits: int) -> int:
+    return bin(_zero_nibbles(bits)).count("1")
+
+
+def empty_cells(bits: int) -> List[Tuple[int, int]]:
+    """Пустые клетки в порядке обхода по строкам (как Board.get_empty_cells)."""
+    zero = _zero_nibbles(bits)
+    cells = []
+    while zero:
+        low = zero & -zero
+        index = (low.bit_length() - 1) >> 2
+        cells.append((index >> 2, index & 3))
+        zero ^= low
+    return cells
+
+
+def max_exponent(bits: int) -> int:
+    best = 0
+    while bits:
+        e = bits & 0xF
+        if e > best:
+            best = e
+        bits >>= 4
+    return best
+
+
+def can_move(bits: int) -> bool:
+    """Есть пустая клетка или пара одинаковых соседей."""
+    if _zero_nibbles(bits):
+        return True
+
+    horizontal = _zero_nibbles(bits ^ (bits >> 4)) & _HORIZONTAL_PAIRS
+    if horizontal:
+        return True
+
+    vertical = _zero_nibbles(bits ^ (bits >> 16)) & _VERTICAL_PAIRS
+    return bool(vertical)
+
+
+# =====================
+# Движок Board на битовом поле
+# =====================
+
+class BitBoard(Board):
+    """
+    Board для поля 4x4, хранящий состояние в одном 64-битном целом.
+
+    Публичный API совпадает с Board: move(), reset(), add_random_tile(),
+    has_won(), can_move(), get_empty_cells(). Матрица grid доступна как
+    свойство (распаковывается по требованию), поэтому Renderer и HUD
+    работают без изменений. При одинаковом seed результаты совпадают
+    с обычным Board.
+
+    Плитка больше 32768 (слияние 32768 + 32768) в 4 бита не помещается:
+    поле переходит на матрицу списков (self._grid) и дальше работает кодом
+    Board, пока grid не заменят полем, которое снова помещается в биты
+    (reset, undo, load_packed).
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        target_value: int = 2048,
+        new_tile_values=None,
+        new_tile_probabilities=None,
+        seed=None,
+    ):
+        if size != 4:
+            raise ValueError("BitBoard supports only 4x4 boards")
+
+        self.bits = 0
+        self._grid_cache: Tuple[int, List[List[int]]] = (-1, [])
+        # Матрица поля, не поместившегося в биты; None -- поле в self.bits
+        self._grid: Optional[List[List[int]]] = None
+        super().__init__(
+            size=size,
+            target_value=target_value,
+            new_tile_values=new_tile_values,
+            new_tile_probabilities=new_tile_probabilities,
+            seed=seed,
+        )
+
+    # ---------- grid как представление битового поля ---------- #
+
+    @property
+    def grid(self) -> List[List[int]]:
+        if self._grid is not None:
+            return self._grid
+        bits, grid = self._grid_cache
+        if bits != self.bits:
+            grid = decode(self.bits)
+            self._grid_cache = (self.bits, grid)
+        return grid
+
+    @grid.setter
+    def grid(self, value: List[List[int]]) -> None:
+        try:
+            self.bits = encode(value)
+        except ValueError:
+            self._to_list(value)
+            return
+        self._grid = None
+
+    def _to_list(self, grid: List[List[int]]) -> None:
+        """Переводит поле на матрицу списков (плитка больше 32768)."""
+        self._grid = grid
+        self._recount()
+
+    # ---------- Компактное представление ---------- #
+
+    def pack(self) -> int:
+        if self._grid is not None:
+            return super().pack()
+        # Раскладка битов совпадает с packed.py, упаковывать нечего
+        return self.bits
+
+    def load_packed(self, code: int) -> None:
+        self.bits = code
+        self._grid = None
+
+    # ---------- Работа с плитками ---------- #
+
+    def get_empty_cells(self) -> List[Tuple[int, int]]:
+        if self._grid is not None:
+            return super().get_empty_cells()
+        return empty_cells(self.bits)
+
+    def _place_tile(self, r: int, c: int, value: int) -> None:
+        if self._grid is not None:
+            super()._place_tile(r, c, value)
+            return
+        shift = 4 * (4 * r + c)
+        e = value.bit_length() - 1
+        self.bits = (self.bits & ~(0xF << shift)) | (e << shift)
+
+    # ---------- Проверка состояния ---------- #
+
+    @property
+    def max_tile(self) -> int:
+        if self._grid is not None:
+            return self._max_tile
+        e = max_exponent(self.bits)
+        return 1 << e if e else 0
+
+    def has_won(self) -> bool:
+        if self._grid is not None:
+            return super().has_won()
+        return (1 << max_exponent(self.bits)) >= self.target_value
+
+    def can_move(self) -> bool:
+        if self._grid is not None:
+            return super().can_move()
+        return can_move(self.bits)
+
+    # ---------- Просмотр ходов ---------- #
+
+    def legal_moves(self) -> int:
+        if self._grid is not None:
+            return super().legal_moves()
+        # Строки поля дают left/right, строки транспонированного -- up/down.
+        # NO_RESULT (слияние 32768 + 32768) тоже отличается от строки -- ход есть.
+        table = get_row_table(4)
+        left, right = table.left, table.right
+        legal = 0
+        for bits, first in ((transpose(self.bits), 0), (self.bits, 2)):
+            for shift in (0, 16, 32, 48):
+                row = (bits >> shift) & ROW_MASK
+                if left[row] != row:
+                    legal |= 1 << first
+                if right[row] != row:
+                    legal |= 2 << first
+        return legal
+
+    def preview_moves(self) -> Tuple[int, List[Optional[MovePreview]]]:
+        if self._grid is not None:
+            return super().preview_moves()
+        legal = 0
+        previews: List[Optional[MovePreview]] = [None, None, None, None]
+        for i, direction in enumerate(DIRECTIONS):
+            try:
+                new_bits, gained = move_bits(self.bits, direction)
+            except OverflowError:
+                # Слияние 32768 + 32768 -- считаем по матрице
+                return super().preview_moves()
+            if new_bits != self.bits:
+                legal |= 1 << i
+                previews[i] = (new_bits, gained)
+        return legal, previews
+
+    # ---------- Ход ---------- #
+
+    def _apply_move(self, direction: str) -> Tuple[bool, int]:
+        if self._grid is not None:
+            return super()._apply_move(direction)
+        if self.track_slides:
+            return self._apply_tracked_move(direction)
+        try:
+            new_bits, gained = move_bits(self.bits, direction)
+        except OverflowError:
+            # Слияние 32768 + 32768: дальше -- матрица и ход Board
+            self._to_list(decode(self.bits))
+            return super()._apply_move(direction)
+        moved = new_bits != self.bits
+        self.bits = new_bits
+        return moved, gained
+
+    def _apply_tracked_move(self, direction: str) -> Tuple[bool, int]:
+        """
+        Ход с записью перемещений плиток: таблицы строк знают только
+        результат, поэтому линии распакованного поля идут через slide_line.
+        """
+        self.last_slides = []
+        before = self.grid
+        grid = [row[:] for row in before]
+        horizontal = direction in ("left", "right")
+        forward = direction in ("left", "up")
+
+        gained_score = 0
+        for i in range(4):
+            line = grid[i] if horizontal else [grid[r][i] for r in range(4)]
+            new_line, gained = self._slide(line, i, horizontal, forward)
+            gained_score += gained
+            if horizontal:
+                grid[i] = new_line
+            else:
+                for r in range(4):
+                    grid[r][i] = new_line[r]
+
+        moved = grid != before
+        if moved:
+            # Сеттер сам переведёт поле на матрицу, если появилась плитка 65536
+            self.grid = grid
+        return moved, gained_score
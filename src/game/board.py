@@ -1,5 +1,70 @@
 import random
-from typing import List, Tuple
+import time
+from itertools import chain
+from operator import eq
+from typing import List, Optional, Tuple
+
+from src.game.events import BoardObserver, combine_observers, merged_values
+from src.game.packed import pack_grid, unpack_grid
+from src.game.row_tables import (
+    NO_RESULT, SUPPORTED_SIZES, encode_row, prefetch_row_table,
+)
+from src.game.spawn import SpawnSampler
+
+
+# Порядок направлений для масок legal_moves() и списков preview_moves():
+# бит i / элемент i соответствует DIRECTIONS[i]
+DIRECTIONS = ("up", "down", "left", "right")
+
+# Результат просмотра хода: (упакованное поле после хода или None, очки)
+MovePreview = Tuple[Optional[int], int]
+
+# Перемещение плитки за ход: (откуда, куда, значение до хода, слилась ли).
+# Клетки -- индексы r * size + c. У слияния две записи с одним "куда":
+# обе плитки приезжают в клетку, где появляется плитка 2 * значение
+Slide = Tuple[int, int, int, bool]
+
+
+def slide_line(line: List[int], forward: bool = True) -> Tuple[List[int], int, List[Slide]]:
+    """
+    Сдвиг одной линии (к началу при forward, иначе к концу) с записью
+    перемещений: (новая линия, очки, перемещения). Позиции в записях --
+    номера клеток внутри линии. Плитки, которые остались на месте
+    и ни с чем не слились, не записываются.
+
+    Линия и перемещения получаются за один проход: каждая плитка сразу
+    ставится на своё место и тут же записывается, второго сравнения
+    "до/после" нет.
+    """
+    size = len(line)
+    order = range(size) if forward else range(size - 1, -1, -1)
+    new_line = [0] * size
+    slides: List[Slide] = []
+    gained = 0
+
+    target = 0   # номер (в порядке order) следующей свободной клетки
+    open_at = -1  # клетка последней плитки, с которой ещё можно слиться
+    open_slide = -1  # её запись в slides
+
+    for k in order:
+        value = line[k]
+        if not value:
+            continue
+        if open_at >= 0 and new_line[open_at] == value:
+            new_line[open_at] = value * 2
+            gained += value * 2
+            src, dst, moved_value, _ = slides[open_slide]
+            slides[open_slide] = (src, dst, moved_value, True)
+            slides.append((k, open_at, value, True))
+            open_at = -1
+        else:
+            open_at = order[target]
+            target += 1
+            new_line[open_at] = value
+            open_slide = len(slides)
+            slides.append((k, open_at, value, False))
+
+    return new_line, gained, [s for s in slides if s[0] != s[1] or s[3]]
 
 
 class Board:
@@ -22,6 +87,7 @@ class Board:
         target_value: int = 2048,
         new_tile_values=None,
         new_tile_probabilities=None,
+        seed=None,
     ):
         self.size = size
         self.target_value = target_value
@@ -31,6 +97,47 @@ class Board:
         self.new_tile_probabilities = (
             new_tile_probabilities or [0.9, 0.1]
         )
+        self._sampler = SpawnSampler(self.new_tile_values, self.new_tile_probabilities)
+
+        # Собственный генератор поля: с одинаковым seed последовательность
+        # новых плиток одинакова в любом процессе и не зависит от модуля random
+        self.rng = random.Random(seed)
+
+        # Последняя новая плитка: (индекс клетки r * size + c, значение)
+        self.last_spawn: Optional[Tuple[int, int]] = None
+
+        # Запись партии (см. recording.py); None -- не пишем
+        self.recorder = None
+
+        # Запись перемещений плиток (для анимации сдвига, см. slide_line):
+        # при track_slides каждый ход заполняет last_slides заново
+        self.track_slides = False
+        self.last_slides: List[Slide] = []
+
+        # Подписчики событий (см. events.py): None -- никого, move() без замеров
+        self.observer: Optional[BoardObserver] = None
+        self._observers: Tuple[BoardObserver, ...] = ()
+
+        # Таблицы переходов строк (для 3x3, 4x4, 5x5), см. row_tables.py.
+        # Конструктор их не ждёт: без кэша таблица строится в фоновом потоке,
+        # а ходы до её готовности идут медленным путём (_poll_row_table)
+        self._row_table = None
+        self._table_pending = self.size in SUPPORTED_SIZES
+        self._poll_row_table()
+
+        # Битовые маски клеток каждой строки/столбца (бит r * size + c)
+        # для инкрементального учёта пустых клеток в move()
+        self._line_bits = {
+            True: [[1 << (i * self.size + k) for k in range(self.size)]
+                   for i in range(self.size)],
+            False: [[1 << (k * self.size + i) for k in range(self.size)]
+                    for i in range(self.size)],
+        }
+
+        # Поддерживаются инкрементально (см. grid.setter, _place_tile, move):
+        # маска пустых клеток и максимальная плитка
+        self._empty_mask = 0
+        self._max_tile = 0
 
         # Внутреннее представление поля
         self.grid: List[List[int]] = [
@@ -40,10 +147,65 @@ class Board:
         # Текущее количество очков
         self.score: int = 0
 
+    # ==========================
+    # Поле и его сводки
+    # ==========================
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return self._grid
+
+    @grid.setter
+    def grid(self, value: List[List[int]]) -> None:
+        """
+        Замена поля целиком (reset, load_packed, внешний код):
+        единственное место, где пустые клетки и максимум считаются полным обходом.
+        """
+        self._grid = value
+        self._recount()
+
+    def _recount(self) -> None:
+        mask = 0
+        best = 0
+        bit = 1
+        for row in self._grid:
+            for value in row:
+                if value == 0:
+                    mask |= bit
+                elif value > best:
+                    best = value
+                bit <<= 1
+        self._empty_mask = mask
+        self._max_tile = best
+
+    @property
+    def max_tile(self) -> int:
+        """Максимальная плитка на поле."""
+        return self._max_tile
+
+    # ==========================
+    # Подписчики событий
+    # ==========================
+
+    def subscribe(self, observer: BoardObserver) -> None:
+        """Подключает подписчика событий хода, слияний, плиток и конца партии."""
+        if observer not in self._observers:
+            self._observers += (observer,)
+            self.observer = combine_observers(self._observers)
+
+    def unsubscribe(self, observer: BoardObserver) -> None:
+        if observer in self._observers:
+            self._observers = tuple(o for o in self._observers if o is not observer)
+            self.observer = combine_observers(self._observers)
+
     # ==========================
     # Инициализация и сброс игры
     # ==========================
 
+    def seed(self, seed=None) -> None:
+        """Пересидирует генератор новых плиток (None -- случайный seed)."""
+        self.rng.seed(seed)
+
     def reset(self, initial_tiles: int = 2) -> None:
         """
         Очищает поле и создаёт заданное количество стартовых плиток.
@@ -53,8 +215,34 @@ class Board:
         ]
         self.score = 0
 
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_reset(self)
+        observer = self.observer
+        if observer is not None:
+            observer.on_reset(self)
+
         for _ in range(initial_tiles):
-            self.add_random_tile()
+            if self.add_random_tile():
+                if recorder is not None:
+                    recorder.record_spawn(self)
+                if observer is not None:
+                    observer.on_spawn(self, *self.last_spawn)
+
+    # =====================
+    # Компактное представление
+    # =====================
+
+    def pack(self) -> int:
+        """
+        Упаковывает поле в одно целое (4 бита на клетку, см. packed.py).
+        Используется как хэш позиции и для передачи поля между процессами.
+        """
+        return pack_grid(self.grid)
+
+    def load_packed(self, code: int) -> None:
+        """Восстанавливает поле из кода pack() (счёт не меняется)."""
+        self.grid = unpack_grid(code, self.size)
 
     # =====================
     # Работа с плитками
@@ -62,13 +250,17 @@ class Board:
 
     def get_empty_cells(self) -> List[Tuple[int, int]]:
         """
-        Возвращает список координат пустых клеток (r, c).
+        Возвращает список координат пустых клеток (r, c)
+        в порядке обхода по строкам. Строится из маски пустых клеток,
+        без обхода поля.
         """
         empty = []
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.grid[r][c] == 0:
-                    empty.append((r, c))
+        mask = self._empty_mask
+        size = self.size
+        while mask:
+            low = mask & -mask
+            empty.append(divmod(low.bit_length() - 1, size))
+            mask ^= low
         return empty
 
     def add_random_tile(self) -> bool:
@@ -80,16 +272,31 @@ class Board:
         if not empty_cells:
             return False
 
-        r, c = random.choice(empty_cells)
+        rng = self.rng
+        r, c = empty_cells[int(rng.random() * len(empty_cells))]
 
         # Выбираем значение новой плитки согласно вероятностям
-        value = random.choices(
-            self.new_tile_values, weights=self.new_tile_probabilities
-        )[0]
+        value = self._sampler.pick(rng.random())
 
-        self.grid[r][c] = value
+        self._place_tile(r, c, value)
+        self.last_spawn = (r * self.size + c, value)
         return True
 
+    def _place_tile(self, r: int, c: int, value: int) -> None:
+        """
+        Записывает значение в клетку (r, c).
+        Альтернативные движки (см. bitboard.py) переопределяют этот метод.
+        """
+        self._grid[r][c] = value
+
+        bit = 1 << (r * self.size + c)
+        if value:
+            self._empty_mask &= ~bit
+            if value > self._max_tile:
+                self._max_tile = value
+        else:
+            self._empty_mask |= bit
+
     # =====================
     # Проверка состояния
     # =====================
@@ -98,11 +305,7 @@ class Board:
         """
         Возвращает True, если на поле есть плитка с target_value.
         """
-        return any(
-            cell >= self.target_value
-            for row in self.grid
-            for cell in row
-        )
+        return self._max_tile >= self.target_value
 
     def can_move(self) -> bool:
         """
@@ -111,24 +314,159 @@ class Board:
         ИЛИ
         - есть две соседние по вертикали/горизонтали одинаковые плитки.
         """
-        # Пустые клетки
-        if self.get_empty_cells():
+        # Пустые клетки (по маске, без обхода поля)
+        if self._empty_mask:
             return True
 
-        # Проверка по горизонтали и вертикали
-        for r in range(self.size):
-            for c in range(self.size):
-                value = self.grid[r][c]
+        # Заполненное поле: каждая строка против себя же, сдвинутой на клетку,
+        # и всё поле против себя, сдвинутого на строку (как ArrayBoard) --
+        # сравнения на уровне C вместо двойного цикла по клеткам
+        grid = self._grid
+        for row in grid:
+            if any(map(eq, row, row[1:])):
+                return True
+        return any(map(eq, chain.from_iterable(grid), chain.from_iterable(grid[1:])))
 
-                # сосед справа
-                if c + 1 < self.size and self.grid[r][c + 1] == value:
-                    return True
+    # =====================
+    # Просмотр ходов без изменения поля
+    # =====================
+
+    def legal_moves(self) -> int:
+        """
+        Битовая маска допустимых ходов: бит i выставлен, если ход
+        DIRECTIONS[i] изменит поле. Поле не меняется.
+
+        Один обход соседних пар: ход влево возможен, если за пустой клеткой
+        стоит плитка или рядом (через пустые клетки) есть две равные плитки;
+        остальные направления -- зеркально.
+        """
+        grid = self.grid
+        size = self.size
+        mask = 0
 
-                # сосед снизу
-                if r + 1 < self.size and self.grid[r + 1][c] == value:
-                    return True
+        for r in range(size):
+            row = grid[r]
+            below = grid[r + 1] if r + 1 < size else None
+            previous_h = 0  # последняя плитка слева в строке
+            for c in range(size):
+                value = row[c]
+                if c + 1 < size:
+                    right = row[c + 1]
+                    if value == 0:
+                        if right:
+                            mask |= 0b0100  # left
+                    elif right == 0:
+                        mask |= 0b1000  # right
+                if value:
+                    if value == previous_h:
+                        mask |= 0b1100
+                    previous_h = value
+                if below is not None:
+                    down = below[c]
+                    if value == 0:
+                        if down:
+                            mask |= 0b0001  # up
+                    elif down == 0:
+                        mask |= 0b0010  # down
+            if mask == 0b1111:
+                return mask
+
+        # Равные плитки в столбце (в т.ч. через пустые клетки)
+        if mask & 0b0011 != 0b0011:
+            for c in range(size):
+                previous_v = 0
+                for r in range(size):
+                    value = grid[r][c]
+                    if value:
+                        if value == previous_v:
+                            return mask | 0b0011
+                        previous_v = value
+
+        return mask
+
+    def preview_moves(self) -> Tuple[int, List[Optional[MovePreview]]]:
+        """
+        Результаты всех четырёх ходов без изменения поля и без новой плитки.
+
+        Возвращает (legal_moves(), previews), где previews[i] для DIRECTIONS[i]:
+        - None, если ход недопустим;
+        - (code, gained): поле после хода в формате pack() и очки за ход;
+          code равен None, если поле не помещается в упакованный формат
+          (плитка больше 32768).
+
+        Каждая строка и каждый столбец кодируются один раз и дают результаты
+        сразу для двух противоположных направлений; промежуточные матрицы
+        не создаются.
+        """
+        legal = self.legal_moves()
+        previews: List[Optional[MovePreview]] = [None, None, None, None]
+        grid = self.grid
+        size = self.size
+        width = 4 * size
+
+        # (горизонтально?, индекс первого направления пары в DIRECTIONS)
+        for horizontal, first in ((False, 0), (True, 2)):
+            wanted = (legal >> first) & 0b11
+            if not wanted:
+                continue
 
-        return False
+            codes: List[Optional[int]] = [0, 0]
+            gains = [0, 0]
+
+            for i in range(size):
+                line = grid[i] if horizontal else [grid[r][i] for r in range(size)]
+                for k in (0, 1):
+                    if not wanted >> k & 1:
+                        continue
+                    new_code, gained = self._preview_line(line, k == 0)
+                    gains[k] += gained
+                    if codes[k] is None:
+                        continue
+                    if new_code is None:
+                        codes[k] = None
+                    elif horizontal:
+                        codes[k] |= new_code << (width * i)
+                    else:
+                        for r in range(size):
+                            codes[k] |= ((new_code >> (4 * r)) & 0xF) << (4 * (size * r + i))
+
+            for k in (0, 1):
+                if wanted >> k & 1:
+                    previews[first + k] = (codes[k], gains[k])
+
+        return legal, previews
+
+    def _poll_row_table(self):
+        """Таблица строк, если уже готова (пока строится -- None)."""
+        table = prefetch_row_table(self.size)
+        if table is not None:
+            self._row_table = table
+            self._table_pending = False
+        return table
+
+    def _preview_line(self, line: List[int], left_like: bool) -> Tuple[Optional[int], int]:
+        """
+        Код строки/столбца после сдвига (влево/вверх при left_like) и очки.
+        Код равен None, если результат не помещается в 4 бита на клетку.
+        """
+        table = self._row_table
+        if table is None and self._table_pending:
+            table = self._poll_row_table()
+        if table is not None:
+            try:
+                code = encode_row(line)
+            except KeyError:
+                code = None
+            if code is not None:
+                new_code = (table.left if left_like else table.right)[code]
+                if new_code != NO_RESULT:
+                    return new_code, table.score[code]
+
+        new_line, gained = self._merge_line(line, "left" if left_like else "right")
+        try:
+            return encode_row(new_line), gained
+        except KeyError:
+            return None, gained
 
     # =====================
     # Основная логика хода
@@ -144,40 +482,14 @@ class Board:
         - won: bool          -- достигнут ли target_value
         - lost: bool         -- нет возможных ходов после этого хода
         """
-        valid_directions = {"up", "down", "left", "right"}
-        if direction not in valid_directions:
+        if direction not in DIRECTIONS:
             raise ValueError(f"Invalid direction: {direction}")
 
-        # Сохраняем копию поля перед ходом
-        old_grid = [row[:] for row in self.grid]
-
-        # Накопленный за ход прирост очков
-        gained_score = 0
+        observer = self.observer
+        if observer is not None:
+            return self._observed_move(direction, observer)
 
-        # Для удобства обрабатываем сдвиги в терминах "сдвиг влево" на строках.
-        # Для up/down/right преобразуем поле, делаем move_left, и обратно.
-        if direction == "left":
-            gained_score = self._move_left_on_grid(self.grid)
-        elif direction == "right":
-            # Разворачиваем строки, двигаем "влево", разворачиваем обратно
-            self._reverse_rows()
-            gained_score = self._move_left_on_grid(self.grid)
-            self._reverse_rows()
-        elif direction == "up":
-            # Транспонируем, двигаем "влево", транспонируем обратно
-            self._transpose()
-            gained_score = self._move_left_on_grid(self.grid)
-            self._transpose()
-        elif direction == "down":
-            # Транспонируем, разворачиваем строки, двигаем "влево", разворачиваем, транспонируем
-            self._transpose()
-            self._reverse_rows()
-            gained_score = self._move_left_on_grid(self.grid)
-            self._reverse_rows()
-            self._transpose()
-
-        # Проверяем, изменилось ли поле
-        moved = old_grid != self.grid
+        moved, gained_score = self._apply_move(direction)
 
         if moved:
             # Если ход что-то изменил, добавляем новую плитку
@@ -185,30 +497,163 @@ class Board:
             # Обновляем общий счёт
             self.score += gained_score
 
+            if self.recorder is not None:
+                self.recorder.record_move(self, direction)
+
         # Проверяем победу и поражение
         won = self.has_won()
         lost = not self.can_move()
 
         return moved, gained_score, won, lost
 
-    # =====================
-    # Вспомогательные методы для move
-    # =====================
+    def _observed_move(self, direction: str, observer: BoardObserver) -> Tuple[bool, int, bool, bool]:
+        """
+        move() при подписчике: тот же ход плюс замер времени и события.
+        Копия поля до хода нужна только для разбора слияний и в замер не входит,
+        как и сами обработчики событий.
+        """
+        before = [row[:] for row in self.grid]
+        start = time.perf_counter()
+
+        moved, gained_score = self._apply_move(direction)
+        spawned = False
+        if moved:
+            spawned = self.add_random_tile()
+            self.score += gained_score
+
+            if self.recorder is not None:
+                self.recorder.record_move(self, direction)
+
+        won = self.has_won()
+        lost = not self.can_move()
+        elapsed = time.perf_counter() - start
+
+        # Очки начисляются только за слияния: без очков разбирать нечего
+        if gained_score:
+            observer.on_merge(self, direction, merged_values(before, direction))
+        if spawned:
+            observer.on_spawn(self, *self.last_spawn)
+        observer.on_move(self, direction, moved, gained_score, elapsed)
+        if moved and lost:
+            observer.on_game_over(self, self.score, self.max_tile)
 
-    def _move_left_on_grid(self, grid: List[List[int]]) -> int:
+        return moved, gained_score, won, lost
+
+    def _apply_move(self, direction: str) -> Tuple[bool, int]:
         """
-        Применяет ход "влево" ко всем строкам.
-        Возвращает суммарный прирост очков за слияния.
+        Сдвигает и сливает плитки без добавления новой плитки.
+        Возвращает (moved, gained_score).
+
+        Каждая строка (для left/right) или столбец (для up/down) обрабатывается
+        по месту -- без копии поля, транспонирования и разворотов. Для 3x3-5x5
+        (когда таблица готова) линия кодируется в число и заменяется
+        результатом из таблицы переходов.
+        Маска пустых клеток и максимум обновляются только по изменённым линиям.
+
+        При track_slides таблица не используется: линии идут через slide_line,
+        который заодно записывает перемещения плиток в last_slides.
         """
-        total_gained = 0
+        table = self._row_table
+        if table is None and self._table_pending:
+            table = self._poll_row_table()
+        left_like = direction in ("left", "up")
+        tracking = self.track_slides
+        if tracking:
+            self.last_slides = []
+            table = None
+        if table is not None:
+            results = table.left if left_like else table.right
+            scores = table.score
+
+        grid = self._grid
+        size = self.size
+        horizontal = direction in ("left", "right")
+        line_bits = self._line_bits[horizontal]
+
+        moved = False
+        gained_score = 0
 
-        for r in range(self.size):
-            row = grid[r]
-            new_row, gained = self._compress_and_merge_row_left(row)
-            grid[r] = new_row
-            total_gained += gained
+        for i in range(size):
+            line = grid[i] if horizontal else [grid[r][i] for r in range(size)]
+            new_line = None
+
+            if table is not None:
+                try:
+                    code = encode_row(line)
+                except KeyError:
+                    code = None  # плитка больше, чем помещается в таблицу
+
+                if code is not None:
+                    new_code = results[code]
+                    if new_code == code:
+                        continue
+                    if new_code >= 0:
+                        new_line = table.decode(new_code)
+                        gained = scores[code]
+
+            if new_line is None:
+                if tracking:
+                    new_line, gained = self._slide(line, i, horizontal, left_like)
+                else:
+                    new_line, gained = self._merge_line(line, direction)
+                if new_line == line:
+                    continue
+
+            moved = True
+            gained_score += gained
+
+            if horizontal:
+                grid[i] = new_line
+            else:
+                for r in range(size):
+                    grid[r][i] = new_line[r]
+
+            # Пустые клетки этой линии пересчитываем по новой линии
+            mask = self._empty_mask
+            for bit, value in zip(line_bits[i], new_line):
+                if value:
+                    mask &= ~bit
+                else:
+                    mask |= bit
+            self._empty_mask = mask
+
+            # Новый максимум может появиться только из слияния
+            if gained:
+                top = max(new_line)
+                if top > self._max_tile:
+                    self._max_tile = top
+
+        return moved, gained_score
+
+    def _merge_line(self, line: List[int], direction: str) -> Tuple[List[int], int]:
+        """
+        Медленный путь для одной строки/столбца, когда таблица не подходит.
+        """
+        if direction in ("left", "up"):
+            return self._compress_and_merge_row_left(line)
+
+        new_line, gained = self._compress_and_merge_row_left(line[::-1])
+        new_line.reverse()
+        return new_line, gained
+
+    def _slide(self, line: List[int], i: int, horizontal: bool, forward: bool) -> Tuple[List[int], int]:
+        """
+        slide_line для линии i с записью перемещений в last_slides
+        (позиции в линии переводятся в индексы клеток поля).
+        """
+        new_line, gained, slides = slide_line(line, forward)
+        size = self.size
+        record = self.last_slides.append
+        for src, dst, value, merged in slides:
+            if horizontal:
+                record((i * size + src, i * size + dst, value, merged))
+            else:
+                record((src * size + i, dst * size + i, value, merged))
+        return new_line, gained
 
-        return total_gained
+    # =====================
+    # Вспомогательные методы для move
+    # =====================
 
     def _compress_and_merge_row_left(
         self, row: List[int]
@@ -252,15 +697,34 @@ class Board:
 
         return merged_row, gained_score
 
-    def _reverse_rows(self) -> None:
-        """
-        Разворачивает каждый ряд (для реализации "right" и "down").
-        """
-        for r in range(self.size):
-            self.grid[r].reverse()
 
-    def _transpose(self) -> None:
-        """
-        Транспонирует матрицу (для реализации "up" и "down").
-        """
-        self.grid = [list(row) for row in zip(*self.grid)]
\ No newline at end of file
+# =====================
+# Выбор движка
+# =====================
+
+ENGINES = ("list", "bitboard", "array")
+
+
+def create_board(engine: str = "list", **kwargs) -> Board:
+    """
+    Создаёт поле с нужным движком:
+    - "list"     -- обычная матрица списков (Board);
+    - "bitboard" -- 64-битное представление (BitBoard), только для 4x4;
+    - "array"    -- плоский массив (ArrayBoard) для больших полей, от 6x6.
+
+    Для размеров, которые bitboard или array не поддерживают, возвращается
+    Board (на 3x3-5x5 его табличные ходы быстрее).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown board engine: {engine}")
+
+    if engine == "bitboard" and kwargs.get("size", 4) == 4:
+        from src.game.bitboard import BitBoard
+        return BitBoard(**kwargs)
+
+    if engine == "array":
+        from src.game.array_board import ARRAY_MIN_SIZE, ArrayBoard
+        if kwargs.get("size", 4) >= ARRAY_MIN_SIZE:
+            return ArrayBoard(**kwargs)
+
+    return Board(**kwargs)
@@ -0,0 +1,99 @@
+from typing import List, Optional, Tuple
+
+
+# =====================
+# События поля
+# =====================
+#
+# Подписчик поля (board.subscribe(observer)) получает события в таком порядке:
+#   on_reset      -- новая партия (Board.reset), затем on_spawn стартовых плиток;
+#   on_merge      -- слияния хода (только если они были);
+#   on_spawn      -- новая плитка после хода;
+#   on_move       -- итог хода и его длительность;
+#   on_game_over  -- ход, после которого ходов больше нет.
+#
+# Без подписчиков board.observer равен None и Board.move() идёт обычным путём:
+# одна проверка на None, без замеров времени и разбора слияний.
+
+
+class BoardObserver:
+    """
+    Базовый подписчик: все методы -- пустые, переопределяются нужные.
+    Вызовы идут синхронно из Board, поэтому обработчик должен быть дешёвым
+    (счётчики), а всё медленное -- откладывать (см. MetricsCollector).
+    """
+
+    def on_reset(self, board) -> None:
+        pass
+
+    def on_spawn(self, board, index: int, value: int) -> None:
+        """Новая плитка value в клетке index = r * size + c."""
+
+    def on_merge(self, board, direction: str, values: List[int]) -> None:
+        """Значения плиток, получившихся из слияний за ход (по одному на слияние)."""
+
+    def on_move(self, board, direction: str, moved: bool, gained: int, seconds: float) -> None:
+        """Ход (в т.ч. не изменивший поле) и время Board.move() в секундах."""
+
+    def on_game_over(self, board, score: int, max_tile: int) -> None:
+        pass
+
+
+class ObserverGroup(BoardObserver):
+    """Рассылка событий нескольким подписчикам (board.observer при двух и более)."""
+
+    def __init__(self, observers: Tuple[BoardObserver, ...]):
+        self.observers = observers
+
+    def on_reset(self, board) -> None:
+        for observer in self.observers:
+            observer.on_reset(board)
+
+    def on_spawn(self, board, index: int, value: int) -> None:
+        for observer in self.observers:
+            observer.on_spawn(board, index, value)
+
+    def on_merge(self, board, direction: str, values: List[int]) -> None:
+        for observer in self.observers:
+            observer.on_merge(board, direction, values)
+
+    def on_move(self, board, direction: str, moved: bool, gained: int, seconds: float) -> None:
+        for observer in self.observers:
+            observer.on_move(board, direction, moved, gained, seconds)
+
+    def on_game_over(self, board, score: int, max_tile: int) -> None:
+        for observer in self.observers:
+            observer.on_game_over(board, score, max_tile)
+
+
+def combine_observers(observers: Tuple[BoardObserver, ...]) -> Optional[BoardObserver]:
+    """Значение для board.observer: None, сам подписчик или ObserverGroup."""
+    if not observers:
+        return None
+    if len(observers) == 1:
+        return observers[0]
+    return ObserverGroup(observers)
+
+
+def merged_values(grid: List[List[int]], direction: str) -> List[int]:
+    """
+    Слияния хода direction по полю до хода: значения получившихся плиток
+    в порядке обхода линий. Используется только при подписчике, поэтому
+    табличные пути Board._apply_move об этом не знают.
+    """
+    size = len(grid)
+    horizontal = direction in ("left", "right")
+    forward = direction in ("left", "up")
+
+    merged = []
+    for i in range(size):
+        line = grid[i] if horizontal else [grid[r][i] for r in range(size)]
+        tiles = [value for value in (line if forward else reversed(line)) if value]
+        k = 0
+        while k + 1 < len(tiles):
+            if tiles[k] == tiles[k + 1]:
+                merged.append(tiles[k] * 2)
+                k += 2
+            else:
+                k += 1
+    return merged
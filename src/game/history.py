@@ -0,0 +1,184 @@
+import struct
+import sys
+from collections import deque
+from typing import Deque, List
+
+from src.game.board import Board
+
+
+# Снимок позиции: номер хода, счёт, вид поля + само поле.
+# Вид 0 -- упакованный код Board.pack() (4 бита на клетку),
+# вид 1 -- по байту на клетку, если плитки не помещаются в 4 бита.
+_SNAPSHOT = struct.Struct("<IQB")
+_PACKED = 0
+_EXPONENTS = 1
+
+# Сколько самых старых снимков прореживается за раз (см. MoveHistory._thin)
+_THIN_BLOCK = 64
+
+
+class MoveHistory:
+    """
+    История ходов для undo/redo с ограничением по памяти.
+
+    Каждая позиция хранится компактным снимком (bytes): упакованное поле,
+    счёт и номер хода -- десятки байт вместо копии матрицы. Снимки лежат
+    в кольцевом буфере (deque); undo и redo -- O(1) и не зависят от длины
+    истории.
+
+    Если снимки занимают больше budget_bytes, прореживается блок из
+    _THIN_BLOCK самых старых снимков, но не больше старой половины истории
+    (удаляется каждый второй). Начало истории прореживается раз за разом
+    и становится всё реже: дальние ходы остаются доступны, но undo по ним
+    идёт крупными шагами, а недавние идут подряд. Самый старый снимок
+    (начало партии) сохраняется до последнего.
+    """
+
+    def __init__(self, budget_bytes: int = 64 * 1024):
+        self.budget_bytes = budget_bytes
+
+        self._undo: Deque[bytes] = deque()
+        self._redo: List[bytes] = []
+
+        # Номер текущего хода в партии (после undo уменьшается)
+        self.turn = 0
+
+        self.nbytes = 0
+        self.thinned = 0
+
+    # ---------- Снимки ---------- #
+
+    def snapshot(self, board: Board) -> bytes:
+        """Снимок текущей позиции (для push() после успешного хода)."""
+        try:
+            code = board.pack()
+        except ValueError:
+            cells = bytes(
+                value.bit_length() - 1 if value else 0
+                for row in board.grid
+                for value in row
+            )
+            return _SNAPSHOT.pack(self.turn, board.score, _EXPONENTS) + cells
+
+        payload = code.to_bytes((code.bit_length() + 7) // 8, "little")
+        return _SNAPSHOT.pack(self.turn, board.score, _PACKED) + payload
+
+    @staticmethod
+    def _restore(board: Board, snapshot: bytes) -> int:
+        """Восстанавливает поле и счёт; возвращает номер хода снимка."""
+        turn, score, kind = _SNAPSHOT.unpack_from(snapshot)
+        payload = snapshot[_SNAPSHOT.size:]
+
+        if kind == _PACKED:
+            board.load_packed(int.from_bytes(payload, "little"))
+        else:
+            size = board.size
+            board.grid = [
+                [1 << e if e else 0 for e in payload[r * size:(r + 1) * size]]
+                for r in range(size)
+            ]
+        board.score = score
+        return turn
+
+    @staticmethod
+    def _cost(snapshot: bytes) -> int:
+        return sys.getsizeof(snapshot)
+
+    # ---------- Публичный API ---------- #
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self.turn = 0
+        self.nbytes = 0
+
+    def push(self, snapshot: bytes) -> None:
+        """
+        Запоминает позицию до хода (снимок, снятый snapshot() перед move()).
+        Новый ход обрывает ветку redo.
+        """
+        for entry in self._redo:
+            self.nbytes -= self._cost(entry)
+        self._redo.clear()
+
+        self._undo.append(snapshot)
+        self.nbytes += self._cost(snapshot)
+        self.turn += 1
+
+        if self.nbytes > self.budget_bytes:
+            self._thin()
+
+    def undo(self, board: Board) -> bool:
+        """Возвращает поле на позицию до последнего хода. False -- некуда."""
+        if not self._undo:
+            return False
+
+        current = self.snapshot(board)
+        previous = self._undo.pop()
+        self._redo.append(current)
+        self.nbytes += self._cost(current) - self._cost(previous)
+
+        self.turn = self._restore(board, previous)
+        return True
+
+    def redo(self, board: Board) -> bool:
+        """Повторяет отменённый ход. False -- нечего повторять."""
+        if not self._redo:
+            return False
+
+        current = self.snapshot(board)
+        following = self._redo.pop()
+        self._undo.append(current)
+        self.nbytes += self._cost(current) - self._cost(following)
+
+        self.turn = self._restore(board, following)
+        return True
+
+    # ---------- Бюджет памяти ---------- #
+
+    def _thin(self) -> None:
+        """
+        Прореживает самый старый блок истории. Блок фиксированного размера
+        и снимается с начала deque, поэтому работа на ход -- O(_THIN_BLOCK),
+        а не O(длины истории); блок освобождает половину своих снимков.
+        """
+        entries = self._undo
+        # Не больше старой половины: недавние ходы остаются подряд
+        count = min(len(entries) // 2, _THIN_BLOCK)
+        if count > 1:
+            kept = []
+            for i in range(count):
+                entry = entries.popleft()
+                if i % 2 == 0:
+                    kept.append(entry)
+                else:
+                    self.nbytes -= self._cost(entry)
+                    self.thinned += 1
+            entries.extendleft(reversed(kept))
+
+        # Бюджет меньше пары снимков -- выкидываем старые, кроме начала партии
+        while self.nbytes > self.budget_bytes and len(entries) > 1:
+            start = entries.popleft()
+            self.nbytes -= self._cost(entries.popleft())
+            entries.appendleft(start)
+            self.thinned += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._undo),
+            "redo": len(self._redo),
+            "bytes": self.nbytes,
+            "budget_bytes": self.budget_bytes,
+            "thinned": self.thinned,
+        }
@@ -0,0 +1,133 @@
+from typing import List, Tuple
+
+from src.game.row_tables import (
+    EXPONENTS, POWERS, SUPPORTED_SIZES, get_row_table,
+)
+
+
+# =====================
+# Компактное представление поля любого размера
+# =====================
+#
+# Поле size x size упаковывается в одно целое так же, как BitBoard упаковывает
+# 4x4: каждая клетка -- 4 бита с показателем степени, клетка (r, c) лежит
+# в битах 4 * (size * r + c). Для 4x4 код совпадает с BitBoard.bits.
+#
+# Код используется как хэш позиции (поиск, история, архивы) и как формат
+# передачи поля между процессами вместо списков grid.
+
+
+def pack_grid(grid: List[List[int]]) -> int:
+    """
+    Упаковывает матрицу в целое.
+    Бросает ValueError, если плитка не помещается в 4 бита.
+    """
+    code = 0
+    shift = 0
+    for row in grid:
+        for value in row:
+            try:
+                code |= EXPONENTS[value] << shift
+            except KeyError:
+                raise ValueError(f"Value {value} does not fit a packed board") from None
+            shift += 4
+    return code
+
+
+def unpack_grid(code: int, size: int) -> List[List[int]]:
+    """Распаковывает целое обратно в матрицу size x size."""
+    grid = []
+    for _ in range(size):
+        row = []
+        for _ in range(size):
+            row.append(POWERS[code & 0xF])
+            code >>= 4
+        grid.append(row)
+    return grid
+
+
+def get_cell(code: int, size: int, r: int, c: int) -> int:
+    """Показатель степени в клетке (r, c)."""
+    return (code >> (4 * (size * r + c))) & 0xF
+
+
+def place(code: int, index: int, exponent: int) -> int:
+    """Ставит плитку 2^exponent в пустую клетку с номером index = r * size + c."""
+    return code | (exponent << (4 * index))
+
+
+def empty_indices(code: int, size: int) -> List[int]:
+    """Номера пустых клеток (r * size + c) в порядке обхода по строкам."""
+    return [i for i in range(size * size) if not (code >> (4 * i)) & 0xF]
+
+
+def max_exponent(code: int) -> int:
+    best = 0
+    while code:
+        e = code & 0xF
+        if e > best:
+            best = e
+        code >>= 4
+    return best
+
+
+def rows(code: int, size: int) -> List[int]:
+    """Коды строк (формат row_tables)."""
+    mask = (1 << (4 * size)) - 1
+    return [(code >> (4 * size * r)) & mask for r in range(size)]
+
+
+def columns(code: int, size: int) -> List[int]:
+    """Коды столбцов (клетка r столбца -- ниббл r)."""
+    result = []
+    for c in range(size):
+        column = 0
+        for r in range(size):
+            column |= ((code >> (4 * (size * r + c))) & 0xF) << (4 * r)
+        result.append(column)
+    return result
+
+
+def check_move_size(size: int, owner: str) -> None:
+    """
+    move_packed() ходит по таблицам строк, а они есть только для
+    SUPPORTED_SIZES. Поиск и доигрывания проверяют размер сразу при
+    создании, а не падают посреди партии.
+    """
+    if size not in SUPPORTED_SIZES:
+        low, high = SUPPORTED_SIZES[0], SUPPORTED_SIZES[-1]
+        raise ValueError(
+            f"{owner} supports {low}x{low}-{high}x{high} boards, not {size}x{size}"
+        )
+
+
+def move_packed(code: int, size: int, direction: str) -> Tuple[int, int]:
+    """
+    Ход над упакованным полем без новой плитки.
+    Возвращает (новый код, очки). Бросает OverflowError, если слияние даёт
+    плитку больше 2^MAX_EXPONENT.
+    """
+    table = get_row_table(size)
+    results = table.left if direction in ("left", "up") else table.right
+    scores = table.score
+    gained = 0
+    new_code = 0
+
+    if direction in ("left", "right"):
+        for r, row in enumerate(rows(code, size)):
+            new_row = results[row]
+            if new_row < 0:
+                raise OverflowError("Tile value exceeds packed board capacity")
+            new_code |= new_row << (4 * size * r)
+            gained += scores[row]
+        return new_code, gained
+
+    for c, column in enumerate(columns(code, size)):
+        new_column = results[column]
+        if new_column < 0:
+            raise OverflowError("Tile value exceeds packed board capacity")
+        gained += scores[column]
+        for r in range(size):
+            new_code |= ((new_column >> (4 * r)) & 0xF) << (4 * (size * r + c))
+    return new_code, gained
+
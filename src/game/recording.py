@@ -0,0 +1,445 @@
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+from src.game.board import DIRECTIONS, Board
+
+
+# =====================
+# Формат записи партий
+# =====================
+#
+# Файл = заголовок + поток 16-битных слов (little-endian).
+#
+# Заголовок: MAGIC, версия (uint16), длина JSON (uint32) и JSON с размером
+# поля и настройками (target_value, new_tile_values, new_tile_probabilities,
+# keyframe_interval).
+#
+# Слово: два старших бита -- вид записи, остальные -- данные:
+#   MOVE     | клетка новой плитки (8 бит) | показатель плитки (4 бита) | направление (2 бита)
+#   SPAWN    | клетка (8 бит) | показатель (4 бита) | 0     -- стартовые плитки
+#   GAME     | 0                                      -- начало новой партии
+#   KEYFRAME | 0, за ним KEYFRAME_HEAD слов: номер хода (uint32), счёт (uint64),
+#              затем показатели всех клеток по байту (добито до чётного)
+#
+# Ход с изменением поля всегда даёт ровно одну новую плитку, поэтому ход
+# и плитка занимают одно слово. Ходы, которые ничего не сдвинули, не пишутся.
+# Ключевые кадры (полное поле) идут каждые keyframe_interval ходов: реплеер
+# восстанавливает позицию N с ближайшего кадра, а не с начала партии.
+# Кадр пишется и при undo/redo: номер хода в нём может быть меньше
+# предыдущего, тогда ходы после него считаются отменённой веткой.
+
+MAGIC = b"2048REC\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sHI")
+
+KIND_MOVE = 0
+KIND_SPAWN = 1
+KIND_GAME = 2
+KIND_KEYFRAME = 3
+
+# Номер клетки занимает 8 бит -- поля до 16x16
+MAX_CELLS = 256
+MAX_SPAWN_EXPONENT = 15
+
+# Номер хода (2 слова) + счёт (4 слова)
+KEYFRAME_HEAD = 6
+
+DEFAULT_KEYFRAME_INTERVAL = 256
+
+
+def _spawn_word(kind: int, index: int, value: int, direction: int = 0) -> int:
+    exponent = value.bit_length() - 1
+    if not 0 < exponent <= MAX_SPAWN_EXPONENT:
+        raise ValueError(f"Spawn value {value} cannot be recorded")
+    return (kind << 14) | (index << 6) | (exponent << 2) | direction
+
+
+def _keyframe_words(size: int) -> int:
+    """Длина ключевого кадра в словах, без слова-метки."""
+    return KEYFRAME_HEAD + (size * size + 1) // 2
+
+
+def _swap16(word: int) -> int:
+    return ((word & 0xFF) << 8) | (word >> 8)
+
+
+def _to_disk(words: array) -> bytes:
+    if sys.byteorder == "big":
+        words = array("H", words)
+        words.byteswap()
+    return words.tobytes()
+
+
+class GameRecorder:
+    """
+    Потоковая запись партий поля board в файл.
+
+    Подключается к полю (board.recorder = self): Board.reset() и Board.move()
+    сами сообщают о новой партии, стартовых плитках и ходах. Слова копятся
+    в буфере и дописываются в файл пачками по buffer_words.
+    В одном файле может быть сколько угодно партий подряд.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        board: Board,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        buffer_words: int = 4096,
+    ):
+        if board.size * board.size > MAX_CELLS:
+            raise ValueError(f"Board {board.size}x{board.size} is too large to record")
+
+        self.path = path
+        self.board = board
+        self.keyframe_interval = keyframe_interval
+        self.buffer_words = buffer_words
+
+        self.moves = 0
+        self.games = 0
+        self.bytes_written = 0
+
+        self._buffer = array("H")
+        self._file = open(path, "wb")
+        self._write_header()
+
+        board.recorder = self
+
+    def attach(self, board: Board) -> None:
+        """
+        Переключает запись на другое поле с теми же настройками
+        (например, раннер создаёт новое поле на каждую партию).
+        """
+        if board.size != self.board.size:
+            raise ValueError("Recorder is bound to a different board size")
+        if self.board.recorder is self:
+            self.board.recorder = None
+        self.board = board
+        board.recorder = self
+
+    def _write_header(self) -> None:
+        board = self.board
+        meta = json.dumps({
+            "size": board.size,
+            "target_value": board.target_value,
+            "new_tile_values": list(board.new_tile_values),
+            "new_tile_probabilities": list(board.new_tile_probabilities),
+            "keyframe_interval": self.keyframe_interval,
+        }).encode("utf-8")
+        data = _HEADER.pack(MAGIC, VERSION, len(meta)) + meta
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    # ---------- Вызовы из Board ---------- #
+
+    def record_reset(self, board: Board) -> None:
+        self._buffer.append(KIND_GAME << 14)
+        self.moves = 0
+        self.games += 1
+
+    def record_spawn(self, board: Board) -> None:
+        index, value = board.last_spawn
+        self._buffer.append(_spawn_word(KIND_SPAWN, index, value))
+
+    def record_move(self, board: Board, direction: str) -> None:
+        index, value = board.last_spawn
+        self._buffer.append(
+            _spawn_word(KIND_MOVE, index, value, DIRECTIONS.index(direction))
+        )
+        self.moves += 1
+
+        if self.moves % self.keyframe_interval == 0:
+            self._write_keyframe(board)
+
+        if len(self._buffer) >= self.buffer_words:
+            self.flush()
+
+    def record_position(self, board: Board, moves: int) -> None:
+        """
+        Позиция сменилась не ходом, а переходом по истории (undo/redo):
+        пишем ключевой кадр с новым номером хода. Реплеер загружает его
+        и отбрасывает ветку, которая шла после этого хода.
+        """
+        self.moves = moves
+        self._write_keyframe(board)
+
+    def _write_keyframe(self, board: Board) -> None:
+        cells = bytearray(
+            value.bit_length() - 1 if value else 0
+            for row in board.grid
+            for value in row
+        )
+        if len(cells) % 2:
+            cells.append(0)
+
+        head = array("H")
+        head.frombytes(struct.pack("<IQ", self.moves, board.score))
+        body = array("H")
+        body.frombytes(bytes(cells))
+        if sys.byteorder == "big":
+            head.byteswap()
+            body.byteswap()
+
+        self._buffer.append(KIND_KEYFRAME << 14)
+        self._buffer.extend(head)
+        self._buffer.extend(body)
+
+    # ---------- Сброс на диск ---------- #
+
+    def flush(self) -> None:
+        if self._buffer:
+            data = _to_disk(self._buffer)
+            self._file.write(data)
+            self.bytes_written += len(data)
+            del self._buffer[:]
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        if self.board.recorder is self:
+            self.board.recorder = None
+
+    def __enter__(self) -> "GameRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _GameIndex:
+    """Где в потоке лежит партия и её ключевые кадры."""
+
+    __slots__ = ("start", "end", "moves", "keyframe_moves", "keyframe_offsets")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.end = start
+        self.moves = 0
+        self.keyframe_moves: List[int] = []
+        self.keyframe_offsets: List[int] = []
+
+
+class GameReplay:
+    """
+    Чтение файла GameRecorder.
+
+    При открытии поток один раз просматривается и строится индекс партий
+    и ключевых кадров. board_at(game, move) восстанавливает позицию после
+    хода move с ближайшего ключевого кадра, positions() проигрывает партию
+    целиком. Оборванный хвост файла (сбой при записи) отбрасывается.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, meta_length = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a game recording")
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version: {version}")
+
+        start = _HEADER.size
+        self.meta = json.loads(data[start:start + meta_length].decode("utf-8"))
+        self.size: int = self.meta["size"]
+
+        body = data[start + meta_length:]
+        self.words = array("H")
+        self.words.frombytes(body[:len(body) // 2 * 2])
+        if sys.byteorder == "big":
+            self.words.byteswap()
+
+        self.games: List[_GameIndex] = []
+        self._scan()
+
+    def _scan(self) -> None:
+        words = self.words
+        count = len(words)
+        keyframe_length = _keyframe_words(self.size)
+        game: Optional[_GameIndex] = None
+        i = 0
+
+        while i < count:
+            kind = words[i] >> 14
+            if kind == KIND_GAME:
+                game = _GameIndex(i + 1)
+                self.games.append(game)
+            elif game is None:
+                raise ValueError("Recording does not start with a game marker")
+            elif kind == KIND_MOVE:
+                game.moves += 1
+            elif kind == KIND_KEYFRAME:
+                if i + 1 + keyframe_length > count:
+                    break  # кадр оборван
+                moves = self._keyframe_move(i)
+                # Кадр после undo: более поздние кадры -- отменённая ветка
+                k = bisect_left(game.keyframe_moves, moves)
+                del game.keyframe_moves[k:]
+                del game.keyframe_offsets[k:]
+                game.keyframe_moves.append(moves)
+                game.keyframe_offsets.append(i)
+                game.moves = moves
+                i += keyframe_length
+            i += 1
+            game.end = min(i, count)
+
+    # ---------- Восстановление позиций ---------- #
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def move_count(self, game: int = 0) -> int:
+        return self.games[game].moves
+
+    def new_board(self) -> Board:
+        meta = self.meta
+        return Board(
+            size=self.size,
+            target_value=meta["target_value"],
+            new_tile_values=meta["new_tile_values"],
+            new_tile_probabilities=meta["new_tile_probabilities"],
+        )
+
+    def board_at(self, game: int = 0, move: Optional[int] = None) -> Board:
+        """Поле после хода move партии game (None -- конец партии)."""
+        index = self.games[game]
+        if move is None:
+            move = index.moves
+        if not 0 <= move <= index.moves:
+            raise IndexError(f"Move {move} out of range 0..{index.moves}")
+
+        board = self.new_board()
+        offset, done = index.start, 0
+
+        k = bisect_right(index.keyframe_moves, move) - 1
+        if k >= 0:
+            offset = self._load_keyframe(board, index.keyframe_offsets[k])
+            done = index.keyframe_moves[k]
+        else:
+            board.grid = [[0] * self.size for _ in range(self.size)]
+
+        for _ in self._play(board, offset, index.end, done, target=move):
+            pass
+        return board
+
+    def positions(self, game: int = 0) -> Iterator[Tuple[int, Board]]:
+        """
+        Проигрывает партию: (номер хода, поле) после стартовых плиток,
+        после каждого хода и после каждого undo/redo.
+        Поле одно и то же, меняется по месту.
+        """
+        index = self.games[game]
+        board = self.new_board()
+        board.grid = [[0] * self.size for _ in range(self.size)]
+
+        for done in self._play(board, index.start, index.end, 0):
+            yield done, board
+
+    def moves(self, game: int = 0) -> Iterator[str]:
+        """Направления ходов партии в порядке записи (включая отменённые)."""
+        index = self.games[game]
+        words = self.words
+        keyframe_length = _keyframe_words(self.size)
+        i = index.start
+        while i < index.end:
+            kind = words[i] >> 14
+            if kind == KIND_MOVE:
+                yield DIRECTIONS[words[i] & 0b11]
+            elif kind == KIND_KEYFRAME:
+                i += keyframe_length
+            i += 1
+
+    def _play(self, board: Board, offset: int, end: int, move: int,
+              target: Optional[int] = None) -> Iterator[int]:
+        """
+        Применяет к board записи с offset (board -- позиция после хода move)
+        до конца партии или до позиции после хода target.
+        Отдаёт номер хода после стартовых плиток, после каждого хода
+        и после каждого перехода по истории (undo/redo).
+        """
+        words = self.words
+        size = self.size
+        keyframe_length = _keyframe_words(size)
+        started = False
+
+        while offset < end:
+            word = words[offset]
+            kind = word >> 14
+
+            if kind == KIND_KEYFRAME:
+                # Обычный кадр совпадает с текущим полем; кадр после
+                # undo/redo переставляет позицию
+                moves = self._keyframe_move(offset)
+                if moves != move:
+                    if move == target:
+                        return
+                    self._load_keyframe(board, offset)
+                    move = moves
+                    yield move
+                offset += 1 + keyframe_length
+                continue
+
+            if kind == KIND_MOVE:
+                if not started:
+                    started = True
+                    yield move
+                if move == target:
+                    return
+                _, gained = board._apply_move(DIRECTIONS[word & 0b11])
+                board.score += gained
+
+            cell = (word >> 6) & 0xFF
+            board._place_tile(cell // size, cell % size, 1 << ((word >> 2) & 0xF))
+            offset += 1
+
+            if kind == KIND_MOVE:
+                move += 1
+                yield move
+
+        if not started:
+            yield move
+
+    def _keyframe_move(self, offset: int) -> int:
+        """Номер хода из ключевого кадра по смещению его метки."""
+        low, high = self.words[offset + 1], self.words[offset + 2]
+        if sys.byteorder == "big":
+            low, high = _swap16(low), _swap16(high)
+        return low | (high << 16)
+
+    def _load_keyframe(self, board: Board, offset: int) -> int:
+        """Ставит поле из ключевого кадра; возвращает смещение за ним."""
+        size = self.size
+        head = self.words[offset + 1:offset + 1 + KEYFRAME_HEAD]
+        body = self.words[offset + 1 + KEYFRAME_HEAD:offset + 1 + _keyframe_words(size)]
+        if sys.byteorder == "big":
+            head.byteswap()
+            body.byteswap()
+
+        _, score = struct.unpack("<IQ", head.tobytes())
+        cells = body.tobytes()
+        board.grid = [
+            [1 << e if e else 0 for e in cells[r * size:(r + 1) * size]]
+            for r in range(size)
+        ]
+        board.score = score
+        return offset + 1 + _keyframe_words(size)
+
+
+if __name__ == "__main__":
+    # python -m src.game.recording games.rec [game] [move]
+    replay = GameReplay(sys.argv[1])
+    game_number = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    move_number = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    print(f"{len(replay)} games, {replay.size}x{replay.size}")
+    position = replay.board_at(game_number, move_number)
+    print(f"game {game_number}, score {position.score}")
+    for row in position.grid:
+        print(" ".join(f"{value:>5}" for value in row))
@@ -0,0 +1,299 @@
+import os
+import sys
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+# =====================
+# Таблицы переходов строк
+# =====================
+#
+# Строка из n клеток кодируется целым числом: каждая клетка занимает 4 бита
+# и хранит показатель степени плитки (0 -- пусто, 1 -- 2, ..., 15 -- 32768),
+# самая левая клетка -- младший ниббл. Для каждого такого кода таблица хранит
+# результат сдвига влево, результат сдвига вправо и прирост очков.
+# Прирост очков одинаков для обоих направлений: слияния происходят внутри
+# серий равных плиток, а число пар в серии от направления не зависит.
+#
+# Если при слиянии получилась бы плитка больше 32768, её нельзя закодировать
+# в 4 бита -- такие строки помечены значением -1 и обрабатываются медленным
+# путём (см. Board._apply_move).
+
+SUPPORTED_SIZES = (3, 4, 5)
+MAX_EXPONENT = 15
+NO_RESULT = -1
+
+DEFAULT_CACHE_DIR = ".cache"
+
+_CACHE_MAGIC = b"2048ROWT"
+_CACHE_VERSION = 1
+
+# Значение плитки -> показатель степени и обратно
+EXPONENTS: Dict[int, int] = {0: 0}
+EXPONENTS.update({1 << e: e for e in range(1, MAX_EXPONENT + 1)})
+POWERS: Tuple[int, ...] = (0,) + tuple(1 << e for e in range(1, MAX_EXPONENT + 1))
+
+
+def encode_row(values) -> int:
+    """
+    Кодирует строку значений плиток.
+    Бросает KeyError, если значение не помещается в 4 бита.
+    """
+    code = 0
+    shift = 0
+    for value in values:
+        code |= EXPONENTS[value] << shift
+        shift += 4
+    return code
+
+
+class RowTable:
+    """
+    Таблицы переходов для строк длины size.
+    Хранятся в array('i'), чтобы 16^size записей занимали минимум памяти.
+    """
+
+    def __init__(self, size: int, left: array, right: array, score: array):
+        self.size = size
+        self.left = left
+        self.right = right
+        self.score = score
+
+        # Статистика для отчёта
+        self.build_seconds = 0.0
+        self.source = "built"
+
+        self._shifts = tuple(4 * i for i in range(size))
+
+    @property
+    def nbytes(self) -> int:
+        """Память, занятая таблицами (байты)."""
+        return sum(t.itemsize * len(t) for t in (self.left, self.right, self.score))
+
+    def decode(self, code: int) -> List[int]:
+        """Раскодирует строку обратно в список значений плиток."""
+        return [POWERS[(code >> s) & 0xF] for s in self._shifts]
+
+    # ---------- Построение ---------- #
+
+    @classmethod
+    def build(cls, size: int) -> "RowTable":
+        count = 16 ** size
+        left = array("i", bytes(4 * count))
+        right = array("i", bytes(4 * count))
+        score = array("i", bytes(4 * count))
+
+        for code, result, gained in _sweep(size, reverse=False):
+            left[code] = result
+            score[code] = gained
+        for code, result, _ in _sweep(size, reverse=True):
+            right[code] = result
+
+        return cls(size, left, right, score)
+
+    # ---------- Кэш на диске ---------- #
+
+    @staticmethod
+    def cache_path(size: int, cache_dir: str) -> str:
+        return os.path.join(cache_dir, f"row_table_{size}.bin")
+
+    def save(self, path: str) -> None:
+        """Атомарно сохраняет таблицы в файл (temp + rename)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_CACHE_MAGIC)
+            f.write(bytes([_CACHE_VERSION, self.size, self.left.itemsize]))
+            f.write(b"\0" if sys.byteorder == "little" else b"\1")
+            for table in (self.left, self.right, self.score):
+                table.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, size: int) -> Optional["RowTable"]:
+        """Загружает таблицы из файла; None, если файл не подходит."""
+        itemsize = array("i").itemsize
+        count = 16 ** size
+        expected = len(_CACHE_MAGIC) + 4 + 3 * itemsize * count
+
+        try:
+            if os.path.getsize(path) != expected:
+                return None
+            with open(path, "rb") as f:
+                header = f.read(len(_CACHE_MAGIC) + 4)
+                byteorder = b"\0" if sys.byteorder == "little" else b"\1"
+                if header != _CACHE_MAGIC + bytes([_CACHE_VERSION, size, itemsize]) + byteorder:
+                    return None
+
+                tables = []
+                for _ in range(3):
+                    table = array("i")
+                    table.fromfile(f, count)
+                    tables.append(table)
+        except (OSError, EOFError):
+            return None
+
+        return cls(size, *tables)
+
+
+def _sweep(size: int, reverse: bool):
+    """
+    Перебирает все строки длины size, наращивая их по одной клетке
+    в направлении хода (влево -- с клетки 0, вправо -- с последней).
+    Состояние префикса: (код строки, код результата, длина результата,
+    последняя плитка результата, можно ли с ней ещё слить, очки).
+    Так каждая строка обрабатывается за O(1), а не слиянием целого списка.
+    """
+    states = [(0, 0, 0, 0, False, 0)]
+
+    for k in range(size):
+        cell_shift = 4 * (size - 1 - k) if reverse else 4 * k
+        last_cell = k == size - 1
+        layer = []
+        append = layer.append
+
+        for code, result, length, last, mergeable, gained in states:
+            append((code, result, length, last, mergeable, gained))
+
+            for e in range(1, MAX_EXPONENT + 1):
+                new_code = code | (e << cell_shift)
+
+                if mergeable and last == e:
+                    # Сливаем с последней плиткой результата: e -> e + 1
+                    if e == MAX_EXPONENT or result == NO_RESULT:
+                        new_result = NO_RESULT
+                    else:
+                        pos = size - length if reverse else length - 1
+                        new_result = result + (1 << (4 * pos))
+                    append((new_code, new_result, length, e + 1, False, gained + (2 << e)))
+                else:
+                    pos = size - 1 - length if reverse else length
+                    new_result = result if result == NO_RESULT else result | (e << (4 * pos))
+                    append((new_code, new_result, length + 1, e, True, gained))
+
+        if last_cell:
+            for code, result, _, _, _, gained in layer:
+                yield code, result, gained
+            return
+        states = layer
+
+
+# =====================
+# Реестр таблиц (по одной на размер, на весь процесс)
+# =====================
+
+_TABLES: Dict[int, RowTable] = {}
+
+# Построение идёт под замком: фоновое (prefetch_row_table) и синхронное
+# (get_row_table) не строят одну таблицу дважды, синхронное ждёт фоновое.
+# Список фоновых построений -- под своим замком, который держится мгновенно:
+# prefetch_row_table() не ждёт построения
+_BUILD_LOCK = threading.Lock()
+_PENDING_LOCK = threading.Lock()
+_PENDING: Dict[int, threading.Thread] = {}
+
+
+def _reset_after_fork() -> None:
+    # Дочерний процесс (пул доигрываний) не наследует поток построения,
+    # а замок мог быть захвачен в момент fork -- начинаем с чистого
+    global _BUILD_LOCK, _PENDING_LOCK
+    _BUILD_LOCK = threading.Lock()
+    _PENDING_LOCK = threading.Lock()
+    _PENDING.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_row_table(size: int, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> RowTable:
+    """
+    Возвращает таблицу для строк длины size.
+    Строится один раз на процесс; при cache_dir != None сначала ищется
+    файл кэша, а построенная таблица сохраняется туда. Если таблицу уже
+    строит фоновый поток, вызов дожидается его.
+    """
+    if size not in SUPPORTED_SIZES:
+        raise ValueError(f"Row tables are not available for size {size}")
+
+    table = _TABLES.get(size)
+    if table is not None:
+        return table
+
+    with _BUILD_LOCK:
+        table = _TABLES.get(size)
+        if table is None:
+            table = _load_or_build(size, cache_dir)
+            _TABLES[size] = table
+    return table
+
+
+def prefetch_row_table(size: int, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Optional[RowTable]:
+    """
+    Готовая таблица или None. Если таблицы ещё нет, она загружается или
+    строится в фоновом потоке: таблица 5x5 без кэша строится секунды,
+    и Board не должен ждать её в конструкторе (выбор 5x5 в настройках).
+    Пока таблицы нет, Board ходит медленным путём, результат тот же.
+    """
+    table = _TABLES.get(size)
+    if table is not None or size not in SUPPORTED_SIZES:
+        return table
+
+    with _PENDING_LOCK:
+        if size not in _PENDING and size not in _TABLES:
+            thread = threading.Thread(
+                target=get_row_table, args=(size, cache_dir),
+                name=f"row-table-{size}", daemon=True,
+            )
+            _PENDING[size] = thread
+            thread.start()
+    return _TABLES.get(size)
+
+
+def _load_or_build(size: int, cache_dir: Optional[str]) -> RowTable:
+    start = time.perf_counter()
+    path = RowTable.cache_path(size, cache_dir) if cache_dir else None
+
+    table = RowTable.load(path, size) if path else None
+    if table is not None:
+        table.source = "cache"
+    else:
+        table = RowTable.build(size)
+        if path:
+            try:
+                table.save(path)
+            except OSError:
+                pass  # кэш -- только ускорение, без него всё работает
+
+    table.build_seconds = time.perf_counter() - start
+    return table
+
+
+def report() -> List[dict]:
+    """Время построения/загрузки и память по уже созданным таблицам."""
+    return [
+        {
+            "size": size,
+            "entries": len(table.left),
+            "source": table.source,
+            "seconds": round(table.build_seconds, 4),
+            "bytes": table.nbytes,
+        }
+        for size, table in sorted(_TABLES.items())
+    ]
+
+
+if __name__ == "__main__":
+    # python -m src.game.row_tables [--no-cache]
+    cache = None if "--no-cache" in sys.argv else DEFAULT_CACHE_DIR
+    for board_size in SUPPORTED_SIZES:
+        get_row_table(board_size, cache_dir=cache)
+
+    for entry in report():
+        print(
+            f"{entry['size']}x{entry['size']}: {entry['entries']} rows, "
+            f"{entry['source']} in {entry['seconds']:.3f}s, "
+            f"{entry['bytes'] / 1024 / 1024:.2f} MiB"
+        )
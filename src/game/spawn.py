@@ -0,0 +1,32 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Sequence, Tuple
+
+
+class SpawnSampler:
+    """
+    Выбор значения новой плитки по new_tile_values / new_tile_probabilities.
+
+    Кумулятивные вероятности считаются один раз при создании, а не на каждой
+    плитке (как делал random.choices с weights). Сам выбор -- бинарный поиск
+    равномерного числа u из [0, 1) по кумулятивному массиву, поэтому при
+    одинаковой последовательности u результат одинаков в любом процессе.
+    """
+
+    def __init__(self, values: Sequence[int], probabilities: Sequence[float]):
+        if len(values) != len(probabilities) or not values:
+            raise ValueError("new_tile_values and new_tile_probabilities must match")
+
+        total = float(sum(probabilities))
+        if total <= 0:
+            raise ValueError("new_tile_probabilities must sum to a positive value")
+
+        self.values: Tuple[int, ...] = tuple(values)
+        self.cumulative: Tuple[float, ...] = tuple(
+            p / total for p in accumulate(probabilities)
+        )
+        self._last = len(self.values) - 1
+
+    def pick(self, u: float) -> int:
+        """Значение плитки для равномерного u из [0, 1)."""
+        return self.values[min(bisect_right(self.cumulative, u), self._last)]
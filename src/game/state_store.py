@@ -0,0 +1,241 @@
+import mmap
+import os
+import struct
+from typing import Iterator, NamedTuple, Optional
+
+from src.game.board import Board
+
+
+# =====================
+# Архив позиций фиксированного формата
+# =====================
+#
+# Файл = заголовок (16 байт) + записи по 32 байта (little-endian):
+#   code_lo  uint64 -- младшие 64 бита упакованного поля (Board.pack)
+#   code_hi  uint64 -- старшие биты (нужны только для 5x5: 25 клеток * 4 бита)
+#   score    uint64
+#   game     uint32 -- номер партии
+#   move     uint32 -- номер хода в партии
+#
+# Записи одной длины: запись i лежит по смещению HEADER + i * RECORD, поэтому
+# доступ по индексу -- O(1), а срез отображается в NumPy без копирования.
+
+MAGIC = b"2048STAT"
+VERSION = 1
+_HEADER = struct.Struct("<8sHHI")
+_RECORD = struct.Struct("<QQQII")
+
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+
+# Упакованное поле должно поместиться в 128 бит
+MAX_SIZE = 5
+
+_LOW_MASK = (1 << 64) - 1
+
+
+class StateRecord(NamedTuple):
+    code: int
+    score: int
+    game: int
+    move: int
+
+
+def numpy_dtype():
+    """Тип записи для NumPy (numpy импортируется только здесь)."""
+    import numpy as np
+
+    return np.dtype([
+        ("code_lo", "<u8"),
+        ("code_hi", "<u8"),
+        ("score", "<u8"),
+        ("game", "<u4"),
+        ("move", "<u4"),
+    ])
+
+
+def _check_size(size: int) -> None:
+    if not 2 <= size <= MAX_SIZE:
+        raise ValueError(f"State store supports boards up to {MAX_SIZE}x{MAX_SIZE}")
+
+
+def _read_header(data, path: str) -> int:
+    magic, version, size, record_size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a state store")
+    if version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"Unsupported state store version: {version}")
+    return size
+
+
+class StateStoreWriter:
+    """
+    Дописывает позиции в архив. Записи копятся в буфере и уходят на диск
+    пачками по buffer_records. Если файл уже есть, запись продолжается
+    в его конец (размер поля должен совпадать).
+    """
+
+    def __init__(self, path: str, size: int, buffer_records: int = 4096):
+        _check_size(size)
+        self.path = path
+        self.size = size
+        self.buffer_records = buffer_records
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            with open(path, "rb") as f:
+                existing = _read_header(f.read(HEADER_SIZE), path)
+            if existing != size:
+                raise ValueError(f"{path} stores {existing}x{existing} boards")
+            self._file = open(path, "ab")
+            # Оборванная запись в конце (сбой при записи) отбрасывается
+            records = (os.path.getsize(path) - HEADER_SIZE) // RECORD_SIZE
+            self._file.truncate(HEADER_SIZE + records * RECORD_SIZE)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_HEADER.pack(MAGIC, VERSION, size, RECORD_SIZE))
+
+        self._buffer = bytearray(buffer_records * RECORD_SIZE)
+        self._pending = 0
+        self.written = 0
+
+    def append(self, board: Board, game: int, move: int) -> None:
+        """Позиция поля board (упаковывается через Board.pack)."""
+        if board.size != self.size:
+            raise ValueError("Board size does not match the store")
+        self.append_packed(board.pack(), board.score, game, move)
+
+    def append_packed(self, code: int, score: int, game: int, move: int) -> None:
+        _RECORD.pack_into(
+            self._buffer, self._pending * RECORD_SIZE,
+            code & _LOW_MASK, code >> 64, score, game, move,
+        )
+        self._pending += 1
+        if self._pending == self.buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write(memoryview(self._buffer)[:self._pending * RECORD_SIZE])
+            self.written += self._pending
+            self._pending = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "StateStoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class StateStore:
+    """
+    Чтение архива через mmap: файл не читается в память целиком,
+    страницы подгружаются ОС по мере обращения.
+
+    - store[i] -- запись по индексу за O(1);
+    - итерация идёт по memoryview отображения без копирования файла;
+    - to_numpy(start, stop) -- структурированный массив-представление
+      поверх отображения (тоже без копирования), exponents()/grids() --
+      поля среза как массивы (n, size, size).
+
+    Массивы из to_numpy() ссылаются на отображение: их нужно отпустить
+    до close() (или копировать через .copy()).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.size = _read_header(self._mm, path)
+        self._count = (len(self._mm) - HEADER_SIZE) // RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> StateRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("State index out of range")
+        lo, hi, score, game, move = _RECORD.unpack_from(
+            self._mm, HEADER_SIZE + index * RECORD_SIZE
+        )
+        return StateRecord(lo | (hi << 64), score, game, move)
+
+    def __iter__(self) -> Iterator[StateRecord]:
+        return self.iter_range(0, self._count)
+
+    def iter_range(self, start: int, stop: Optional[int] = None) -> Iterator[StateRecord]:
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return
+        view = memoryview(self._mm)[HEADER_SIZE + start * RECORD_SIZE:HEADER_SIZE + stop * RECORD_SIZE]
+        try:
+            for lo, hi, score, game, move in _RECORD.iter_unpack(view):
+                yield StateRecord(lo | (hi << 64), score, game, move)
+        finally:
+            view.release()
+
+    def board(self, index: int) -> Board:
+        """Позиция index как Board (правила -- по умолчанию)."""
+        record = self[index]
+        board = Board(size=self.size)
+        board.load_packed(record.code)
+        board.score = record.score
+        return board
+
+    # ---------- NumPy ---------- #
+
+    def to_numpy(self, start: int = 0, stop: Optional[int] = None):
+        """Записи [start, stop) как структурированный массив без копирования."""
+        import numpy as np
+
+        stop = self._count if stop is None else min(stop, self._count)
+        count = max(0, stop - start)
+        if count == 0:
+            return np.empty(0, dtype=numpy_dtype())
+        return np.frombuffer(
+            self._mm, dtype=numpy_dtype(), count=count,
+            offset=HEADER_SIZE + start * RECORD_SIZE,
+        )
+
+    def exponents(self, start: int = 0, stop: Optional[int] = None):
+        """Показатели плиток среза: uint8 (n, size, size)."""
+        import numpy as np
+
+        records = self.to_numpy(start, stop)
+        cells = self.size * self.size
+        out = np.empty((len(records), cells), dtype=np.uint8)
+        for i in range(cells):
+            word = records["code_lo"] if i < 16 else records["code_hi"]
+            shift = np.uint64(4 * (i % 16))
+            out[:, i] = (word >> shift) & np.uint64(0xF)
+        return out.reshape(-1, self.size, self.size)
+
+    def grids(self, start: int = 0, stop: Optional[int] = None):
+        """Значения плиток среза: int32 (n, size, size), 0 -- пусто."""
+        import numpy as np
+
+        e = self.exponents(start, stop).astype(np.int32)
+        return np.where(e > 0, np.left_shift(1, e), 0)
+
+    # ---------- Закрытие ---------- #
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            # Живы массивы из to_numpy(): отображение закроется вместе с ними
+            pass
+
+    def __enter__(self) -> "StateStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
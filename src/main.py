@@ -11,7 +11,22 @@ from engine.game_engine import GameEngine
 
 
 def main():
-    game = GameEngine()
+    # --cpu-report: при выходе напечатать CPU-время в режимах idle / active
+    # --profile[=файл.json]: пофазный профиль кадров (печать или JSON при выходе)
+    # --profile-overlay: то же + оверлей на экране (F3 -- скрыть/показать)
+    # --fullscreen: запуск в полноэкранном режиме (F11 -- переключить)
+    profile_path = None
+    for arg in sys.argv:
+        if arg.startswith("--profile="):
+            profile_path = arg.split("=", 1)[1]
+
+    game = GameEngine(
+        report_cpu="--cpu-report" in sys.argv,
+        profile="--profile" in sys.argv,
+        profile_path=profile_path,
+        profile_overlay="--profile-overlay" in sys.argv,
+        fullscreen="--fullscreen" in sys.argv,
+    )
     game.run()
 
 
@@ -0,0 +1,135 @@
+import importlib
+import random
+from typing import Callable, Dict, List
+
+from src.game.board import DIRECTIONS, Board
+from src.game.packed import check_move_size
+
+
+# =====================
+# Стратегии для безголовой симуляции
+# =====================
+#
+# Стратегия -- это функция (board, rng) -> список направлений в порядке
+# предпочтения. Раннер пробует их по очереди, пока ход не изменит поле,
+# поэтому стратегии не обязаны сами проверять допустимость хода.
+
+Policy = Callable[[Board, random.Random], List[str]]
+
+
+def random_policy(board: Board, rng: random.Random) -> List[str]:
+    """Случайный порядок направлений."""
+    order = list(DIRECTIONS)
+    rng.shuffle(order)
+    return order
+
+
+def corner_policy(board: Board, rng: random.Random) -> List[str]:
+    """Классическая "угловая" стратегия: держим крупные плитки внизу слева."""
+    return ["down", "left", "right", "up"]
+
+
+def greedy_policy(board: Board, rng: random.Random) -> List[str]:
+    """Направления по убыванию очков за ход (без учёта новой плитки)."""
+    # Поле не копируется: preview_moves() ничего не меняет
+    _, previews = board.preview_moves()
+    gains = {
+        direction: preview[1] if preview is not None else -1
+        for direction, preview in zip(DIRECTIONS, previews)
+    }
+
+    order = list(DIRECTIONS)
+    rng.shuffle(order)
+    order.sort(key=lambda d: gains[d], reverse=True)
+    return order
+
+
+_solvers: Dict[tuple, object] = {}
+
+
+def expectimax_policy(board: Board, rng: random.Random) -> List[str]:
+    """Ход от ExpectimaxSolver (один решатель на размер поля в процессе)."""
+    from src.ai.expectimax import ExpectimaxSolver
+
+    key = (board.size, tuple(board.new_tile_values), tuple(board.new_tile_probabilities))
+    solver = _solvers.get(key)
+    if solver is None:
+        solver = ExpectimaxSolver.from_board(board, max_depth=2)
+        _solvers[key] = solver
+
+    best = solver.best_move(board)
+    order = [d for d in DIRECTIONS if d != best]
+    return [best] + order if best else order
+
+
+def monte_carlo_policy(board: Board, rng: random.Random) -> List[str]:
+    """
+    Ход от MonteCarloAdvisor. Доигрывания идут в текущем процессе:
+    раннер сам раскладывает партии по пулу процессов.
+    """
+    from src.ai.monte_carlo import MonteCarloAdvisor
+
+    key = ("montecarlo", board.size, tuple(board.new_tile_values),
+           tuple(board.new_tile_probabilities))
+    advisor = _solvers.get(key)
+    if advisor is None:
+        advisor = MonteCarloAdvisor.from_board(
+            board, workers=0, time_limit=0.02, seed=rng.getrandbits(32)
+        )
+        _solvers[key] = advisor
+
+    best = advisor.best_move(board)
+    order = [d for d in DIRECTIONS if d != best]
+    return [best] + order if best else order
+
+
+def tablebase_policy(board: Board, rng: random.Random) -> List[str]:
+    """
+    Ход из точной таблицы 3x3 (src/ai/tablebase.py, путь по умолчанию).
+    Позиции, которых в таблице нет, играются жадно.
+    """
+    from src.ai.tablebase import DEFAULT_PATH, Tablebase
+
+    tablebase = _solvers.get("tablebase")
+    if tablebase is None:
+        tablebase = _solvers["tablebase"] = Tablebase(DEFAULT_PATH)
+
+    best = tablebase.best_move(board) if tablebase.matches(board) else None
+    if best is None:
+        return greedy_policy(board, rng)
+    return [best] + [d for d in DIRECTIONS if d != best]
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "corner": corner_policy,
+    "greedy": greedy_policy,
+    "expectimax": expectimax_policy,
+    "montecarlo": monte_carlo_policy,
+    "tablebase": tablebase_policy,
+}
+
+
+# Стратегии на упакованных полях (move_packed): только размеры с таблицами строк
+PACKED_POLICIES = ("expectimax", "montecarlo")
+
+
+def check_policy(name: str, size: int) -> None:
+    """ValueError, если стратегия name не играет на поле size x size."""
+    if name in PACKED_POLICIES:
+        check_move_size(size, f"Policy '{name}'")
+
+
+def load_policy(name: str) -> Policy:
+    """
+    Возвращает стратегию по имени из POLICIES
+    или по пути вида "package.module:function".
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+
+    if ":" not in name:
+        raise ValueError(f"Unknown policy: {name}")
+
+    module_name, attr = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
@@ -0,0 +1,306 @@
+"""
+Безголовый запуск множества партий без окна и без pygame.
+
+Пример:
+    python -m src.simulation.runner --games 1000 --workers 8 --policy corner \
+        --output results.jsonl
+
+Каждая партия -- одна строка JSON Lines (score, max_tile, moves, seconds...),
+в конце печатается сводка с games/sec и moves/sec.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Iterator, Optional
+
+from src.config.config_manager import ConfigManager
+from src.engine.metrics import MetricsCollector
+from src.game.board import create_board
+from src.game.recording import GameRecorder
+from src.game.state_store import MAX_SIZE as STATES_MAX_SIZE, StateStoreWriter
+from src.simulation.policies import check_policy, load_policy
+
+
+DEFAULT_CONFIG = "src/config/game_config.json"
+
+# Состояние процесса-воркера (заполняется в _init_worker)
+_worker_config: Optional[ConfigManager] = None
+_worker_options: dict = {}
+_worker_recorder: Optional[GameRecorder] = None
+_worker_states: Optional[StateStoreWriter] = None
+_worker_metrics: Optional[MetricsCollector] = None
+
+
+def _init_worker(config_path: str, options: dict) -> None:
+    """Загружает конфиг и стратегию один раз на процесс, а не на партию."""
+    global _worker_config, _worker_options, _worker_recorder, _worker_states, _worker_metrics
+    if _worker_recorder is not None:
+        _worker_recorder.close()
+        _worker_recorder = None
+    if _worker_states is not None:
+        _worker_states.close()
+        _worker_states = None
+    if _worker_metrics is not None:
+        _worker_metrics.close()
+        _worker_metrics = None
+    _worker_config = ConfigManager(config_path)
+    _worker_options = dict(options)
+    _worker_options["policy_fn"] = load_policy(options["policy"])
+
+
+def play_game(game_id: int) -> dict:
+    """Играет одну партию до конца (или до max_moves) и возвращает итоги."""
+    config = _worker_config
+    options = _worker_options
+    seed = options["seed"] + game_id
+
+    # У поля свой генератор, у стратегии -- свой: партия воспроизводима
+    # независимо от процесса и порядка партий
+    policy_rng = random.Random(seed ^ 0x5EED)
+    policy = options["policy_fn"]
+
+    board = create_board(
+        engine=options["engine"] or config.board_engine,
+        size=options["size"] or config.board_size,
+        target_value=config.target_value,
+        new_tile_values=config.new_tile_values,
+        new_tile_probabilities=config.new_tile_probabilities,
+        seed=seed,
+    )
+
+    recording = None
+    if options["record"]:
+        recorder = _get_recorder(board)
+        recording = [recorder.path, recorder.games]
+
+    states = _get_states(board.size) if options["states"] else None
+
+    metrics = _get_metrics() if options["metrics"] else None
+    if metrics is not None:
+        metrics.attach(board)
+
+    start = time.perf_counter()
+    board.reset(initial_tiles=config.initial_tiles)
+
+    moves = 0
+    won = False
+    lost = not board.can_move()
+    if states is not None:
+        _store_state(states, board, game_id, moves)
+
+    while not lost and moves < options["max_moves"]:
+        for direction in policy(board, policy_rng):
+            moved, _, won_now, lost = board.move(direction)
+            if moved:
+                moves += 1
+                won = won or won_now
+                if states is not None:
+                    _store_state(states, board, game_id, moves)
+                break
+        else:
+            # Ни одно направление не сдвинуло поле -- партия окончена
+            lost = True
+
+    # Партия целиком на диске, даже если пул завершит воркер без закрытия
+    if recording is not None:
+        _worker_recorder.flush()
+    if states is not None:
+        states.flush()
+    if metrics is not None:
+        metrics.flush(wait=True)
+
+    return {
+        "game": game_id,
+        "seed": seed,
+        "score": board.score,
+        "max_tile": board.max_tile,
+        "moves": moves,
+        "won": won,
+        "seconds": round(time.perf_counter() - start, 6),
+        "recording": recording,
+    }
+
+
+def _get_recorder(board) -> GameRecorder:
+    """Один файл записи на процесс: партии воркера идут в него подряд."""
+    global _worker_recorder
+    if _worker_recorder is None:
+        directory = _worker_options["record"]
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"games-{os.getpid()}.rec")
+        _worker_recorder = GameRecorder(
+            path, board, keyframe_interval=_worker_config.keyframe_interval
+        )
+    else:
+        _worker_recorder.attach(board)
+    return _worker_recorder
+
+
+def _get_states(size: int) -> StateStoreWriter:
+    """Один архив позиций на процесс (см. state_store.py)."""
+    global _worker_states
+    if _worker_states is None:
+        directory = _worker_options["states"]
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"states-{size}x{size}-{os.getpid()}.bin")
+        _worker_states = StateStoreWriter(path, size)
+    return _worker_states
+
+
+def _get_metrics() -> MetricsCollector:
+    """Один файл метрик на процесс, счётчики копятся по всем его партиям."""
+    global _worker_metrics
+    if _worker_metrics is None:
+        directory = _worker_options["metrics"]
+        os.makedirs(directory, exist_ok=True)
+        _worker_metrics = MetricsCollector(
+            os.path.join(directory, f"metrics-{os.getpid()}.json"),
+            flush_interval=_worker_config.metrics_flush_interval,
+        )
+    return _worker_metrics
+
+
+def _store_state(states: StateStoreWriter, board, game_id: int, move: int) -> None:
+    try:
+        states.append(board, game_id, move)
+    except ValueError:
+        # Плитка больше 32768 не помещается в упакованное поле -- пропускаем
+        pass
+
+
+def check_options(config_path: str, policy: str, size: Optional[int], states: Optional[str]) -> None:
+    """
+    Сочетания опций, которые не работают на этом размере поля, -- сразу,
+    до запуска партий, а не ошибкой в воркере посреди прогона.
+    """
+    if size is None:
+        size = ConfigManager(config_path).board_size
+    check_policy(policy, size)
+    if states and size > STATES_MAX_SIZE:
+        raise ValueError(
+            f"--states supports boards up to {STATES_MAX_SIZE}x{STATES_MAX_SIZE}, not {size}x{size}"
+        )
+
+
+def run(
+    games: int,
+    workers: int,
+    config_path: str = DEFAULT_CONFIG,
+    policy: str = "random",
+    seed: int = 0,
+    size: Optional[int] = None,
+    engine: Optional[str] = None,
+    max_moves: int = 1_000_000,
+    chunksize: int = 4,
+    record: Optional[str] = None,
+    states: Optional[str] = None,
+    metrics: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Генератор результатов партий в порядке завершения.
+    workers <= 1 -- всё в текущем процессе (удобно для сравнения).
+    record -- каталог для записей партий (см. recording.py), по файлу на процесс.
+    states -- каталог для архивов позиций (см. state_store.py), тоже по процессу.
+    metrics -- каталог для сводок MetricsCollector (см. metrics.py), тоже по процессу.
+    Несовместимые с размером поля стратегия или states -- ValueError до первой партии.
+    """
+    check_options(config_path, policy, size, states)
+    options = {
+        "policy": policy,
+        "seed": seed,
+        "size": size,
+        "engine": engine,
+        "max_moves": max_moves,
+        "record": record,
+        "states": states,
+        "metrics": metrics,
+    }
+
+    if workers <= 1:
+        _init_worker(config_path, options)
+        for game_id in range(games):
+            yield play_game(game_id)
+        return
+
+    with multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(config_path, options),
+    ) as pool:
+        yield from pool.imap_unordered(play_game, range(games), chunksize=chunksize)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Headless 2048 simulation")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--policy", default="random",
+                        help="random | corner | greedy | expectimax | montecarlo | tablebase | module:function")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--size", type=int, default=None)
+    parser.add_argument("--engine", default=None, help="list | bitboard | array")
+    parser.add_argument("--max-moves", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--output", default="-", help="JSONL file or '-' for stdout")
+    parser.add_argument("--record", default=None, help="directory for binary game recordings")
+    parser.add_argument("--states", default=None, help="directory for memory-mapped position archives")
+    parser.add_argument("--metrics", default=None, help="directory for per-process metrics summaries")
+    args = parser.parse_args(argv)
+    try:
+        check_options(args.config, args.policy, args.size, args.states)
+    except ValueError as error:
+        parser.error(str(error))
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    total_games = 0
+    total_moves = 0
+    best_score = 0
+    start = time.perf_counter()
+
+    try:
+        for result in run(
+            games=args.games,
+            workers=args.workers,
+            config_path=args.config,
+            policy=args.policy,
+            seed=args.seed,
+            size=args.size,
+            engine=args.engine,
+            max_moves=args.max_moves,
+            chunksize=args.chunksize,
+            record=args.record,
+            states=args.states,
+            metrics=args.metrics,
+        ):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+            total_games += 1
+            total_moves += result["moves"]
+            best_score = max(best_score, result["score"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "games": total_games,
+        "moves": total_moves,
+        "workers": args.workers,
+        "seconds": round(elapsed, 3),
+        "games_per_sec": round(total_games / elapsed, 2) if elapsed else 0.0,
+        "moves_per_sec": round(total_moves / elapsed, 1) if elapsed else 0.0,
+        "best_score": best_score,
+    }
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
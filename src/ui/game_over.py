@@ -1,5 +1,9 @@
 import pygame
 
+from src.engine.fonts import FONTS
+from src.engine.layers import LAYERS, new_layer
+from src.engine.layout import Layout
+
 
 class GameOverScreen:
     """
@@ -12,37 +16,63 @@ class GameOverScreen:
     def __init__(self, screen):
         self.screen = screen
         self.w, self.h = screen.get_size()
+        # Координаты ниже -- в базовом окне 600x700, см. layout.py
+        self.layout = layout = Layout((self.w, self.h))
 
-        # Шрифты
-        self.font_title = pygame.font.SysFont("Arial", 60, bold=True)
-        self.font_button = pygame.font.SysFont("Arial", 36)
+        # Шрифты (общие на процесс, см. fonts.py)
+        self.title_size = layout.font(60)
+        self.button_size = layout.font(36)
+        self.font_title = FONTS.get("Arial", self.title_size, bold=True)
+        self.font_button = FONTS.get("Arial", self.button_size)
 
         # Кнопки
         self.buttons = {
-            "restart": pygame.Rect(self.w // 2 - 150, 350, 300, 70),
-            "menu": pygame.Rect(self.w // 2 - 150, 450, 300, 70),
+            "restart": layout.rect(150, 350, 300, 70),
+            "menu": layout.rect(150, 450, 300, 70),
         }
 
     def draw(self):
-        """Рисует затемнение + текст + кнопки"""
+        """
+        Рисует затемнение + текст + кнопки.
+        Оба слоя строятся один раз на размер окна и дальше только блитятся.
+        """
+        size = (self.w, self.h)
+        self.screen.blit(LAYERS.get("game_over_overlay", size, self._build_overlay), (0, 0))
+
+        content, pos = LAYERS.get("game_over_content", size, self._build_content)
+        self.screen.blit(content, pos)
 
+    def _build_overlay(self):
         # Тёмная прозрачная подложка
-        overlay = pygame.Surface((self.w, self.h))
+        overlay = new_layer((self.w, self.h))
         overlay.set_alpha(180)  # прозрачность
         overlay.fill((50, 50, 50))
-        self.screen.blit(overlay, (0, 0))
+        return overlay
+
+    def _build_content(self):
+        """
+        Текст и кнопки в прозрачном слое размером только с их область:
+        альфа-блит на всё окно заметно дороже.
+        """
+        title_surf = FONTS.label("Game Over", "Arial", self.title_size, (255, 255, 255), bold=True)
+        title_rect = title_surf.get_rect(center=self.layout.point(300, 200))
+        bounds = title_rect.unionall(list(self.buttons.values()))
+
+        layer = new_layer(bounds.size, alpha=True)
+        dx, dy = -bounds.left, -bounds.top
 
         # Текст "Game Over"
-        title_surf = self.font_title.render("Game Over", True, (255, 255, 255))
-        title_rect = title_surf.get_rect(center=(self.w // 2, 200))
-        self.screen.blit(title_surf, title_rect)
+        layer.blit(title_surf, title_rect.move(dx, dy))
 
         # Кнопки
         for key, rect in self.buttons.items():
-            pygame.draw.rect(self.screen, (187, 173, 160), rect, border_radius=8)
+            rect = rect.move(dx, dy)
+            pygame.draw.rect(layer, (187, 173, 160), rect, border_radius=self.layout.px(8))
             text_label = "Restart" if key == "restart" else "Menu"
-            text_surf = self.font_button.render(text_label, True, (255, 255, 255))
-            self.screen.blit(text_surf, text_surf.get_rect(center=rect.center))
+            text_surf = FONTS.label(text_label, "Arial", self.button_size, (255, 255, 255))
+            layer.blit(text_surf, text_surf.get_rect(center=rect.center))
+
+        return layer, bounds.topleft
 
     def handle_mouse(self, pos):
         """Возвращает действие, если кнопка нажата"""
@@ -1,6 +1,10 @@
 import json
 import os
-import pygame
+
+from src.config.persistence import write_json_atomic
+from src.engine.fonts import FONTS
+from src.engine.layout import Layout
+from src.engine.surface_cache import TextCache
 
 
 class HUD:
@@ -8,20 +12,47 @@ class HUD:
     Класс HUD отвечает за отображение:
     - текущего счёта
     - лучшего результата (Best Score)
+    - подсказки хода (hint, пустая строка -- не показывать)
     """
 
-    def __init__(self, screen, board, highscore_file="highscore.json"):
+    def __init__(self, screen, board, highscore_file="highscore.json", persistence=None):
         self.screen = screen
         self.board = board
         self.highscore_file = highscore_file
 
-        # Шрифты
-        self.font_title = pygame.font.SysFont("Arial", 36, bold=True)
-        self.font_score = pygame.font.SysFont("Arial", 28, bold=True)
+        # PersistenceService: если задан, рекорд пишется в фоне, а не в кадре
+        self.persistence = persistence
+
+        # Текст подсказки задаёт GameEngine
+        self.hint = ""
+
+        # Шрифты и позиции строк -- по размеру окна
+        self.set_layout(screen, Layout(screen.get_size()))
 
         # Загружаем best score
         self.best_score = self.load_best_score()
 
+    def set_layout(self, screen, layout: Layout) -> None:
+        """Новый экран/размер окна (Renderer.resize): шрифты и позиции заново."""
+        self.screen = screen
+
+        # Шрифты (общие на процесс, см. fonts.py)
+        self.font_title = FONTS.get("Arial", layout.font(36), bold=True)
+        self.font_score = FONTS.get("Arial", layout.font(28), bold=True)
+
+        # Строки счёта перерисовываются только при изменении значения
+        self.text_cache = TextCache(self.font_score, (0, 0, 0))
+
+        # Позиции строк в окне (в базовом окне 600x700 -- как раньше)
+        self.positions = {
+            "score": layout.point(50, 40),
+            "best": layout.point(350, 40),
+            "hint": layout.point(50, 90),
+        }
+
+        # Что и где нарисовано в прошлый раз (для draw_dirty)
+        self._drawn = {}
+
     # =====================================================
     # Работа с high score (сохранение JSON файла)
     # =====================================================
@@ -49,8 +80,11 @@ class HUD:
         """
         if self.board.score > self.best_score:
             self.best_score = self.board.score
-            with open(self.highscore_file, "w", encoding="utf-8") as f:
-                json.dump({"best_score": self.best_score}, f, indent=4)
+            data = {"best_score": self.best_score}
+            if self.persistence is not None:
+                self.persistence.save_json(self.highscore_file, data)
+            else:
+                write_json_atomic(self.highscore_file, data)
 
     # =====================================================
     # Отрисовка HUD
@@ -62,20 +96,48 @@ class HUD:
         """
 
         # Score
-        score_text = self.font_score.render(
-            f"Score: {self.board.score}",
-            True,
-            (0, 0, 0)
-        )
-        self.screen.blit(score_text, (50, 40))
+        score_text = self.text_cache.render("score", f"Score: {self.board.score}")
+        self.screen.blit(score_text, self.positions["score"])
 
         # Best Score
-        best_text = self.font_score.render(
-            f"Best: {self.best_score}",
-            True,
-            (0, 0, 0)
-        )
-        self.screen.blit(best_text, (350, 40))
+        best_text = self.text_cache.render("best", f"Best: {self.best_score}")
+        self.screen.blit(best_text, self.positions["best"])
+
+        # Подсказка
+        if self.hint:
+            self.screen.blit(self.text_cache.render("hint", self.hint), self.positions["hint"])
 
         # После каждого кадра проверяем рекорд
-        self.save_best_score()
\ No newline at end of file
+        self.save_best_score()
+
+    def draw_dirty(self, background, force=False):
+        """
+        Рисует только изменившиеся строки поверх фона background.
+        Возвращает прямоугольники, которые нужно обновить на экране.
+        """
+        # Рекорд обновляем до отрисовки, чтобы строка Best не отставала на кадр
+        self.save_best_score()
+
+        rects = []
+        lines = (
+            ("score", f"Score: {self.board.score}"),
+            ("best", f"Best: {self.best_score}"),
+            ("hint", self.hint),
+        )
+
+        for slot, text in lines:
+            pos = self.positions[slot]
+            surf = self.text_cache.render(slot, text)
+            previous = self._drawn.get(slot)
+            if not force and previous is not None and previous[0] is surf:
+                continue
+
+            rect = surf.get_rect(topleft=pos)
+            area = rect.union(previous[1]) if previous is not None else rect
+            self.screen.fill(background, area)
+            self.screen.blit(surf, rect)
+
+            self._drawn[slot] = (surf, rect)
+            rects.append(area)
+
+        return rects
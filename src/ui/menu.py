@@ -1,5 +1,9 @@
 import pygame
 
+from src.engine.fonts import FONTS
+from src.engine.layers import LAYERS, new_layer
+from src.engine.layout import Layout
+
 
 class Menu:
     """
@@ -12,30 +16,42 @@ class Menu:
     def __init__(self, screen):
         self.screen = screen
         self.width, self.height = screen.get_size()
+        # Координаты ниже -- в базовом окне 600x700, см. layout.py
+        self.layout = layout = Layout((self.width, self.height))
 
-        # Шрифты
-        self.font_title = pygame.font.SysFont("Arial", 60, bold=True)
-        self.font_button = pygame.font.SysFont("Arial", 36)
+        # Шрифты (общие на процесс, см. fonts.py)
+        self.title_size = layout.font(60)
+        self.button_size = layout.font(36)
+        self.font_title = FONTS.get("Arial", self.title_size, bold=True)
+        self.font_button = FONTS.get("Arial", self.button_size)
 
         # Кнопки меню
         self.buttons = {
-            "start": pygame.Rect(self.width // 2 - 150, 280, 300, 70),
-            "settings": pygame.Rect(self.width // 2 - 150, 380, 300, 70),
-            "quit": pygame.Rect(self.width // 2 - 150, 480, 300, 70)
+            "start": layout.rect(150, 280, 300, 70),
+            "settings": layout.rect(150, 380, 300, 70),
+            "quit": layout.rect(150, 480, 300, 70)
         }
 
     def draw(self):
-        """Отрисовка экрана меню."""
-        self.screen.fill((250, 248, 239))
+        """
+        Отрисовка экрана меню.
+        Меню полностью статично: рисуется один раз в слой и блитится.
+        """
+        layer = LAYERS.get("menu", (self.width, self.height), self._build_layer)
+        self.screen.blit(layer, (0, 0))
+
+    def _build_layer(self):
+        layer = new_layer((self.width, self.height))
+        layer.fill((250, 248, 239))
 
         # Заголовок
-        title_surf = self.font_title.render("2048", True, (60, 58, 50))
-        title_rect = title_surf.get_rect(center=(self.width // 2, 150))
-        self.screen.blit(title_surf, title_rect)
+        title_surf = FONTS.label("2048", "Arial", self.title_size, (60, 58, 50), bold=True)
+        title_rect = title_surf.get_rect(center=self.layout.point(300, 150))
+        layer.blit(title_surf, title_rect)
 
         # Отрисовка кнопок
         for key, rect in self.buttons.items():
-            pygame.draw.rect(self.screen, (187, 173, 160), rect, border_radius=8)
+            pygame.draw.rect(layer, (187, 173, 160), rect, border_radius=self.layout.px(8))
 
             # Названия кнопок
             if key == "start":
@@ -45,8 +61,10 @@ class Menu:
             else:
                 label = "Quit"
 
-            text_surf = self.font_button.render(label, True, (255, 255, 255))
-            self.screen.blit(text_surf, text_surf.get_rect(center=rect.center))
+            text_surf = FONTS.label(label, "Arial", self.button_size, (255, 255, 255))
+            layer.blit(text_surf, text_surf.get_rect(center=rect.center))
+
+        return layer
 
     def handle_mouse(self, pos):
         """Проверка нажатий мыши по кнопкам."""
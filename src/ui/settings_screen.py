@@ -1,5 +1,13 @@
 import pygame
 
+from src.engine.fonts import FONTS
+from src.engine.layers import LAYERS, new_layer
+from src.engine.layout import Layout
+
+
+# Размеры поля на экране настроек (от 6x6 -- движок "array", см. array_board.py)
+BOARD_SIZES = (3, 4, 5, 6, 8, 10, 12, 16)
+
 
 class SettingsScreen:
     """
@@ -12,66 +20,85 @@ class SettingsScreen:
         self.screen = screen
         self.settings = settings_manager
         self.w, self.h = screen.get_size()
-
-        self.font_title = pygame.font.SysFont("Arial", 48, bold=True)
-        self.font_option = pygame.font.SysFont("Arial", 32)
-        self.font_back = pygame.font.SysFont("Arial", 28)
-
-        # Кнопки выбора размера поля (3, 4, 5)
+        # Координаты ниже -- в базовом окне 600x700, см. layout.py
+        self.layout = layout = Layout((self.w, self.h))
+
+        # Шрифты (общие на процесс, см. fonts.py)
+        self.title_size = layout.font(48)
+        self.option_size = layout.font(32)
+        self.back_size = layout.font(28)
+        self.font_title = FONTS.get("Arial", self.title_size, bold=True)
+        self.font_option = FONTS.get("Arial", self.option_size)
+        self.font_back = FONTS.get("Arial", self.back_size)
+
+        # Кнопки выбора размера поля: один ряд по центру
+        button_w, spacing = 56, 8
+        left = 300 - (len(BOARD_SIZES) * (button_w + spacing) - spacing) // 2
         self.buttons_board = {
-            3: pygame.Rect(self.w // 2 - 150, 230, 90, 60),
-            4: pygame.Rect(self.w // 2 - 45, 230, 90, 60),
-            5: pygame.Rect(self.w // 2 + 60, 230, 90, 60),
+            size: layout.rect(left + i * (button_w + spacing), 230, button_w, 60)
+            for i, size in enumerate(BOARD_SIZES)
         }
 
         # Кнопки выбора темы
         self.buttons_theme = {
-            "light": pygame.Rect(self.w // 2 - 150, 330, 150, 60),
-            "dark": pygame.Rect(self.w // 2 + 10, 330, 150, 60),
+            "light": layout.rect(150, 330, 150, 60),
+            "dark": layout.rect(310, 330, 150, 60),
         }
 
         # Back Button
-        self.back_button = pygame.Rect(20, 20, 100, 40)
+        self.back_button = layout.rect(20, 20, 100, 40)
 
     def draw(self):
-        self.screen.fill((240, 235, 225))
+        # Экран зависит только от выбранных настроек -- они и есть ключ слоя
+        key = (self.w, self.h, self.settings.board_size, self.settings.theme)
+        layer = LAYERS.get("settings", key, self._build_layer)
+        self.screen.blit(layer, (0, 0))
+
+    def _build_layer(self):
+        layer = new_layer((self.w, self.h))
+        layer.fill((240, 235, 225))
+
+        layout = self.layout
+        radius = layout.px(8)
 
         # Заголовок
-        title = self.font_title.render("Settings", True, (60, 58, 50))
-        self.screen.blit(title, (self.w // 2 - title.get_width() // 2, 120))
+        title = FONTS.label("Settings", "Arial", self.title_size, (60, 58, 50), bold=True)
+        layer.blit(title, (self.w // 2 - title.get_width() // 2, layout.point(0, 120)[1]))
 
         # --- Board size label ---
-        board_label = self.font_option.render("Board Size:", True, (50, 50, 50))
-        self.screen.blit(board_label, (self.w // 2 - 110, 190))
+        board_label = FONTS.label("Board Size:", "Arial", self.option_size, (50, 50, 50))
+        layer.blit(board_label, layout.point(190, 190))
 
         # Board buttons
         for size, rect in self.buttons_board.items():
             color = (187, 173, 160)
             if self.settings.board_size == size:
                 color = (246, 124, 95)  # highlight
-            pygame.draw.rect(self.screen, color, rect, border_radius=8)
+            pygame.draw.rect(layer, color, rect, border_radius=radius)
 
-            text = self.font_option.render(str(size), True, (255, 255, 255))
-            self.screen.blit(text, text.get_rect(center=rect.center))
+            text = FONTS.label(str(size), "Arial", self.option_size, (255, 255, 255))
+            layer.blit(text, text.get_rect(center=rect.center))
 
         # --- Theme label ---
-        theme_label = self.font_option.render("Theme:", True, (50, 50, 50))
-        self.screen.blit(theme_label, (self.w // 2 - 60, 300))
+        theme_label = FONTS.label("Theme:", "Arial", self.option_size, (50, 50, 50))
+        layer.blit(theme_label, layout.point(240, 300))
 
         # Theme buttons
         for theme, rect in self.buttons_theme.items():
             color = (187, 173, 160)
             if self.settings.theme == theme:
                 color = (246, 124, 95)
-            pygame.draw.rect(self.screen, color, rect, border_radius=8)
+            pygame.draw.rect(layer, color, rect, border_radius=radius)
 
-            text = self.font_option.render(theme.capitalize(), True, (255, 255, 255))
-            self.screen.blit(text, text.get_rect(center=rect.center))
+            text = FONTS.label(theme.capitalize(), "Arial", self.option_size, (255, 255, 255))
+            layer.blit(text, text.get_rect(center=rect.center))
 
         # Back
-        pygame.draw.rect(self.screen, (120, 110, 100), self.back_button, border_radius=8)
-        text = self.font_back.render("Back", True, (255, 255, 255))
-        self.screen.blit(text, text.get_rect(center=self.back_button.center))
+        pygame.draw.rect(layer, (120, 110, 100), self.back_button, border_radius=radius)
+        text = FONTS.label("Back", "Arial", self.back_size, (255, 255, 255))
+        layer.blit(text, text.get_rect(center=self.back_button.center))
+
+        return layer
 
     def handle_mouse(self, pos):
         # change board size
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from src.ai.expectimax import ExpectimaxSolver
+from src.ai.monte_carlo import MonteCarloAdvisor, run_rollouts
+from src.game.board import Board
+from src.game.packed import pack_grid
+
+# Ходить можно только вправо: столбец без слияний у левого края
+ONLY_RIGHT = [[2, 0, 0, 0], [4, 0, 0, 0], [2, 0, 0, 0], [4, 0, 0, 0]]
+# Ходов нет
+LOST = [[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]]
+# Ходы -- влево и вправо (пара восьмёрок). После right новая плитка в (0, 0)
+# соседствует с 16 и 32 -- партия проиграна; после left слияние есть всегда
+LEFT_SURVIVES = [[8, 8, 2, 4], [32, 64, 128, 2], [2, 4, 8, 16], [4, 8, 16, 32]]
+
+
+def _board(seed, size=4):
+    board = Board(size=size, seed=seed)
+    board.reset(initial_tiles=2)
+    return board
+
+
+@pytest.mark.parametrize("time_limit", [0.02, 0.05])
+def test_monte_carlo_keeps_time_budget(time_limit):
+    advisor = MonteCarloAdvisor(size=4, time_limit=time_limit, seed=1)
+    for seed in range(5):
+        assert advisor.best_move(_board(seed)) is not None
+        # Перебор -- не больше одной партии на направление
+        assert advisor.last_seconds < 3 * time_limit
+        assert advisor.last_rollouts >= len(advisor.last_means)
+
+
+def test_expectimax_forced_and_lost_positions():
+    solver = ExpectimaxSolver(size=4, max_depth=2)
+    assert solver.best_move_packed(pack_grid(ONLY_RIGHT)) == "right"
+    assert solver.best_move_packed(pack_grid(LOST)) is None
+
+
+def test_expectimax_avoids_losing_move():
+    solver = ExpectimaxSolver(size=4, max_depth=2)
+    assert solver.best_move_packed(pack_grid(LEFT_SURVIVES)) == "left"
+
+
+def test_expectimax_is_deterministic():
+    boards = [_board(seed) for seed in range(5)]
+    first = [ExpectimaxSolver(size=4, max_depth=2).best_move(b) for b in boards]
+    second = [ExpectimaxSolver(size=4, max_depth=2).best_move(b) for b in boards]
+    assert first == second
+    assert None not in first
+
+
+def test_monte_carlo_forced_and_lost_positions():
+    advisor = MonteCarloAdvisor(size=4, time_limit=0.02, seed=1)
+    assert advisor.best_move_packed(pack_grid(ONLY_RIGHT)) == "right"
+    # Единственный ход не доигрывается
+    assert advisor.last_rollouts == 0
+    assert advisor.best_move_packed(pack_grid(LOST)) is None
+
+
+def test_monte_carlo_avoids_losing_move():
+    advisor = MonteCarloAdvisor(size=4, time_limit=0.02, seed=1)
+    assert advisor.best_move_packed(pack_grid(LEFT_SURVIVES)) == "left"
+    # После right партия кончается сразу: среднее -- только очки слияния
+    assert advisor.last_means["right"] == 16
+
+
+def test_rollouts_are_seeded_and_respect_deadline():
+    task = (pack_grid(ONLY_RIGHT), 4, (1, 2), (0.9, 1.0), 20, 7, 1000, None)
+    total, played = run_rollouts(task)
+    assert played == 20
+    assert run_rollouts(task) == (total, played)
+    # Срок уже прошёл -- ни одной партии
+    assert run_rollouts(task[:7] + (time.time() - 1,)) == (0.0, 0)
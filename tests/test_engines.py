@@ -0,0 +1,210 @@
+import random
+
+import pytest
+
+from src.game.board import DIRECTIONS, Board, create_board, slide_line
+from src.game.row_tables import (
+    MAX_EXPONENT, NO_RESULT, POWERS, RowTable, encode_row, get_row_table,
+)
+
+
+def _play(board: Board, seed: int, moves: int = 300):
+    """Случайная партия: результаты каждого хода и поле после него."""
+    rng = random.Random(seed)
+    history = []
+    for _ in range(moves):
+        direction = rng.choice(DIRECTIONS)
+        result = board.move(direction)
+        history.append((direction, result, [row[:] for row in board.grid], board.score))
+        if result[3]:
+            break
+    return history
+
+
+def _same_state(a: Board, b: Board) -> None:
+    assert a.grid == b.grid
+    assert a.score == b.score
+    assert a.max_tile == b.max_tile
+    assert a.get_empty_cells() == b.get_empty_cells()
+    assert a.can_move() == b.can_move()
+    assert a.has_won() == b.has_won()
+    assert a.legal_moves() == b.legal_moves()
+    assert a.preview_moves() == b.preview_moves()
+
+
+@pytest.mark.parametrize("engine, size", [
+    ("bitboard", 4),
+    ("array", 6),
+    ("array", 8),
+    ("array", 16),
+])
+@pytest.mark.parametrize("track_slides", [False, True])
+def test_same_seed_same_game(engine, size, track_slides):
+    """Движки с одним seed играют одну и ту же партию, что и Board."""
+    for seed in range(5):
+        reference = Board(size=size, seed=seed)
+        board = create_board(engine, size=size, seed=seed)
+        assert type(board) is not Board
+        reference.track_slides = board.track_slides = track_slides
+
+        reference.reset()
+        board.reset()
+        _same_state(reference, board)
+        assert _play(reference, seed) == _play(board, seed)
+        _same_state(reference, board)
+
+
+def _big_pair_grid(direction: str):
+    """Поле 4x4 с парой 32768 в линии хода direction и парой поменьше."""
+    grid = [[0] * 4 for _ in range(4)]
+    if direction in ("left", "right"):
+        grid[1][0] = grid[1][1] = 32768
+        grid[3][2] = grid[3][3] = 2
+    else:
+        grid[0][2] = grid[1][2] = 32768
+        grid[2][0] = grid[3][0] = 4
+    return grid
+
+
+@pytest.mark.parametrize("direction", DIRECTIONS)
+@pytest.mark.parametrize("track_slides", [False, True])
+def test_bitboard_merges_32768_like_board(direction, track_slides):
+    """Слияние 32768 + 32768 даёт 65536, как в Board, и партия продолжается."""
+    reference = Board(size=4, seed=7)
+    board = create_board("bitboard", size=4, seed=7)
+    reference.track_slides = board.track_slides = track_slides
+    reference.grid = _big_pair_grid(direction)
+    board.grid = _big_pair_grid(direction)
+    _same_state(reference, board)
+
+    assert board.move(direction) == reference.move(direction)
+    assert board.max_tile == 65536
+    _same_state(reference, board)
+
+    # Дальше -- матрица списков; партия идёт так же, как в Board
+    assert _play(reference, 11, moves=100) == _play(board, 11, moves=100)
+    _same_state(reference, board)
+
+    # Новая партия возвращает поле в биты
+    board.reset()
+    reference.reset()
+    _same_state(reference, board)
+    assert board.pack() == board.bits
+
+
+def test_bitboard_accepts_large_grid():
+    """Поле с плиткой больше 32768 можно загрузить (undo, внешний код)."""
+    grid = [[65536, 2, 0, 0], [0, 0, 0, 0], [0, 0, 4, 0], [0, 0, 0, 0]]
+    reference = Board(size=4, seed=1)
+    board = create_board("bitboard", size=4, seed=1)
+    reference.grid = [row[:] for row in grid]
+    board.grid = [row[:] for row in grid]
+    _same_state(reference, board)
+    assert _play(reference, 3, moves=50) == _play(board, 3, moves=50)
+
+
+def _positions(size: int, seed: int, count: int):
+    """(поле, направление) из случайных партий Board: поле -- до хода."""
+    rng = random.Random(seed)
+    board = Board(size=size, seed=seed)
+    board.reset()
+    positions = []
+    while len(positions) < count:
+        direction = rng.choice(DIRECTIONS)
+        positions.append(([row[:] for row in board.grid], direction))
+        if board.move(direction)[3]:
+            board.reset()
+    return positions
+
+
+@pytest.mark.parametrize("size", [3, 4, 5, 6])
+def test_batch_board_moves_like_board(size):
+    """BatchBoard.move по каждому полю пакета делает то же, что Board.move."""
+    np = pytest.importorskip("numpy")
+    from src.game.batch_board import BatchBoard
+
+    positions = _positions(size, seed=size, count=400)
+    batch = BatchBoard(len(positions), size=size, seed=size)
+    batch.grids[:] = np.array([grid for grid, _ in positions])
+    moved, gained, won, _ = batch.move([direction for _, direction in positions])
+
+    for i, (grid, direction) in enumerate(positions):
+        board = Board(size=size)
+        board.grid = grid
+        result = board.move(direction)
+        assert (bool(moved[i]), int(gained[i]), bool(won[i])) == result[:3]
+        assert int(batch.scores[i]) == board.score
+
+        # Поле после хода совпадает, кроме новых плиток (у пакета свой генератор)
+        if result[0]:
+            index, _ = board.last_spawn
+            board.grid[index // size][index % size] = 0
+        after = batch.grids[i].tolist()
+        spawned = [(r, c) for r in range(size) for c in range(size)
+                   if after[r][c] != board.grid[r][c]]
+        assert len(spawned) == (1 if result[0] else 0)
+        for r, c in spawned:
+            assert board.grid[r][c] == 0 and after[r][c] in board.new_tile_values
+
+
+def _row_codes(size: int, seed: int, count: int):
+    """Все коды строк, если их не больше count, иначе случайная выборка."""
+    if 16 ** size <= count:
+        return range(16 ** size)
+    rng = random.Random(seed)
+    codes = [rng.randrange(16 ** size) for _ in range(count)]
+    # Пары 32768 (переполнение) и длинные серии равных плиток
+    for e in (MAX_EXPONENT, MAX_EXPONENT - 1, 1):
+        for start in range(size - 1):
+            codes.append((e << (4 * start)) | (e << (4 * (start + 1))))
+        codes.append(sum(e << (4 * k) for k in range(size)))
+    return codes
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_row_table_matches_slide_line(size):
+    """Таблица строк = slide_line; слияние в 65536 помечено NO_RESULT."""
+    table = get_row_table(size)
+    overflows = 0
+    for code in _row_codes(size, seed=size, count=20000):
+        line = table.decode(code)
+        for forward, results in ((True, table.left), (False, table.right)):
+            expected, gained, _ = slide_line(line, forward)
+            assert table.score[code] == gained
+            if max(expected) > POWERS[MAX_EXPONENT]:
+                assert results[code] == NO_RESULT
+                overflows += 1
+            else:
+                assert results[code] == encode_row(expected)
+    assert overflows
+
+
+def test_row_table_disk_cache(tmp_path):
+    """Кэш на диске читается обратно, чужой или битый файл -- None."""
+    table = RowTable.build(3)
+    path = RowTable.cache_path(3, str(tmp_path))
+    table.save(path)
+
+    loaded = RowTable.load(path, 3)
+    assert (loaded.left, loaded.right, loaded.score) == (table.left, table.right, table.score)
+    assert RowTable.load(path, 4) is None
+    assert RowTable.load(str(tmp_path / "missing.bin"), 3) is None
+
+    with open(path, "r+b") as f:
+        f.write(b"XXXX")
+    assert RowTable.load(path, 3) is None
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_board_without_table_plays_the_same(size):
+    """Пока таблица строится в фоне, Board ходит медленным путём -- так же."""
+    reference = Board(size=size, seed=size)
+    reference._row_table = get_row_table(size)
+    board = Board(size=size, seed=size)
+    board._row_table = None
+    board._table_pending = False
+
+    reference.reset()
+    board.reset()
+    assert _play(reference, size) == _play(board, size)
+    _same_state(reference, board)
@@ -0,0 +1,107 @@
+import random
+
+from src.game.board import DIRECTIONS, Board
+from src.game.history import MoveHistory
+
+
+def _state(board):
+    return [row[:] for row in board.grid], board.score
+
+
+def _play(board, history, rng, moves):
+    """Ходит случайно, запоминая позиции до ходов; возвращает их по порядку."""
+    positions = []
+    while len(positions) < moves:
+        before = _state(board)
+        snapshot = history.snapshot(board)
+        if board.move(rng.choice(DIRECTIONS))[0]:
+            history.push(snapshot)
+            positions.append(before)
+        if not board.can_move():
+            break
+    return positions
+
+
+def test_undo_redo_round_trip():
+    board = Board(size=4, seed=7)
+    board.reset(initial_tiles=2)
+    history = MoveHistory()
+    positions = _play(board, history, random.Random(7), 40)
+    final = _state(board)
+
+    for turn in range(len(positions) - 1, -1, -1):
+        assert history.undo(board)
+        assert _state(board) == positions[turn]
+        assert history.turn == turn
+    assert not history.undo(board)
+
+    for turn in range(1, len(positions)):
+        assert history.redo(board)
+        assert _state(board) == positions[turn]
+    assert history.redo(board)
+    assert _state(board) == final
+    assert history.turn == len(positions)
+    assert not history.redo(board)
+
+
+def test_new_move_drops_redo():
+    board = Board(size=4, seed=8)
+    board.reset(initial_tiles=2)
+    history = MoveHistory()
+    rng = random.Random(8)
+    _play(board, history, rng, 10)
+
+    history.undo(board)
+    history.undo(board)
+    assert history.can_redo
+    _play(board, history, rng, 1)
+    assert not history.can_redo
+    assert history.stats()["redo"] == 0
+
+
+def test_large_tiles_use_byte_snapshots():
+    board = Board(size=4, seed=9)
+    board.grid = [[65536, 2, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 4]]
+    board.score = 123
+    history = MoveHistory()
+    history.push(history.snapshot(board))
+    before = _state(board)
+
+    board.move("right")
+    assert history.undo(board)
+    assert _state(board) == before
+
+
+def test_thinning_keeps_budget_and_start():
+    board = Board(size=4, seed=10)
+    board.reset(initial_tiles=2)
+    start = _state(board)
+    history = MoveHistory(budget_bytes=2048)
+    rng = random.Random(10)
+
+    for _ in range(100):
+        _play(board, history, rng, 1)
+        assert history.nbytes <= history.budget_bytes
+    assert history.thinned > 0
+
+    # Недавние ходы идут подряд, самый старый снимок -- начало партии
+    turns = []
+    while history.undo(board):
+        turns.append(history.turn)
+    assert turns[:10] == list(range(99, 89, -1))
+    assert turns[-1] == 0
+    assert _state(board) == start
+
+
+def test_tiny_budget_keeps_start():
+    board = Board(size=4, seed=11)
+    board.reset(initial_tiles=2)
+    start = _state(board)
+    # Бюджет меньше одного снимка: остаётся только начало партии
+    history = MoveHistory(budget_bytes=1)
+    _play(board, history, random.Random(11), 30)
+    assert len(history) == 1
+
+    assert history.undo(board)
+    assert _state(board) == start
+    assert history.turn == 0
@@ -0,0 +1,54 @@
+import json
+import time
+
+from src.config.persistence import PersistenceService
+from src.engine.metrics import MetricsCollector
+from src.game.board import Board
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _play(board, moves):
+    board.reset(initial_tiles=2)
+    for _ in range(moves):
+        for direction in ("left", "up", "right", "down"):
+            if board.move(direction)[0]:
+                break
+
+
+def test_timer_flushes_while_idle(tmp_path):
+    path = tmp_path / "metrics.json"
+    persistence = PersistenceService(debounce=0.0, max_delay=0.0)
+    metrics = MetricsCollector(str(path), flush_interval=0.05, persistence=persistence)
+    board = Board(size=4, seed=1)
+    metrics.attach(board)
+    _play(board, 10)
+
+    # Ходов больше нет, сводку пишет таймер
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        if path.exists() and _load(path)["moves"] == metrics.moves:
+            break
+        time.sleep(0.01)
+    assert _load(path)["moves"] == metrics.moves > 0
+
+    metrics.close()
+    persistence.close()
+
+
+def test_close_writes_last_summary(tmp_path):
+    path = tmp_path / "sub" / "metrics.json"
+    metrics = MetricsCollector(str(path), flush_interval=3600.0)
+    board = Board(size=4, seed=2)
+    metrics.attach(board)
+    _play(board, 20)
+    assert not path.exists()
+
+    metrics.close()
+    summary = _load(path)
+    assert summary["games"] == 1
+    assert summary["moves"] == metrics.moves
+    assert not metrics.persistence._thread.is_alive()
@@ -0,0 +1,38 @@
+import json
+import os
+
+import pytest
+
+from src.config.persistence import PersistenceError, PersistenceService
+
+
+def test_failed_write_keeps_worker_alive(tmp_path):
+    service = PersistenceService(debounce=0.0, max_delay=0.0)
+    bad = str(tmp_path / "bad.json")
+    good = str(tmp_path / "good.json")
+
+    # set не сериализуется в JSON -> TypeError внутри фонового потока
+    service.save_json(bad, {"value": {1, 2}})
+    service._thread.join(0.2)
+    assert service._thread.is_alive()
+
+    service.save_json(good, {"value": 1})
+    with pytest.raises(PersistenceError) as info:
+        service.flush()
+    assert [path for path, _ in info.value.errors] == [bad]
+    assert isinstance(info.value.errors[0][1], TypeError)
+    assert not os.path.exists(bad)
+
+    service.flush()  # ошибка уже отдана
+    service.close()
+    with open(good, encoding="utf-8") as f:
+        assert json.load(f) == {"value": 1}
+    assert service.stats()["write_errors"] == 1
+
+
+def test_close_reports_failure(tmp_path):
+    service = PersistenceService(debounce=60.0, max_delay=60.0)
+    service.save_json(str(tmp_path / "missing" / "x.json"), {"value": 1})
+    with pytest.raises(PersistenceError):
+        service.close()
+    assert not service._thread.is_alive()
@@ -0,0 +1,90 @@
+import os
+import random
+
+import pytest
+
+from src.game.board import DIRECTIONS, Board
+from src.game.history import MoveHistory
+from src.game.recording import GameRecorder, GameReplay
+
+
+def _grid(board):
+    return [row[:] for row in board.grid]
+
+
+def _record_games(path, games, seed=0, keyframe_interval=8):
+    """Играет games случайных партий с записью; возвращает поля после каждого хода."""
+    board = Board(size=4, seed=seed)
+    rng = random.Random(seed)
+    played = []
+    with GameRecorder(path, board, keyframe_interval=keyframe_interval) as recorder:
+        for _ in range(games):
+            board.reset(initial_tiles=2)
+            states, directions = [(_grid(board), board.score)], []
+            while board.can_move():
+                direction = rng.choice(DIRECTIONS)
+                if board.move(direction)[0]:
+                    states.append((_grid(board), board.score))
+                    directions.append(direction)
+            played.append((states, directions))
+        assert recorder.games == games
+    return played
+
+
+def test_replay_round_trip(tmp_path):
+    path = str(tmp_path / "games.rec")
+    played = _record_games(path, games=3)
+
+    replay = GameReplay(path)
+    assert len(replay) == 3
+    for game, (states, directions) in enumerate(played):
+        assert replay.move_count(game) == len(directions)
+        assert list(replay.moves(game)) == directions
+
+        replayed = [(_grid(board), board.score) for _, board in replay.positions(game)]
+        assert replayed == states
+
+        # Произвольный доступ -- с ближайшего ключевого кадра
+        for move in (0, 1, 7, 8, 9, len(directions) // 2, len(directions)):
+            board = replay.board_at(game, move)
+            assert (_grid(board), board.score) == states[move]
+
+
+def test_replay_drops_truncated_tail(tmp_path):
+    path = str(tmp_path / "games.rec")
+    played = _record_games(path, games=2, seed=1)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    replay = GameReplay(path)
+    states, _ = played[-1]
+    last = replay.move_count(1)
+    assert 0 < last <= len(states) - 1
+    board = replay.board_at(1, last)
+    assert (_grid(board), board.score) == states[last]
+    with pytest.raises(IndexError):
+        replay.board_at(1, last + 1)
+
+
+def test_replay_follows_undo(tmp_path):
+    path = str(tmp_path / "undo.rec")
+    board = Board(size=4, seed=2)
+    rng = random.Random(2)
+    history = MoveHistory()
+    with GameRecorder(path, board, keyframe_interval=1000) as recorder:
+        board.reset(initial_tiles=2)
+        for step in range(60):
+            snapshot = history.snapshot(board)
+            if board.move(rng.choice(DIRECTIONS))[0]:
+                history.push(snapshot)
+            if step % 10 == 9:
+                history.undo(board)
+                history.undo(board)
+                recorder.record_position(board, history.turn)
+        final = (_grid(board), board.score)
+        turn = history.turn
+
+    replay = GameReplay(path)
+    assert replay.move_count() == turn
+    board = replay.board_at()
+    assert (_grid(board), board.score) == final
@@ -0,0 +1,75 @@
+import json
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from src.game.board import DIRECTIONS, Board
+from src.game.spawn import SpawnSampler
+
+
+def _game(seed, moves=200):
+    """Новые плитки случайной партии с данным seed."""
+    board = Board(size=4, seed=seed)
+    board.reset(initial_tiles=2)
+    spawns = [board.last_spawn]
+    order = random.Random(0)
+    for _ in range(moves):
+        if board.move(order.choice(DIRECTIONS))[0]:
+            spawns.append(board.last_spawn)
+    return spawns
+
+
+def test_same_seed_same_spawns():
+    assert _game(5) == _game(5)
+    assert _game(5) != _game(6)
+
+
+def test_board_rng_ignores_global_random():
+    random.seed(1)
+    first = _game(7)
+    random.seed(2)
+    random.random()
+    assert _game(7) == first
+
+
+def test_reseed_restarts_sequence():
+    board = Board(size=4, seed=3)
+    board.reset(initial_tiles=2)
+    first = [row[:] for row in board.grid]
+    board.seed(3)
+    board.reset(initial_tiles=2)
+    assert board.grid == first
+
+
+def test_same_seed_in_another_process():
+    code = (
+        "import json; from tests.test_spawn import _game; "
+        "print(json.dumps(_game(11)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    assert [tuple(spawn) for spawn in json.loads(output)] == _game(11)
+
+
+def test_sampler_follows_probabilities():
+    sampler = SpawnSampler([2, 4], [9, 1])  # веса нормируются
+    assert sampler.cumulative == pytest.approx((0.9, 1.0))
+    assert sampler.pick(0.0) == 2
+    assert sampler.pick(0.8999) == 2
+    assert sampler.pick(0.9) == 4
+    assert sampler.pick(0.9999999) == 4
+
+    rng = random.Random(0)
+    fours = sum(sampler.pick(rng.random()) == 4 for _ in range(20000))
+    assert 1700 < fours < 2300
+
+
+@pytest.mark.parametrize("values, probabilities", [([2, 4], [1.0]), ([], []), ([2], [0.0])])
+def test_sampler_rejects_bad_rules(values, probabilities):
+    with pytest.raises(ValueError):
+        SpawnSampler(values, probabilities)
@@ -0,0 +1,96 @@
+import os
+import random
+
+import pytest
+
+from src.game.board import DIRECTIONS, Board
+from src.game.state_store import HEADER_SIZE, RECORD_SIZE, StateStore, StateStoreWriter
+
+
+def _positions(size, seed, count):
+    """(поле, счёт, партия, ход) для count позиций случайных партий."""
+    board = Board(size=size, seed=seed)
+    rng = random.Random(seed)
+    result, game = [], 0
+    while len(result) < count:
+        board.reset(initial_tiles=2)
+        move = 0
+        result.append(([row[:] for row in board.grid], board.score, game, move))
+        while board.can_move() and len(result) < count:
+            if board.move(rng.choice(DIRECTIONS))[0]:
+                move += 1
+                result.append(([row[:] for row in board.grid], board.score, game, move))
+        game += 1
+    return result
+
+
+def _write(writer, positions):
+    board = Board(size=writer.size)
+    for grid, score, game, move in positions:
+        board.grid = grid
+        board.score = score
+        writer.append(board, game, move)
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_write_resume_read(tmp_path, size):
+    path = str(tmp_path / "states.bin")
+    positions = _positions(size, seed=size, count=700)
+
+    # Маленький буфер: часть записей уходит на диск по ходу, часть -- в close()
+    with StateStoreWriter(path, size, buffer_records=64) as writer:
+        _write(writer, positions[:300])
+    with StateStoreWriter(path, size, buffer_records=64) as writer:
+        _write(writer, positions[300:])
+    assert writer.written == 400
+
+    with StateStore(path) as store:
+        assert store.size == size
+        assert len(store) == len(positions)
+        for index in (0, 299, 300, len(positions) - 1):
+            grid, score, game, move = positions[index]
+            record = store[index]
+            assert (record.score, record.game, record.move) == (score, game, move)
+            assert store.board(index).grid == grid
+        assert [record.move for record in store.iter_range(290, 310)] == [
+            move for _, _, _, move in positions[290:310]
+        ]
+        assert store[-1] == store[len(positions) - 1]
+
+
+def test_numpy_views(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "states.bin")
+    positions = _positions(4, seed=1, count=200)
+    with StateStoreWriter(path, 4) as writer:
+        _write(writer, positions)
+
+    with StateStore(path) as store:
+        grids = store.grids(50, 150)
+        assert grids.shape == (100, 4, 4)
+        assert np.array_equal(grids, np.array([grid for grid, _, _, _ in positions[50:150]]))
+        records = store.to_numpy()
+        assert records["score"].tolist() == [score for _, score, _, _ in positions]
+        del records
+
+
+def test_resume_drops_torn_record(tmp_path):
+    path = str(tmp_path / "states.bin")
+    positions = _positions(4, seed=2, count=20)
+    with StateStoreWriter(path, 4) as writer:
+        _write(writer, positions[:10])
+    with open(path, "ab") as f:
+        f.write(b"\xff" * (RECORD_SIZE // 2))
+
+    with StateStoreWriter(path, 4) as writer:
+        _write(writer, positions[10:])
+    assert os.path.getsize(path) == HEADER_SIZE + 20 * RECORD_SIZE
+    with StateStore(path) as store:
+        assert [store.board(i).grid for i in range(20)] == [grid for grid, _, _, _ in positions]
+
+
+def test_resume_rejects_other_size(tmp_path):
+    path = str(tmp_path / "states.bin")
+    StateStoreWriter(path, 4).close()
+    with pytest.raises(ValueError):
+        StateStoreWriter(path, 5)
@@ -0,0 +1,74 @@
+import filecmp
+import os
+
+import pytest
+
+from src.ai.tablebase import Tablebase, build_tablebase, canonical
+from src.game.board import Board
+
+np = pytest.importorskip("numpy")
+
+TARGET = 16
+
+
+class _Stop(Exception):
+    pass
+
+
+def _layer_codes(work_dir):
+    names = sorted(name for name in os.listdir(work_dir) if name.startswith("layer-"))
+    return np.concatenate([np.load(os.path.join(work_dir, name)) for name in names])
+
+
+def test_index_finds_every_position(tmp_path):
+    path = str(tmp_path / "tb.tb")
+    stats = build_tablebase(path, target_value=TARGET, workers=1, work_dir=str(tmp_path / "work"))
+
+    with Tablebase(path) as tablebase:
+        codes = _layer_codes(stats["work_dir"])
+        assert len(codes) == tablebase.states == stats["states"]
+        # Поиск ограничен двоичным поиском в самой большой корзине
+        high = codes >> np.uint64(32)
+        assert tablebase.meta["max_bucket"] == stats["max_bucket"] == max(
+            np.count_nonzero(high == prefix) for prefix in np.unique(high)
+        )
+        for code in codes.tolist():
+            value, _ = tablebase.lookup_packed(code)
+            assert 0.0 <= value <= 1.0
+
+        # Неканоническая запись той же позиции -- тот же ответ
+        board = Board(size=3, seed=3)
+        board.reset(initial_tiles=2)
+        code = board.pack()
+        assert tablebase.lookup(board) == tablebase.lookup_packed(code)
+        assert canonical(code, 3)[0] in set(codes.tolist())
+
+        # Недостижимая позиция (все клетки заняты двойками) -- None
+        assert tablebase.lookup_packed(int("1" * 9, 16)) is None
+
+
+def test_interrupted_build_resumes(tmp_path):
+    reference = str(tmp_path / "reference.tb")
+    build_tablebase(reference, target_value=TARGET, workers=1, work_dir=str(tmp_path / "a"))
+
+    forward = []
+
+    def log(message):
+        if message.startswith("forward: sum"):
+            forward.append(message)
+            if len(forward) == 10:
+                raise _Stop
+
+    path = str(tmp_path / "resumed.tb")
+    with pytest.raises(_Stop):
+        build_tablebase(path, target_value=TARGET, workers=1, work_dir=str(tmp_path / "b"), log=log)
+
+    messages = []
+    stats = build_tablebase(path, target_value=TARGET, workers=1,
+                            work_dir=str(tmp_path / "b"), log=messages.append)
+    assert messages[0].startswith("forward: resume after sum")
+    # Готовые слои не разворачиваются заново
+    resumed = [m for m in messages if m.startswith("forward: sum")]
+    assert len(resumed) == stats["layers"] - 9
+    assert filecmp.cmp(path, reference, shallow=False)
+    assert not any(name.startswith("frontier") for name in os.listdir(stats["work_dir"]))